@@ -0,0 +1,269 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+import redis
+from flask import current_app
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from APP.celery_app import celery
+from APP.config import Config
+from APP.database import db
+from APP.models import Audit_logger, indian_time
+from APP.Services.cache import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Audit events waiting for the consumer; entries are deleted once they are in audit_logger.
+# The stream is never trimmed on write (MAXLEN would drop events nobody has written yet):
+# write_stream_batch deletes entries after acknowledging them.
+AUDIT_STREAM = "audit:events"
+AUDIT_GROUP = "audit-writers"
+
+
+def audit_row(task_id, current_state, action_by, previous_state=None, timestamp=None):
+    return {
+        # Idempotency key: a redelivered event is skipped by ON CONFLICT (event_id, timestamp)
+        "event_id": str(uuid.uuid4()),
+        "task_id": task_id,
+        "previous_state": None if previous_state is None else str(previous_state),
+        "current_state": str(current_state),
+        "action_by": str(action_by),
+        "timestamp": timestamp or indian_time()
+    }
+
+
+class AuditStats:
+    # Per-process pipeline counters, exposed through /api/audit/stats
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {"written_sync": 0, "published": 0, "queued_locally": 0,
+                         "written_from_local": 0, "written_from_stream": 0, "errors": 0}
+
+    def record(self, kind, count=1):
+        with self.lock:
+            self.counters[kind] += count
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.counters)
+
+
+stats = AuditStats()
+
+
+def insert_audit_rows(rows):
+    # Multi-row INSERT that skips events already written
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        db.session.execute(insert(Audit_logger), rows)
+        return
+    db.session.execute(
+        dialect_insert(Audit_logger).on_conflict_do_nothing(index_elements=['event_id', 'timestamp']),
+        rows
+    )
+
+
+def write_audit_rows(rows):
+    # sync: one multi-row INSERT inside the caller's transaction.
+    # async: held on the session and appended to the audit stream once the transaction
+    # commits, so rolled back changes are never audited.
+    if not rows:
+        return
+    if current_app.config['AUDIT_MODE'] != 'async':
+        insert_audit_rows(rows)
+        stats.record("written_sync", len(rows))
+        return
+    db.session.info.setdefault("audit_events", []).extend(rows)
+    ensure_local_writer(current_app._get_current_object())
+
+
+def encode_event(row):
+    return {"data": json.dumps(row, default=lambda value: value.isoformat())}
+
+
+def decode_event(fields):
+    row = json.loads(fields["data"])
+    row["timestamp"] = datetime.fromisoformat(row["timestamp"])
+    return row
+
+
+def publish_events(rows):
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for row in rows:
+            pipe.xadd(AUDIT_STREAM, encode_event(row))
+        pipe.execute()
+        stats.record("published", len(rows))
+    except redis.RedisError as e:
+        logger.warning("Audit stream unavailable, queueing %d events locally: %s", len(rows), e)
+        stats.record("errors")
+        local_queue.extend(rows)
+        stats.record("queued_locally", len(rows))
+
+
+@event.listens_for(Session, "after_commit")
+def publish_committed_events(session):
+    rows = session.info.pop("audit_events", None)
+    if rows:
+        publish_events(rows)
+
+
+@event.listens_for(Session, "after_rollback")
+def drop_rolled_back_events(session):
+    session.info.pop("audit_events", None)
+
+
+# Fallback for when Redis is down: events wait here and a background thread writes them
+# straight to audit_logger. Events still queued when the process dies are lost.
+local_queue = deque()
+writer_pid = None
+writer_lock = threading.Lock()
+
+
+def drain_local_queue(app):
+    while True:
+        time.sleep(Config.AUDIT_LOCAL_FLUSH_SECONDS)
+        rows = []
+        while local_queue and len(rows) < Config.AUDIT_BATCH_SIZE:
+            rows.append(local_queue.popleft())
+        if not rows:
+            continue
+        with app.app_context():
+            try:
+                insert_audit_rows(rows)
+                db.session.commit()
+                stats.record("written_from_local", len(rows))
+            except Exception as e:
+                db.session.rollback()
+                local_queue.extendleft(reversed(rows))
+                stats.record("errors")
+                logger.exception("Error writing %d queued audit events: %s", len(rows), e)
+            finally:
+                db.session.remove()
+
+
+def ensure_local_writer(app):
+    # One writer thread per process, started lazily like the cache invalidation listener
+    global writer_pid
+    if writer_pid == os.getpid():
+        return
+    with writer_lock:
+        if writer_pid == os.getpid():
+            return
+        threading.Thread(target=drain_local_queue, args=(app,), name="audit-local-writer", daemon=True).start()
+        writer_pid = os.getpid()
+
+
+def ensure_group():
+    try:
+        redis_client.xgroup_create(AUDIT_STREAM, AUDIT_GROUP, id="0", mkstream=True)
+    except redis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def write_stream_batch(entries):
+    # Insert, commit, then acknowledge: a crash in between redelivers the batch and
+    # ON CONFLICT skips whatever was already written (at-least-once, no duplicates)
+    rows, ids = [], []
+    for entry_id, fields in entries:
+        ids.append(entry_id)
+        if not fields:
+            continue  # deleted from the stream while pending
+        try:
+            rows.append(decode_event(fields))
+        except (KeyError, ValueError) as e:
+            logger.error("Dropping malformed audit event %s: %s", entry_id, e)
+            stats.record("errors")
+    if rows:
+        insert_audit_rows(rows)
+        db.session.commit()
+        stats.record("written_from_stream", len(rows))
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.xack(AUDIT_STREAM, AUDIT_GROUP, *ids)
+    pipe.xdel(AUDIT_STREAM, *ids)
+    pipe.execute()
+    return len(rows)
+
+
+def drain_audit_stream(max_seconds=None):
+    # Consume the stream in batches until it is empty or the time budget is spent.
+    # Entries left pending by a crashed consumer are claimed back first.
+    ensure_group()
+    consumer = f"{socket.gethostname()}-{os.getpid()}"
+    batch_size = Config.AUDIT_BATCH_SIZE
+    deadline = time.monotonic() + (max_seconds or Config.AUDIT_DRAIN_MAX_SECONDS)
+    written = 0
+
+    claim_from = "0-0"
+    while time.monotonic() < deadline:
+        # Redis 7 adds a third element (deleted ids) to the reply; 6.2 returns two
+        reply = redis_client.xautoclaim(
+            AUDIT_STREAM, AUDIT_GROUP, consumer,
+            min_idle_time=Config.AUDIT_CLAIM_IDLE_MS, start_id=claim_from, count=batch_size
+        )
+        claim_from, entries = reply[0], reply[1]
+        if entries:
+            written += write_stream_batch(entries)
+        if claim_from == "0-0":
+            break
+
+    while time.monotonic() < deadline:
+        response = redis_client.xreadgroup(AUDIT_GROUP, consumer, {AUDIT_STREAM: ">"}, count=batch_size)
+        entries = response[0][1] if response else []
+        if not entries:
+            break
+        written += write_stream_batch(entries)
+    return written
+
+
+def stream_backlog():
+    # Depth of the stream and age of its oldest entry; consumed entries are deleted,
+    # so the oldest entry left is the oldest event not yet in audit_logger
+    try:
+        depth = redis_client.xlen(AUDIT_STREAM)
+        pending = 0
+        try:
+            pending = redis_client.xpending(AUDIT_STREAM, AUDIT_GROUP)["pending"]
+        except redis.ResponseError:
+            pass  # group not created yet
+        oldest = redis_client.xrange(AUDIT_STREAM, count=1)
+    except redis.RedisError as e:
+        return {"stream_error": str(e)}
+    lag = None
+    if oldest:
+        lag = round(max(time.time() * 1000 - int(oldest[0][0].split("-")[0]), 0) / 1000, 3)
+    return {"stream_depth": depth, "stream_pending": pending, "lag_seconds": lag}
+
+
+def pipeline_stats():
+    return {
+        "mode": current_app.config['AUDIT_MODE'],
+        **stream_backlog(),
+        "local_queue_depth": len(local_queue),
+        **stats.snapshot()
+    }
+
+
+@celery.task
+def drain_audit_events():
+    # Scheduled every AUDIT_DRAIN_INTERVAL seconds; a failed run is simply picked up by the next one
+    try:
+        written = drain_audit_stream()
+    except Exception as e:
+        db.session.rollback()
+        logger.exception("Error draining audit events: %s", e)
+        return 0
+    if written:
+        logger.info("Wrote %d audit events to audit_logger", written)
+    return written
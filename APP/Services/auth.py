@@ -0,0 +1,78 @@
+from functools import wraps
+from flask import jsonify, current_app
+from flask_jwt_extended import current_user
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+from APP.config import Config
+from APP.database import db
+from APP.models import User
+from APP.Services.cache import cached
+
+# Cache namespace for the user lookup done on every protected request
+USERS = "users"
+
+
+class AuthUser:
+    # Lightweight stand-in for the User row, built from the cache or from JWT claims
+    def __init__(self, id, username, role):
+        self.id = id
+        self.username = username
+        self.role = role
+
+
+@cached(USERS, ttl=Config.USER_CACHE_TTL)
+def load_user_record(user_id):
+    user = db.session.get(User, user_id)
+    if not user:
+        return None
+    return {"id": user.id, "username": user.username, "role": user.role}
+
+
+def invalidate_user(user_id):
+    load_user_record.invalidate(user_id)
+
+
+def register_user_loader(jwt):
+    # flask_jwt_extended.current_user is resolved once per request through these hooks
+    @jwt.user_lookup_loader
+    def user_lookup(_jwt_header, jwt_data):
+        identity = jwt_data["sub"]
+        # Tokens carry the role as a claim; trusting it skips the lookup entirely
+        if current_app.config['JWT_TRUST_ROLE_CLAIM'] and jwt_data.get("role"):
+            return AuthUser(identity["id"], identity.get("username"), jwt_data["role"])
+        record = load_user_record(identity["id"])
+        return AuthUser(**record) if record else None
+
+    @jwt.user_lookup_error_loader
+    def user_lookup_error(_jwt_header, _jwt_data):
+        return jsonify({"error": "User not found"}), 404
+
+
+def admin_required(message="You are not authorized to perform this action."):
+    # Use below @jwt_required()
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if current_user.role != 'admin':
+                return jsonify({"error": message}), 403
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@event.listens_for(User, "after_update")
+def remember_role_change(_mapper, _connection, target):
+    if inspect(target).attrs.role.history.has_changes():
+        object_session(target).info.setdefault("users_changed", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_changed_users(session):
+    # Evict only once the new role is committed, so a concurrent request cannot re-cache the old one
+    for user_id in session.info.pop("users_changed", ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_changed_users(session):
+    session.info.pop("users_changed", None)
@@ -1,7 +1,295 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
 import redis
-from APP.config import REDIS_HOST, REDIS_PORT
+from APP.config import REDIS_HOST, REDIS_PORT, Config
+from APP.Services.metrics import count_in_request
+
+logger = logging.getLogger(__name__)
+
 redis_client = redis.Redis(
     host=REDIS_HOST,
     port=REDIS_PORT,
     decode_responses=True
-)
\ No newline at end of file
+)
+# Same server, bytes in and out: pre-serialized payloads are stored and returned untouched
+raw_redis_client = redis.Redis(
+    host=REDIS_HOST,
+    port=REDIS_PORT
+)
+
+# Cache namespaces
+TASKS_BY_DATE = "tasks-by-date"
+
+# Pub/sub channel used to evict keys from every process's local cache
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Deletes the single-flight lock only if we still own it
+RELEASE_LOCK_SCRIPT = redis_client.register_script("""
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+""")
+
+
+class CacheStats:
+    # Per-process hit/miss/latency counters, exposed through /api/cache/stats
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {"local_hits": 0, "hits": 0, "misses": 0, "errors": 0, "lock_waits": 0}
+        self.seconds = {"local_hits": 0.0, "hits": 0.0, "misses": 0.0}
+
+    def record(self, kind, seconds=None):
+        with self.lock:
+            self.counters[kind] += 1
+            if seconds is not None:
+                self.seconds[kind] += seconds
+        if kind in ("local_hits", "hits", "misses"):
+            count_in_request(kind)
+
+    def snapshot(self):
+        with self.lock:
+            counters = dict(self.counters)
+            seconds = dict(self.seconds)
+        hits = counters["local_hits"] + counters["hits"]
+        lookups = hits + counters["misses"]
+        return {
+            **counters,
+            "local_size": len(local_cache),
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "avg_local_hit_ms": round(seconds["local_hits"] * 1000 / counters["local_hits"], 4) if counters["local_hits"] else None,
+            "avg_hit_ms": round(seconds["hits"] * 1000 / counters["hits"], 3) if counters["hits"] else None,
+            "avg_miss_ms": round(seconds["misses"] * 1000 / counters["misses"], 3) if counters["misses"] else None
+        }
+
+
+stats = CacheStats()
+
+
+class LocalCache:
+    # Bounded in-process LRU (L1) with per-key expiry, in front of Redis (L2).
+    # Values are shared between callers and must be treated as read-only.
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.items = OrderedDict()
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, key):
+        with self.lock:
+            item = self.items.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self.items[key]
+                return None
+            self.items.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        if self.max_size <= 0 or ttl <= 0:
+            return
+        with self.lock:
+            self.items[key] = (value, time.monotonic() + ttl)
+            self.items.move_to_end(key)
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+
+    def delete(self, *keys):
+        with self.lock:
+            for key in keys:
+                self.items.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+local_cache = LocalCache(Config.LOCAL_CACHE_MAX_SIZE)
+listener_pid = None
+listener_lock = threading.Lock()
+
+
+def listen_for_invalidations():
+    # Evict keys published by other processes; on any pub/sub failure the local cache is
+    # dropped, since invalidations may have been missed while disconnected
+    while True:
+        try:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            for message in pubsub.listen():
+                if message.get("type") == "message":
+                    local_cache.delete(*json.loads(message["data"]))
+        except Exception as e:
+            logger.warning("Cache invalidation listener error: %s", e)
+        local_cache.clear()
+        time.sleep(1)
+
+
+def ensure_listener():
+    # Started lazily and per process, so prefork servers get one listener per worker
+    global listener_pid
+    if listener_pid == os.getpid():
+        return
+    with listener_lock:
+        if listener_pid == os.getpid():
+            return
+        local_cache.clear()
+        threading.Thread(target=listen_for_invalidations, name="cache-invalidation", daemon=True).start()
+        listener_pid = os.getpid()
+
+
+def cache_key(namespace, key):
+    # CACHE_VERSION is bumped whenever a cached payload changes shape, so old entries are never read
+    return f"cache:{Config.CACHE_VERSION}:{namespace}:{key}"
+
+
+def read_cached(full_key, raw=False):
+    try:
+        cached = (raw_redis_client if raw else redis_client).get(full_key)
+    except redis.RedisError as e:
+        stats.record("errors")
+        logger.warning("Cache read failed for %s: %s", full_key, e)
+        return None
+    if cached is None or raw:
+        return cached
+    return json.loads(cached)
+
+
+def store(full_key, value, ttl, raw=False):
+    try:
+        if raw:
+            raw_redis_client.set(full_key, value, ex=ttl)
+        else:
+            redis_client.set(full_key, json.dumps(value, default=str), ex=ttl)
+    except redis.RedisError as e:
+        stats.record("errors")
+        logger.warning("Cache write failed for %s: %s", full_key, e)
+
+
+def get_or_load(namespace, key, loader, ttl, local_ttl=None, raw=False):
+    # Read-through lookup: local LRU, then Redis, then the loader.
+    # A None result from the loader is not cached. With raw=True the loader returns an
+    # already encoded JSON body (bytes), which is cached and returned as is.
+    started = time.perf_counter()
+    full_key = cache_key(namespace, key)
+    use_local = Config.LOCAL_CACHE_ENABLED
+    local_ttl = min(ttl, Config.LOCAL_CACHE_TTL if local_ttl is None else local_ttl)
+
+    if use_local:
+        ensure_listener()
+        value = local_cache.get(full_key)
+        if value is not None:
+            stats.record("local_hits", time.perf_counter() - started)
+            return value
+
+    value = read_cached(full_key, raw)
+    if value is not None:
+        if use_local:
+            local_cache.set(full_key, value, local_ttl)
+        stats.record("hits", time.perf_counter() - started)
+        return value
+
+    # Single-flight: only the lock holder queries the database, everyone else waits for its result
+    lock_key = f"{full_key}:lock"
+    token = str(uuid.uuid4())
+    try:
+        owner = redis_client.set(lock_key, token, nx=True, px=Config.CACHE_LOCK_TIMEOUT_MS)
+    except redis.RedisError:
+        owner = True  # Redis is unavailable: load directly
+
+    if not owner:
+        stats.record("lock_waits")
+        deadline = time.monotonic() + Config.CACHE_LOCK_TIMEOUT_MS / 1000
+        while time.monotonic() < deadline:
+            time.sleep(Config.CACHE_LOCK_POLL_MS / 1000)
+            value = read_cached(full_key, raw)
+            if value is not None:
+                if use_local:
+                    local_cache.set(full_key, value, local_ttl)
+                stats.record("hits", time.perf_counter() - started)
+                return value
+            try:
+                if not redis_client.exists(lock_key):
+                    break
+            except redis.RedisError:
+                break
+
+    try:
+        value = loader()
+        if value is not None:
+            store(full_key, value, ttl, raw)
+            if use_local:
+                local_cache.set(full_key, value, local_ttl)
+    finally:
+        if owner:
+            try:
+                RELEASE_LOCK_SCRIPT(keys=[lock_key], args=[token])
+            except redis.RedisError:
+                pass
+    stats.record("misses", time.perf_counter() - started)
+    return value
+
+
+def invalidate(namespace, *keys):
+    if not keys:
+        return
+    full_keys = [cache_key(namespace, key) for key in keys]
+    local_cache.delete(*full_keys)
+    try:
+        redis_client.delete(*full_keys)
+        redis_client.publish(INVALIDATION_CHANNEL, json.dumps(full_keys))
+    except redis.RedisError as e:
+        stats.record("errors")
+        logger.warning("Cache invalidation failed for %s: %s", namespace, e)
+
+
+def cached(namespace, ttl=3600, key=None, local_ttl=None, raw=False):
+    # Decorator for read-through caching; key(*args, **kwargs) builds the cache key,
+    # by default the positional arguments joined with ':'. local_ttl caps the L1 lifetime.
+    # raw=True is for functions returning encoded JSON bytes (see get_or_load).
+    def build_key(*args, **kwargs):
+        return key(*args, **kwargs) if key else ":".join(str(arg) for arg in args)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return get_or_load(namespace, build_key(*args, **kwargs), lambda: func(*args, **kwargs), ttl, local_ttl, raw)
+
+        wrapper.invalidate = lambda *args, **kwargs: invalidate(namespace, build_key(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def table_version(table):
+    # Generation counter of a table, part of the cache key of every query result built from
+    # it; None when Redis is unavailable (callers then skip the cache)
+    try:
+        return int(redis_client.get(f"table-version:{table}") or 0)
+    except redis.RedisError as e:
+        stats.record("errors")
+        logger.warning("Cache version read failed for %s: %s", table, e)
+        return None
+
+
+def bump_table_version(table):
+    # Orphans every cached result of the table at once; the old entries age out by TTL
+    try:
+        redis_client.incr(f"table-version:{table}")
+    except redis.RedisError as e:
+        stats.record("errors")
+        logger.warning("Cache version bump failed for %s: %s", table, e)
+
+
+def invalidate_task_dates(dates):
+    # Write paths call this after commit with the created_at dates of the tasks they touched
+    invalidate(TASKS_BY_DATE, *{str(day) for day in dates if day is not None})
@@ -0,0 +1,188 @@
+import json
+import logging
+import os
+import time
+import uuid
+from flask import current_app
+from APP.celery_app import celery
+from APP.database import db
+from APP.models import ImportJob
+from APP.Services.cache import redis_client
+from APP.Services.task_events import tasks_changed
+from APP.Services.task_importer import import_tasks, count_rows
+
+logger = logging.getLogger(__name__)
+
+
+def progress_key(job_id):
+    return f"import_job:{job_id}"
+
+
+def spool_upload(file, job_id, file_format='csv'):
+    # Copy the upload to local disk in blocks and count its rows for the ETA.
+    # The extension records the format for the worker.
+    spool_dir = current_app.config['IMPORT_SPOOL_DIR']
+    os.makedirs(spool_dir, exist_ok=True)
+    path = os.path.join(spool_dir, f"{job_id}.{file_format}")
+
+    lines = 0
+    with open(path, 'wb') as spooled:
+        while True:
+            block = file.stream.read(1024 * 1024)
+            if not block:
+                break
+            lines += block.count(b'\n')
+            spooled.write(block)
+    if file_format != 'csv':
+        return path, count_rows(path, file_format)
+    return path, max(lines - 1, 0)  # minus the header
+
+
+def publish_progress(job_id, **fields):
+    # Redis holds the live view that /tasks/imports/<job_id> polls; the import_job row is the checkpoint
+    fields["updated_at"] = time.time()
+    try:
+        redis_client.hset(progress_key(job_id), mapping={
+            key: json.dumps(value) for key, value in fields.items()
+        })
+        redis_client.expire(progress_key(job_id), current_app.config['IMPORT_PROGRESS_TTL'])
+    except Exception as e:
+        logger.warning("Error publishing import progress for job %s: %s", job_id, e)
+
+
+def create_import_job(file, user_id, file_format='csv'):
+    job_id = str(uuid.uuid4())
+    path, total_rows = spool_upload(file, job_id, file_format)
+
+    job = ImportJob(
+        id=job_id,
+        filename=file.filename,
+        file_path=path,
+        status='queued',
+        total_rows=total_rows,
+        created_by=user_id
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    publish_progress(job_id, status='queued', total_rows=total_rows, rows_done=0, rows_imported=0, rows_failed=0)
+    run_import_job.delay(job_id)
+    return job
+
+
+def get_job_progress(job_id):
+    progress = {}
+    try:
+        raw = redis_client.hgetall(progress_key(job_id))
+        progress = {key: json.loads(value) for key, value in raw.items()}
+    except Exception as e:
+        logger.warning("Error reading import progress for job %s: %s", job_id, e)
+
+    # Fall back to the last committed checkpoint when Redis has nothing
+    if not progress:
+        job = db.session.get(ImportJob, job_id)
+        if not job:
+            return None
+        progress = {
+            "status": job.status,
+            "total_rows": job.total_rows,
+            "rows_done": job.rows_done,
+            "rows_imported": job.rows_imported,
+            "rows_failed": job.rows_failed,
+            "error": job.error
+        }
+
+    rows_done = progress.get("rows_done") or 0
+    total_rows = progress.get("total_rows")
+    throughput = None
+    eta_seconds = None
+    if progress.get("run_started_at") and progress.get("updated_at"):
+        elapsed = progress["updated_at"] - progress["run_started_at"]
+        run_rows = rows_done - progress.get("run_start_row", 0)
+        if elapsed > 0 and run_rows > 0:
+            throughput = round(run_rows / elapsed, 1)
+            if total_rows and progress.get("status") == 'running':
+                eta_seconds = round(max(total_rows - rows_done, 0) / throughput, 1)
+
+    progress.pop("run_started_at", None)
+    progress.pop("run_start_row", None)
+    progress.pop("updated_at", None)
+    progress["job_id"] = job_id
+    progress["rows_per_sec"] = throughput
+    progress["eta_seconds"] = eta_seconds
+    return progress
+
+
+@celery.task(bind=True, acks_late=True, reject_on_worker_lost=True)
+def run_import_job(self, job_id):
+    # Runs inside the worker's shared app context (see AppContextTask)
+    job = db.session.get(ImportJob, job_id)
+    if not job or job.status in ('completed', 'failed'):
+        return f"Import job {job_id} has nothing to do."
+
+    # Resume from the last committed batch after a worker restart
+    start_row = job.rows_done
+    imported = job.rows_imported
+    failed = job.rows_failed
+    action_by = job.created_by
+
+    job.status = 'running'
+    db.session.commit()
+    publish_progress(
+        job_id,
+        status='running',
+        total_rows=job.total_rows,
+        rows_done=start_row,
+        run_start_row=start_row,
+        run_started_at=time.time()
+    )
+
+    def checkpoint(results, rows_done):
+        # Tasks, their audit rows and the checkpoint are committed together for every batch
+        db.session.query(ImportJob).filter_by(id=job_id).update({
+            "rows_done": rows_done,
+            "rows_imported": imported + results["imported"],
+            "rows_failed": failed + results["failed"]
+        })
+        db.session.commit()
+        tasks_changed(results["dates"])
+        results["dates"].clear()
+
+        publish_progress(
+            job_id,
+            rows_done=rows_done,
+            rows_imported=imported + results["imported"],
+            rows_failed=failed + results["failed"],
+            errors=results["errors"]
+        )
+
+    try:
+        file_format = os.path.splitext(job.file_path)[1].lstrip('.') or 'csv'
+        with open(job.file_path, 'rb') as spooled:
+            import_tasks(spooled, action_by, start_row=start_row, after_chunk=checkpoint, file_format=file_format)
+    except ValueError as e:
+        # The file itself is unusable, retrying will not help
+        db.session.rollback()
+        db.session.query(ImportJob).filter_by(id=job_id).update({"status": 'failed', "error": str(e)})
+        db.session.commit()
+        publish_progress(job_id, status='failed', error=str(e))
+        return f"Import job {job_id} failed: {e}"
+    except Exception as e:
+        db.session.rollback()
+        if self.request.retries >= 3:
+            db.session.query(ImportJob).filter_by(id=job_id).update({"status": 'failed', "error": str(e)})
+            db.session.commit()
+            publish_progress(job_id, status='failed', error=str(e))
+            raise
+        publish_progress(job_id, status='retrying', error=str(e))
+        raise self.retry(exc=e, countdown=60, max_retries=3)
+
+    db.session.query(ImportJob).filter_by(id=job_id).update({"status": 'completed'})
+    db.session.commit()
+    publish_progress(job_id, status='completed')
+
+    try:
+        os.remove(job.file_path)
+    except OSError:
+        pass
+    return f"Import job {job_id} completed."
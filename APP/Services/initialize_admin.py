@@ -1,6 +1,6 @@
 from APP import db
 from APP.models import User
-from werkzeug.security import generate_password_hash
+from APP.Services.passwords import hash_password
 
 def initialize_admin_user():
     # Check if an admin user already exists
@@ -9,7 +9,7 @@ def initialize_admin_user():
         # Create a default admin user
         default_admin = User(
             username='admin',
-            password=generate_password_hash('admin123'),  # Default password
+            password=hash_password('admin123'),  # Default password
             role='admin'
         )
         db.session.add(default_admin)
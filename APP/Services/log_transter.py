@@ -1,32 +1,22 @@
+import logging
+from flask import current_app
 from APP.celery_app import celery
 from APP.database import db
-from APP.models import TaskManager, TaskLogger
-from APP import create_app  # Import the app factory function
+from APP.Services.task_logger import snapshot_active_tasks
+
+logger = logging.getLogger(__name__)
 
 @celery.task(bind=True)
 def log_active_tasks(self):
-    # Create a Flask app instance
-    app = create_app()
-
-    # Use the app context for database operations
-    with app.app_context():
-        try:
-            # Query active tasks
-            active_tasks = TaskManager.query.filter_by(is_active=True).all()
-
-            # Log each active task
-            for task in active_tasks:
-                logg = TaskLogger(
-                    task_id=task.id,
-                    logged_at=db.func.now()  # Log the current time
-                )
-                db.session.add(logg)
-
-            # Commit the changes to the database
-            db.session.commit()
-            return f"Logged {len(active_tasks)} tasks to TaskLogger."
+    # Runs inside the worker's shared app context (see AppContextTask)
+    try:
+        # Snapshot active tasks into TaskLogger with server-side INSERT ... SELECT.
+        # The snapshot skips tasks already logged today, so a retry cannot duplicate rows.
+        metrics = snapshot_active_tasks(current_app.config['TASK_SNAPSHOT_CHUNK_SIZE'])
+        logger.info("Logged %d tasks to TaskLogger: %s", metrics['rows_logged'], metrics)
+        return metrics
 
-        except Exception as e:
-            # Rollback in case of an error
-            db.session.rollback()
-            raise self.retry(exc=e, countdown=60, max_retries=3)
\ No newline at end of file
+    except Exception as e:
+        # Rollback in case of an error
+        db.session.rollback()
+        raise self.retry(exc=e, countdown=60, max_retries=3)
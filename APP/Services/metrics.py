@@ -0,0 +1,312 @@
+import logging
+import threading
+import time
+from flask import request, Response
+from celery.signals import task_prerun, task_postrun, task_retry
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Prometheus instrumentation (text exposition format 0.0.4), served at /api/metrics.
+# Request, SQL, Redis and pool metrics are kept per process like the other /api/*/stats
+# counters. Celery workers are separate processes, so their task metrics are accumulated
+# in a Redis hash that every web process renders.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+WAIT_BUCKETS = (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+TASK_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600)
+
+CELERY_METRICS_KEY = "metrics:celery"
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels) + "}"
+
+
+def format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def inc(self, *label_values, amount=1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for label_values, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{format_labels(zip(self.labels, label_values))} {format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets) + (float('inf'),)
+        self.lock = threading.Lock()
+        self.values = {}  # label values -> [bucket counts..., sum, count]
+
+    def observe(self, value, *label_values):
+        with self.lock:
+            series = self.values.get(label_values)
+            if series is None:
+                series = self.values[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            items = sorted((key, list(series)) for key, series in self.values.items())
+        for label_values, series in items:
+            render_histogram(lines, self.name, list(zip(self.labels, label_values)), self.buckets,
+                             series[:len(self.buckets)], series[-2], series[-1])
+        return lines
+
+
+def render_histogram(lines, name, labels, buckets, counts, total, count):
+    cumulative = 0
+    for bound, bucket_count in zip(buckets, counts):
+        cumulative += bucket_count
+        lines.append(f"{name}_bucket{format_labels(labels + [('le', format_value(float(bound)))])} {cumulative}")
+    lines.append(f"{name}_sum{format_labels(labels)} {format_value(float(total))}")
+    lines.append(f"{name}_count{format_labels(labels)} {count}")
+
+
+REQUEST_SECONDS = Histogram("app_http_request_duration_seconds", "Request latency.", ("endpoint", "method", "status"))
+REQUEST_SQL = Histogram("app_http_request_sql_statements", "SQL statements executed per request.", ("endpoint",), COUNT_BUCKETS)
+SQL_STATEMENTS = Counter("app_sql_statements_total", "SQL statements executed.", ("endpoint",))
+SQL_SECONDS = Counter("app_sql_seconds_total", "Time spent executing SQL statements.", ("endpoint",))
+REDIS_COMMANDS = Counter("app_redis_commands_total", "Redis commands (a pipeline counts once).", ("endpoint",))
+REDIS_SECONDS = Counter("app_redis_seconds_total", "Time spent in Redis round trips.", ("endpoint",))
+CACHE_LOOKUPS = Counter("app_cache_lookups_total", "Read-through cache lookups by result.", ("endpoint", "result"))
+POOL_WAIT = Histogram("app_db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.", (), WAIT_BUCKETS)
+METRICS = [REQUEST_SECONDS, REQUEST_SQL, SQL_STATEMENTS, SQL_SECONDS, REDIS_COMMANDS, REDIS_SECONDS, CACHE_LOOKUPS, POOL_WAIT]
+
+# Endpoint of the request running on this thread; work outside a request is "none"
+current = threading.local()
+
+
+def current_endpoint():
+    return getattr(current, "endpoint", None) or "none"
+
+
+def count_in_request(kind):
+    # Called by the cache on every lookup ("hits", "local_hits", "misses")
+    CACHE_LOOKUPS.inc(current_endpoint(), kind)
+
+
+class TimedQueuePool(QueuePool):
+    # QueuePool that records how long checkouts wait for a free connection
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - started)
+
+
+def sql_started(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.metrics_started = time.perf_counter()
+
+
+def sql_finished(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "metrics_started", None)
+    if started is None:
+        return
+    endpoint = current_endpoint()
+    SQL_STATEMENTS.inc(endpoint)
+    SQL_SECONDS.inc(endpoint, amount=time.perf_counter() - started)
+    if hasattr(current, "sql"):
+        current.sql += 1
+
+
+def timed_redis(method):
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            endpoint = current_endpoint()
+            REDIS_COMMANDS.inc(endpoint)
+            REDIS_SECONDS.inc(endpoint, amount=time.perf_counter() - started)
+    return wrapper
+
+
+def instrument_redis(*clients):
+    # redis-py has no command hooks: wrap execute_command and the pipelines of the given
+    # clients only (the app's cache clients), so the rate limiter's storage and Celery's
+    # broker connections, which are separate clients, do not count as cache traffic
+    for client in clients:
+        if getattr(client, "metrics_instrumented", False):
+            continue
+        client.execute_command = timed_redis(client.execute_command)
+
+        def pipeline(*args, _pipeline=client.pipeline, **kwargs):
+            pipe = _pipeline(*args, **kwargs)
+            pipe.execute = timed_redis(pipe.execute)
+            return pipe
+
+        client.pipeline = pipeline
+        client.metrics_instrumented = True
+
+
+def before_request():
+    current.endpoint = request.endpoint or "unmatched"
+    current.started = time.perf_counter()
+    current.sql = 0
+
+
+def after_request(response):
+    if getattr(current, "started", None) is not None:
+        endpoint = current_endpoint()
+        REQUEST_SECONDS.observe(time.perf_counter() - current.started, endpoint, request.method, str(response.status_code))
+        REQUEST_SQL.observe(current.sql, endpoint)
+    return response
+
+
+def teardown_request(exc=None):
+    current.endpoint = None
+    current.started = None
+
+
+def register_metrics(app):
+    # Called from create_app
+    if not app.config['METRICS_ENABLED']:
+        return
+    if not event.contains(Engine, "before_cursor_execute", sql_started):
+        event.listen(Engine, "before_cursor_execute", sql_started)
+        event.listen(Engine, "after_cursor_execute", sql_finished)
+    from APP.Services.cache import redis_client, raw_redis_client
+    instrument_redis(redis_client, raw_redis_client)
+    app.before_request(before_request)
+    app.after_request(after_request)
+    app.teardown_request(teardown_request)
+
+
+# ---- Celery tasks: workers add to a Redis hash, /api/metrics reads it ----
+
+task_started = {}
+
+
+@task_prerun.connect
+def celery_task_started(task_id=None, task=None, **kwargs):
+    task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def celery_task_finished(task_id=None, task=None, state=None, **kwargs):
+    started = task_started.pop(task_id, None)
+    if started is None or task is None:
+        return
+    seconds = time.perf_counter() - started
+    bucket = next(index for index, bound in enumerate(TASK_BUCKETS + (float('inf'),)) if seconds <= bound)
+    try:
+        from APP.Services.cache import redis_client
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hincrby(CELERY_METRICS_KEY, f"{task.name}|{state}|count", 1)
+        pipe.hincrbyfloat(CELERY_METRICS_KEY, f"{task.name}|{state}|sum", seconds)
+        pipe.hincrby(CELERY_METRICS_KEY, f"{task.name}|{state}|bucket|{bucket}", 1)
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Error recording metrics for task %s: %s", task.name, e)
+
+
+@task_retry.connect
+def celery_task_retried(sender=None, **kwargs):
+    try:
+        from APP.Services.cache import redis_client
+        redis_client.hincrby(CELERY_METRICS_KEY, f"{sender.name}|retries", 1)
+    except Exception as e:
+        logger.warning("Error recording retry metrics: %s", e)
+
+
+def render_celery_metrics(lines):
+    from APP.Services.cache import redis_client
+    try:
+        raw = redis_client.hgetall(CELERY_METRICS_KEY)
+    except Exception as e:
+        logger.warning("Error reading Celery metrics: %s", e)
+        return
+
+    runs, retries = {}, {}
+    for field, value in raw.items():
+        parts = field.split("|")
+        if parts[1:] == ["retries"]:
+            retries[parts[0]] = int(value)
+            continue
+        series = runs.setdefault((parts[0], parts[1]), {"count": 0, "sum": 0.0, "buckets": [0] * (len(TASK_BUCKETS) + 1)})
+        if parts[2] == "bucket":
+            series["buckets"][int(parts[3])] = int(value)
+        elif parts[2] == "sum":
+            series["sum"] = float(value)
+        else:
+            series["count"] = int(value)
+
+    lines += ["# HELP app_celery_task_duration_seconds Celery task run time by final state.",
+              "# TYPE app_celery_task_duration_seconds histogram"]
+    for (task, state), series in sorted(runs.items()):
+        render_histogram(lines, "app_celery_task_duration_seconds", [("task", task), ("state", state)],
+                         TASK_BUCKETS + (float('inf'),), series["buckets"], series["sum"], series["count"])
+    lines += ["# HELP app_celery_task_retries_total Celery task retries.",
+              "# TYPE app_celery_task_retries_total counter"]
+    for task, value in sorted(retries.items()):
+        lines.append(f"app_celery_task_retries_total{format_labels([('task', task)])} {value}")
+
+
+def render_pool_gauges(lines):
+    from APP.database import db
+    pool = db.engine.pool
+    gauges = [
+        ("app_db_pool_size", "Configured pool size.", getattr(pool, "size", None)),
+        ("app_db_pool_checked_out", "Connections currently checked out.", getattr(pool, "checkedout", None)),
+        ("app_db_pool_overflow", "Connections above the pool size.", getattr(pool, "overflow", None)),
+    ]
+    for name, help, read in gauges:
+        if read is None:
+            continue
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {read()}"]
+
+
+def render_cache_gauges(lines):
+    from APP.Services.cache import stats as cache_stats
+    ratio = cache_stats.snapshot()["hit_ratio"]
+    lines += ["# HELP app_cache_hit_ratio Read-through cache hits (local and Redis) over lookups.",
+              "# TYPE app_cache_hit_ratio gauge",
+              f"app_cache_hit_ratio {ratio if ratio is not None else 'NaN'}"]
+
+
+def render_metrics():
+    lines = []
+    for metric in METRICS:
+        lines += metric.render()
+    render_pool_gauges(lines)
+    render_cache_gauges(lines)
+    render_celery_metrics(lines)
+    return "\n".join(lines) + "\n"
+
+
+def metrics_response():
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4; charset=utf-8")
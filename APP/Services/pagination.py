@@ -0,0 +1,61 @@
+import base64
+import json
+import logging
+from datetime import date, datetime
+from APP.database import db
+from APP.Services.cache import redis_client, table_version
+
+logger = logging.getLogger(__name__)
+
+
+def encode_cursor(*values):
+    # Opaque, URL-safe token holding the sort key of the last row of a page
+    payload = [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, size):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def approximate_query_count(query):
+    # Planner row estimate for the query itself (EXPLAIN, no execution), so joins and
+    # filters are accounted for; only as fresh as the last ANALYZE. None outside PostgreSQL.
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return None
+    connection = db.session.connection()
+    compiled = query.order_by(None).statement.compile(connection)
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def cached_count(key, query, ttl, tables=()):
+    # Exact COUNT(*) served from Redis for a short while so it is not recomputed on every page.
+    # The key holds the version counters of the tables the query reads, so a write to any
+    # of them makes the cached total unreachable; without Redis the count is not cached.
+    versions = [table_version(table) for table in tables]
+    if None in versions:
+        return query.order_by(None).count()
+    key = ":".join([key, *map(str, versions)])
+    try:
+        cached = redis_client.get(key)
+        if cached is not None:
+            return int(cached)
+    except Exception as e:
+        logger.warning("Error reading cached count %s: %s", key, e)
+
+    total = query.order_by(None).count()
+    try:
+        redis_client.set(key, total, ex=ttl)
+    except Exception as e:
+        logger.warning("Error caching count %s: %s", key, e)
+    return total
@@ -0,0 +1,132 @@
+import logging
+import re
+from datetime import date
+from flask import current_app
+from sqlalchemy import text
+from APP.celery_app import celery
+from APP.database import db
+from APP.models import indian_date
+from APP.Services.cache import bump_table_version
+
+logger = logging.getLogger(__name__)
+
+# Monthly range-partitioned tables: table -> (partition column, retention config key)
+PARTITIONED_TABLES = {
+    "task_logger": ("logged_at", "TASK_LOGGER_RETENTION_MONTHS"),
+    "audit_logger": ("timestamp", "AUDIT_LOGGER_RETENTION_MONTHS"),
+}
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y_%m}"
+
+
+def is_partitioned(table):
+    return db.session.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+        {"table": table}
+    ).scalar() is not None
+
+
+def monthly_partitions(table):
+    # {month: partition name} of the attached monthly partitions, by naming convention
+    names = db.session.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass(:table)
+    """), {"table": table}).scalars()
+    pattern = re.compile(rf"^{table}_p(\d{{4}})_(\d{{2}})$")
+    partitions = {}
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def create_partition(table, column, month):
+    # Build the partition on its own, move any rows for that month out of the DEFAULT
+    # partition, then attach it; attaching fails while DEFAULT still holds rows of the range
+    name = partition_name(table, month)
+    start, end = month, add_months(month, 1)
+    params = {"start": start, "end": end}
+    db.session.execute(text(
+        f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    moved = db.session.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {table}_default WHERE {column} >= :start AND {column} < :end RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    """), params).rowcount
+    db.session.execute(text(
+        f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"
+    ))
+    return moved
+
+
+def expire_partition(table, name, drop):
+    # A detached partition is a plain table that can be archived or dropped later
+    db.session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+    if drop:
+        db.session.execute(text(f"DROP TABLE {name}"))
+
+
+def maintain_partitions(today=None):
+    # Create the current and next PARTITION_PREMAKE_MONTHS months and expire months older
+    # than each table's retention (0 keeps everything). Commits once per table.
+    config = current_app.config
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return {}
+    this_month = month_start(today or indian_date())
+    drop = config['PARTITION_RETENTION_ACTION'] == 'drop'
+
+    summary = {}
+    for table, (column, retention_key) in PARTITIONED_TABLES.items():
+        if not is_partitioned(table):
+            logger.warning("%s is not partitioned yet; run the migrations first", table)
+            continue
+        existing = monthly_partitions(table)
+        created, moved, expired = [], 0, []
+
+        for offset in range(config['PARTITION_PREMAKE_MONTHS'] + 1):
+            month = add_months(this_month, offset)
+            if month not in existing:
+                moved += create_partition(table, column, month)
+                created.append(partition_name(table, month))
+
+        retention = config[retention_key]
+        if retention > 0:
+            oldest_kept = add_months(this_month, -(retention - 1))
+            for month, name in sorted(existing.items()):
+                if month < oldest_kept:
+                    expire_partition(table, name, drop)
+                    expired.append(name)
+
+        db.session.commit()
+        if expired:
+            bump_table_version(table)
+        summary[table] = {"created": created, "rows_moved_from_default": moved,
+                          "dropped" if drop else "detached": expired}
+    return summary
+
+
+@celery.task(bind=True)
+def maintain_log_partitions(self):
+    try:
+        summary = maintain_partitions()
+        logger.info("Partition maintenance: %s", summary)
+        return summary
+    except Exception as e:
+        db.session.rollback()
+        raise self.retry(exc=e, countdown=300, max_retries=3)
@@ -0,0 +1,89 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Password hashing. PBKDF2/scrypt are CPU bound, but hashlib releases the GIL while it
+# hashes, so other request threads keep running during a hash: single passwords are
+# hashed and checked inline. Bulk hashing (imports) is spread over a thread pool sized by
+# PASSWORD_HASH_WORKERS, which uses every core without the pickling, IPC and
+# fork-after-threads hazards of a process pool.
+
+_pool = None
+_pool_pid = None
+_pool_workers = 1
+_pool_lock = threading.Lock()
+
+
+def hash_settings():
+    config = current_app.config
+    return config['PASSWORD_HASH_METHOD'], config['PASSWORD_SALT_LENGTH']
+
+
+def get_pool():
+    # One pool per process; a forked child must not reuse its parent's (threadless) pool
+    global _pool, _pool_pid, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            workers = current_app.config['PASSWORD_HASH_WORKERS'] or os.cpu_count() or 1
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+            _pool_pid = os.getpid()
+            _pool_workers = workers
+        return _pool
+
+
+def _hash_many(passwords, method, salt_length):
+    return [generate_password_hash(password, method=method, salt_length=salt_length) for password in passwords]
+
+
+def hash_password(password):
+    method, salt_length = hash_settings()
+    return generate_password_hash(password, method=method, salt_length=salt_length)
+
+
+def hash_passwords(passwords):
+    # Hashes in parallel batches, one batch per worker; the result keeps the input order
+    passwords = list(passwords)
+    if not passwords:
+        return []
+    if len(passwords) == 1:
+        return [hash_password(passwords[0])]
+    method, salt_length = hash_settings()
+    pool = get_pool()
+    size = -(-len(passwords) // _pool_workers)
+    batches = [passwords[start:start + size] for start in range(0, len(passwords), size)]
+    futures = [pool.submit(_hash_many, batch, method, salt_length) for batch in batches]
+    return [hashed for future in futures for hashed in future.result()]
+
+
+@lru_cache(maxsize=8)
+def canonical_method(method):
+    # "pbkdf2" -> "pbkdf2:sha256:600000": the method prefix werkzeug writes into the hash
+    return generate_password_hash('', method=method, salt_length=1).split('$', 1)[0]
+
+
+def needs_rehash(stored):
+    # True when the hash was made with other parameters than the configured ones
+    method, salt_length = hash_settings()
+    parts = stored.split('$')
+    if len(parts) != 3:
+        return True
+    return parts[0] != canonical_method(method) or len(parts[1]) != salt_length
+
+
+def verify_password(stored, password):
+    # (matches, new_hash). new_hash is set when the password matched but the stored hash was
+    # made with outdated parameters and should be replaced. Only hashes are accepted;
+    # plaintext passwords from old registrations are hashed by migration e2a4c6e8f013.
+    if not stored:
+        return False, None
+    try:
+        matches = check_password_hash(stored, password)
+    except (TypeError, ValueError):
+        # A hash format werkzeug does not know
+        matches = False
+    if matches and needs_rehash(stored):
+        return True, hash_password(password)
+    return matches, None
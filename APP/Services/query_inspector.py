@@ -0,0 +1,228 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import deque
+from flask import request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Opt-in query diagnostics for development and staging (QUERY_INSPECTOR_ENABLED).
+# Every statement of a request is fingerprinted; a shape that repeats
+# QUERY_INSPECTOR_REPEAT_THRESHOLD times in one request is reported as a likely N+1, and
+# statements slower than QUERY_INSPECTOR_SLOW_MS are logged with their EXPLAIN plan.
+# Reports are grouped per endpoint at /api/query-report (per worker process).
+# QueryBudget / assert_query_budget count statements without the request hooks.
+
+# Statements seen on this thread: .statements for the current request, .budgets for
+# active QueryBudget blocks
+current = threading.local()
+
+reports = {}
+reports_lock = threading.Lock()
+settings = {"repeat_threshold": 5, "slow_ms": 100.0, "explain": True, "max_slow": 20}
+
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+
+def fingerprint(statement):
+    # Query shape: literals and bind parameters become ?, IN lists and multi-row VALUES
+    # collapse to one (?), whitespace is normalized
+    shape = re.sub(r"'(?:[^']|'')*'", "?", statement)
+    shape = re.sub(r"%\(\w+\)s|%s|(?<![:\w]):\w+|\$\d+", "?", shape)
+    shape = re.sub(r"\b\d+(?:\.\d+)?\b", "?", shape)
+    shape = re.sub(r"\(\s*\?(?:\s*,\s*\?)*\s*\)", "(?)", shape)
+    shape = re.sub(r"\(\?\)(?:\s*,\s*\(\?\))+", "(?)", shape)
+    return re.sub(r"\s+", " ", shape).strip()
+
+
+def fingerprint_id(shape):
+    return hashlib.sha1(shape.encode()).hexdigest()[:12]
+
+
+def explain(conn, statement, parameters):
+    # Runs on a separate DBAPI cursor of the same connection (same transaction, no
+    # SQLAlchemy events). On PostgreSQL a savepoint keeps a failing EXPLAIN from aborting
+    # the request's transaction.
+    dialect = conn.dialect.name
+    if dialect not in ('postgresql', 'sqlite') or not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+    prefix = "EXPLAIN " if dialect == 'postgresql' else "EXPLAIN QUERY PLAN "
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        if dialect == 'postgresql':
+            cursor.execute("SAVEPOINT query_inspector")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception as e:
+            if dialect == 'postgresql':
+                cursor.execute("ROLLBACK TO SAVEPOINT query_inspector")
+            return f"EXPLAIN failed: {e}"
+        if dialect == 'postgresql':
+            cursor.execute("RELEASE SAVEPOINT query_inspector")
+    finally:
+        cursor.close()
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def statement_started(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and (getattr(current, "statements", None) is not None or getattr(current, "budgets", None)):
+        context.inspector_started = time.perf_counter()
+
+
+def statement_finished(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "inspector_started", None)
+    if started is None:
+        return
+    ms = (time.perf_counter() - started) * 1000
+    for budget in getattr(current, "budgets", None) or []:
+        budget.statements.append(statement)
+
+    statements = getattr(current, "statements", None)
+    if statements is None:
+        return
+    plan = None
+    if ms >= settings["slow_ms"] and settings["explain"] and not executemany:
+        plan = explain(conn, statement, parameters)
+    statements.append((statement, ms, plan))
+
+
+def ensure_listeners():
+    if not event.contains(Engine, "before_cursor_execute", statement_started):
+        event.listen(Engine, "before_cursor_execute", statement_started)
+        event.listen(Engine, "after_cursor_execute", statement_finished)
+
+
+def before_request():
+    current.statements = []
+
+
+def after_request(response):
+    statements = getattr(current, "statements", None)
+    current.statements = None
+    if statements is not None:
+        record_request(request.endpoint or "unmatched", statements)
+    return response
+
+
+def record_request(endpoint, statements):
+    shapes = {}
+    for statement, ms, _ in statements:
+        shape = fingerprint(statement)
+        entry = shapes.setdefault(shape, [0, 0.0])
+        entry[0] += 1
+        entry[1] += ms
+    repeated = {shape: entry for shape, entry in shapes.items() if entry[0] >= settings["repeat_threshold"]}
+    slow = [(statement, ms, plan) for statement, ms, plan in statements if ms >= settings["slow_ms"]]
+
+    for shape, (count, ms) in repeated.items():
+        logger.warning("%s: %dx the same query (%.1f ms total), likely N+1: %s", endpoint, count, ms, shape)
+    for statement, ms, plan in slow:
+        logger.warning("%s: slow query %.1f ms: %s%s", endpoint, ms, " ".join(statement.split()),
+                       f"\n{plan}" if plan else "")
+
+    total_ms = sum(ms for _, ms, _ in statements)
+    with reports_lock:
+        report = reports.setdefault(endpoint, {
+            "requests": 0,
+            "statements": 0,
+            "max_statements": 0,
+            "sql_ms": 0.0,
+            "repeated": {},
+            "slow": deque(maxlen=settings["max_slow"])
+        })
+        report["requests"] += 1
+        report["statements"] += len(statements)
+        report["max_statements"] = max(report["max_statements"], len(statements))
+        report["sql_ms"] += total_ms
+        for shape, (count, ms) in repeated.items():
+            seen = report["repeated"].setdefault(fingerprint_id(shape), {"query": shape, "requests": 0, "max_per_request": 0})
+            seen["requests"] += 1
+            seen["max_per_request"] = max(seen["max_per_request"], count)
+        for statement, ms, plan in slow:
+            report["slow"].append({
+                "query": " ".join(statement.split()),
+                "fingerprint": fingerprint_id(fingerprint(statement)),
+                "ms": round(ms, 2),
+                "plan": plan
+            })
+
+
+def query_report():
+    with reports_lock:
+        return {
+            endpoint: {
+                "requests": report["requests"],
+                "avg_statements": round(report["statements"] / report["requests"], 2),
+                "max_statements": report["max_statements"],
+                "avg_sql_ms": round(report["sql_ms"] / report["requests"], 3),
+                "repeated": sorted(
+                    ({"fingerprint": key, **value} for key, value in report["repeated"].items()),
+                    key=lambda item: -item["max_per_request"]
+                ),
+                "slow": list(report["slow"])
+            }
+            for endpoint, report in sorted(reports.items())
+        }
+
+
+def reset_reports():
+    with reports_lock:
+        reports.clear()
+
+
+def register_query_inspector(app):
+    # Called from create_app; does nothing unless QUERY_INSPECTOR_ENABLED is set
+    if not app.config['QUERY_INSPECTOR_ENABLED']:
+        return
+    settings.update(
+        repeat_threshold=app.config['QUERY_INSPECTOR_REPEAT_THRESHOLD'],
+        slow_ms=app.config['QUERY_INSPECTOR_SLOW_MS'],
+        explain=app.config['QUERY_INSPECTOR_EXPLAIN'],
+        max_slow=app.config['QUERY_INSPECTOR_MAX_SLOW']
+    )
+    ensure_listeners()
+    app.before_request(before_request)
+    app.after_request(after_request)
+
+
+class QueryBudget:
+    # Fails the block when it runs more than max_queries statements on this thread:
+    #
+    #     with QueryBudget(3, "GET /tasks/task/<date>"):
+    #         client.get("/tasks/task/2024-01-01", headers=headers)
+    #
+    # Works with the Flask test client, which runs the request in the calling thread.
+    def __init__(self, max_queries, label="block"):
+        self.max_queries = max_queries
+        self.label = label
+        self.statements = []
+
+    def __enter__(self):
+        ensure_listeners()
+        if getattr(current, "budgets", None) is None:
+            current.budgets = []
+        current.budgets.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        current.budgets.remove(self)
+        if exc_type is None and len(self.statements) > self.max_queries:
+            listing = "\n".join(f"  {index + 1}. {' '.join(statement.split())}"
+                                for index, statement in enumerate(self.statements))
+            raise AssertionError(
+                f"{self.label} ran {len(self.statements)} queries, budget is {self.max_queries}:\n{listing}"
+            )
+        return False
+
+
+def assert_query_budget(client, method, url, max_queries, **kwargs):
+    # Test helper: one request through the Flask test client under a query budget
+    with QueryBudget(max_queries, f"{method} {url}"):
+        response = client.open(url, method=method, **kwargs)
+        response.get_data()  # streamed bodies run their queries while being read
+    return response
@@ -1,12 +1,282 @@
+import logging
+import os
+import sys
+import threading
+import time
+import redis
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask import request
-from APP.config import REDIS_URL
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from limits.storage import Storage
+from APP.config import REDIS_URL, Config
+
+logger = logging.getLogger(__name__)
+
+# Counts INCRBY'd per key in one round trip for a whole batch of keys.
+# KEYS: counters; ARGV: amount, expiry (seconds) for each key in order.
+# Returns count, ttl (ms) for each key. Same key layout as limits' redis storage.
+RECONCILE_SCRIPT = """
+local result = {}
+for i, key in ipairs(KEYS) do
+    local amount = tonumber(ARGV[2 * i - 1])
+    local expiry = tonumber(ARGV[2 * i])
+    local count = redis.call('INCRBY', key, amount)
+    local ttl = redis.call('PTTL', key)
+    if ttl < 0 then
+        redis.call('EXPIRE', key, expiry)
+        ttl = expiry * 1000
+    end
+    result[#result + 1] = count
+    result[#result + 1] = ttl
+end
+return result
+"""
+
+
+class LimiterStats:
+    # Per-process counters, exposed through /api/limiter/stats
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {"hits": 0, "local_hits": 0, "rejected": 0, "syncs": 0, "synced_keys": 0,
+                         "redis_errors": 0, "fail_open": 0, "fail_closed": 0}
+        self.redis_ms_total = 0.0
+        self.redis_ms_max = 0.0
+
+    def record(self, kind, count=1):
+        with self.lock:
+            self.counters[kind] += count
+
+    def record_latency(self, ms):
+        with self.lock:
+            self.redis_ms_total += ms
+            self.redis_ms_max = max(self.redis_ms_max, ms)
+
+    def snapshot(self):
+        with self.lock:
+            syncs = self.counters["syncs"]
+            return {
+                **self.counters,
+                "redis_avg_ms": round(self.redis_ms_total / syncs, 3) if syncs else None,
+                "redis_max_ms": round(self.redis_ms_max, 3)
+            }
+
+
+stats = LimiterStats()
+
+
+class HybridRedisStorage(Storage):
+    # Fixed-window counters kept in process and reconciled with Redis in batches. Not a
+    # token bucket: limits' storage API passes only the window length, so counts reset at
+    # each window boundary and a client can burst up to twice the limit across one.
+    # A hit only touches Redis when its key is new in this process for the current window
+    # or has max_pending unsynced hits; everything else is flushed by a background thread
+    # every sync_interval seconds. Each worker sees the others' hits at most that late, so
+    # limits are approximate by up to one sync interval of traffic.
+    # fail_mode decides what happens while Redis is unreachable: "open" keeps limiting
+    # with the process-local counts, "closed" rejects every rate-limited request.
+    STORAGE_SCHEME = ["hybrid+redis", "hybrid+rediss"]
+
+    def __init__(self, uri, wrap_exceptions=False, sync_interval=0.2, max_pending=5,
+                 fail_mode="open", socket_timeout=0.1, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.client = redis.Redis.from_url(
+            uri.split('+', 1)[1],
+            socket_timeout=float(socket_timeout),
+            socket_connect_timeout=float(socket_timeout)
+        )
+        self.reconcile = self.client.register_script(RECONCILE_SCRIPT)
+        self.sync_interval = float(sync_interval)
+        self.max_pending = int(max_pending)
+        self.fail_closed = fail_mode == "closed"
+        # key -> [count synced from Redis, hits not yet sent, window end (epoch), expiry]
+        self.counters = {}
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.degraded = False
+        self.flusher_pid = None
+
+    @property
+    def base_exceptions(self):
+        return redis.RedisError
+
+    def redis_key(self, key):
+        return f"LIMITS:{key}"
+
+    def ensure_flusher(self):
+        # One flusher thread per process, started lazily (forked workers get their own)
+        if self.flusher_pid == os.getpid():
+            return
+        with self.flush_lock:
+            if self.flusher_pid == os.getpid():
+                return
+            threading.Thread(target=self.flush_forever, name="limiter-flusher", daemon=True).start()
+            self.flusher_pid = os.getpid()
+
+    def flush_forever(self):
+        while True:
+            time.sleep(self.sync_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning("Rate limiter flush failed: %s", e)
+
+    def flush(self):
+        # Send every key's pending hits in one script call and take back the global counts
+        now = time.time()
+        with self.lock:
+            batch = []
+            for key, counter in list(self.counters.items()):
+                if counter[2] <= now:
+                    del self.counters[key]  # window over; Redis expires its key too
+                elif counter[1]:
+                    batch.append((key, counter[1], counter[3]))
+                    counter[1] = 0
+        if not batch:
+            return
+
+        started = time.perf_counter()
+        try:
+            result = self.reconcile(
+                keys=[self.redis_key(key) for key, _, _ in batch],
+                args=[value for _, amount, expiry in batch for value in (amount, expiry)]
+            )
+        except redis.RedisError as e:
+            # Keep the hits for the next attempt
+            with self.lock:
+                for key, amount, _ in batch:
+                    if key in self.counters:
+                        self.counters[key][1] += amount
+            if not self.degraded:
+                logger.warning("Rate limiter lost Redis, failing %s: %s", 'closed' if self.fail_closed else 'open', e)
+            self.degraded = True
+            stats.record("redis_errors")
+            return
+        stats.record_latency((time.perf_counter() - started) * 1000)
+        stats.record("syncs")
+        stats.record("synced_keys", len(batch))
+        self.degraded = False
+
+        now = time.time()
+        with self.lock:
+            for index, (key, _, _) in enumerate(batch):
+                counter = self.counters.get(key)
+                if counter is not None:
+                    counter[0] = int(result[2 * index])
+                    counter[2] = now + int(result[2 * index + 1]) / 1000
+
+    def incr(self, key, expiry, amount=1):
+        self.ensure_flusher()
+        stats.record("hits")
+        now = time.time()
+        with self.lock:
+            counter = self.counters.get(key)
+            new_window = counter is None or counter[2] <= now
+            if new_window:
+                counter = self.counters[key] = [0, 0, now + expiry, expiry]
+            counter[1] += amount
+            sync = new_window or counter[1] >= self.max_pending
+
+        if self.degraded:
+            # Redis is down: the flusher keeps retrying, requests do not wait for it
+            if self.fail_closed:
+                stats.record("fail_closed")
+                return sys.maxsize
+            stats.record("fail_open")
+        elif sync:
+            self.flush()
+        else:
+            stats.record("local_hits")
+        return self.get(key)
+
+    def get(self, key):
+        with self.lock:
+            counter = self.counters.get(key)
+            if counter is None or counter[2] <= time.time():
+                return 0
+            return counter[0] + counter[1]
+
+    def get_expiry(self, key):
+        with self.lock:
+            counter = self.counters.get(key)
+            return counter[2] if counter is not None else time.time()
+
+    def check(self):
+        try:
+            return self.client.ping()
+        except redis.RedisError:
+            return False
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+        keys = list(self.client.scan_iter(match=self.redis_key("*"), count=1000))
+        if keys:
+            self.client.delete(*keys)
+        return len(keys)
+
+    def clear(self, key):
+        with self.lock:
+            self.counters.pop(key, None)
+        self.client.delete(self.redis_key(key))
+
+
+def rate_limit_key():
+    # Authenticated requests are limited per user, so clients behind one NAT or proxy do
+    # not share a budget; anonymous or invalid tokens fall back to the client address
+    if Config.LIMITER_KEY == "identity":
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except Exception:
+            identity = None
+        if isinstance(identity, dict) and identity.get("id") is not None:
+            return f"user:{identity['id']}"
+        if identity is not None and not isinstance(identity, dict):
+            return f"user:{identity}"
+    return f"ip:{get_remote_address()}"
+
+
+def count_breach(limit):
+    stats.record("rejected")
+    return None  # keep the default 429 response
+
+
+def storage_uri():
+    if not REDIS_URL:
+        return "memory://"
+    if Config.LIMITER_STORAGE == "hybrid":
+        return f"hybrid+{REDIS_URL}"
+    return REDIS_URL
+
+
+def storage_options():
+    if Config.LIMITER_STORAGE != "hybrid" or not REDIS_URL:
+        return {}
+    return {
+        "sync_interval": Config.LIMITER_SYNC_INTERVAL,
+        "max_pending": Config.LIMITER_MAX_PENDING,
+        "fail_mode": Config.LIMITER_FAIL_MODE,
+        "socket_timeout": Config.LIMITER_REDIS_TIMEOUT
+    }
 
 
 limiter = Limiter(
-    get_remote_address,
+    rate_limit_key,
     default_limits=["100 per hour"],
-    storage_uri= REDIS_URL,
-    storage_options={}
-)
\ No newline at end of file
+    storage_uri=storage_uri(),
+    storage_options=storage_options(),
+    on_breach=count_breach
+)
+
+
+def limiter_stats():
+    storage = limiter._storage if getattr(limiter, "initialized", False) else None
+    return {
+        **stats.snapshot(),
+        "storage": Config.LIMITER_STORAGE,
+        "key": Config.LIMITER_KEY,
+        "fail_mode": Config.LIMITER_FAIL_MODE,
+        "degraded": getattr(storage, "degraded", None),
+        "tracked_keys": len(storage.counters) if isinstance(storage, HybridRedisStorage) else None
+    }
@@ -0,0 +1,14 @@
+from APP.Services.cache import invalidate_task_dates, bump_table_version
+from APP.Services.task_stats import mark_days_dirty
+
+
+def tasks_changed(dates):
+    # Every write path calls this after commit with the created_at dates of the tasks it
+    # touched: drops the cached task lists and query results and marks the stats rollup days stale
+    dates = list(dates)
+    if not dates:
+        return
+    bump_table_version("task_manager")
+    days = {day for day in dates if day is not None}
+    invalidate_task_dates(days)
+    mark_days_dirty(days)
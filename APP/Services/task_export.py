@@ -0,0 +1,121 @@
+import csv
+import io
+import zlib
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import select, and_
+from APP.database import db
+from APP.models import TaskManager, TaskLogger, Audit_logger
+from APP.Services.task_mutations import filter_condition
+from APP.json_provider import to_json_bytes
+
+# dataset -> (table, timestamp column used for from/to, exported columns)
+DATASETS = {
+    "tasks": (TaskManager, TaskManager.created_at, [
+        TaskManager.id, TaskManager.task_name, TaskManager.description, TaskManager.is_active,
+        TaskManager.priority, TaskManager.created_at, TaskManager.assigned_user, TaskManager.version
+    ]),
+    "logs": (TaskLogger, TaskLogger.logged_at, [
+        TaskLogger.id, TaskLogger.task_id, TaskLogger.logged_at
+    ]),
+    "audits": (Audit_logger, Audit_logger.timestamp, [
+        Audit_logger.id, Audit_logger.task_id, Audit_logger.previous_state, Audit_logger.current_state,
+        Audit_logger.action_by, Audit_logger.timestamp
+    ]),
+}
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def parse_export_filters(args):
+    # Query string -> filter_condition() keys; from/to are inclusive dates (YYYY-MM-DD)
+    filters = {}
+    if args.get('priority'):
+        filters['priority'] = args['priority'].split(',')
+    if args.get('assigned_user'):
+        filters['assigned_user'] = args['assigned_user'].split(',')
+    if args.get('is_active'):
+        filters['is_active'] = args['is_active'].lower() in ('1', 'true', 'yes')
+    for bound in ('from', 'to'):
+        if args.get(bound):
+            filters[bound] = datetime.strptime(args[bound], '%Y-%m-%d').date()
+    if 'from' in filters and 'to' in filters and filters['from'] > filters['to']:
+        raise ValueError("'from' must not be after 'to'")
+    return filters
+
+
+def export_statement(dataset, filters):
+    model, timestamp, columns = DATASETS[dataset]
+    statement = select(*columns)
+    conditions = []
+
+    # Date range on the dataset's own timestamp; for the log tables this prunes partitions
+    if timestamp.type.python_type is date:
+        if 'from' in filters:
+            conditions.append(timestamp >= filters['from'])
+        if 'to' in filters:
+            conditions.append(timestamp <= filters['to'])
+    else:
+        if 'from' in filters:
+            conditions.append(timestamp >= datetime.combine(filters['from'], time.min))
+        if 'to' in filters:
+            conditions.append(timestamp < datetime.combine(filters['to'] + timedelta(days=1), time.min))
+
+    task_filters = {key: filters[key] for key in ('priority', 'assigned_user', 'is_active') if key in filters}
+    if task_filters:
+        if model is not TaskManager:
+            statement = statement.join(TaskManager, TaskManager.id == model.task_id)
+        conditions.append(filter_condition(task_filters))
+
+    if conditions:
+        statement = statement.where(and_(*conditions))
+    return statement.order_by(timestamp, model.id)
+
+
+def export_rows(statement, batch_size):
+    # Server-side cursor: yield_per streams the result in batches (a named cursor on
+    # PostgreSQL) instead of loading it, so memory stays flat for any table size
+    result = db.session.execute(statement.execution_options(yield_per=batch_size))
+    try:
+        for batch in result.partitions():
+            yield batch
+    finally:
+        result.close()
+
+
+def ndjson_chunks(columns, batches):
+    for batch in batches:
+        yield b"".join(to_json_bytes(dict(zip(columns, row))) + b"\n" for row in batch)
+
+
+def csv_chunks(columns, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def gzip_chunks(chunks, level):
+    # Compress on the fly; wbits=31 writes a gzip header and trailer
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(dataset, export_format, filters, batch_size, gzip_level=None):
+    _model, _timestamp, columns = DATASETS[dataset]
+    names = [column.key for column in columns]
+    batches = export_rows(export_statement(dataset, filters), batch_size)
+    chunks = ndjson_chunks(names, batches) if export_format == 'ndjson' else csv_chunks(names, batches)
+    return gzip_chunks(chunks, gzip_level) if gzip_level is not None else chunks
@@ -0,0 +1,379 @@
+import io
+import os
+import time
+from datetime import date, datetime
+from typing import Optional
+import pandas as pd
+from flask import current_app
+from sqlalchemy import insert, text
+from APP.database import db
+from APP.models import User, TaskManager, indian_time, indian_date
+from APP.schemas import TaskManagerSchema
+from APP.Services.audit_log import audit_row, write_audit_rows
+from APP.Services.passwords import hash_passwords
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; only Parquet/Arrow imports need it
+    pa = None
+    pq = None
+
+
+REQUIRED_COLUMNS = ['task_name', 'description', 'status', 'priority', 'created_at', 'assigned_user']
+
+# Normalize priority values
+PRIORITY_MAP = {
+    'LOW': 'LOW',
+    'MEDIUM': 'MEDIUM',
+    'MED': 'MEDIUM',
+    'HIGH': 'HIGH',
+    'CRITICAL': 'CRITICAL',
+    'CRIT': 'CRITICAL',
+    'URGENT': 'CRITICAL'
+}
+ACTIVE_VALUES = ['TRUE', 'YES', 'Y', '1', 'ACTIVE']
+DATE_FORMATS = ['%m/%d/%Y', '%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y']
+
+TASK_COLUMNS = ['task_name', 'description', 'is_active', 'priority', 'created_at', 'assigned_user']
+
+# Accepted upload formats, by file extension
+FILE_FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow',
+}
+# TaskManagerSchema field each input column ends up in; its annotation decides the Arrow
+# types a Parquet/Arrow column may have. assigned_user holds a username in the file (the
+# schema field is the user id it resolves to), so it must be a string column.
+SCHEMA_FIELDS = {
+    'task_name': 'task_name',
+    'description': 'description',
+    'status': 'is_active',
+    'priority': 'priority',
+    'created_at': 'created_at',
+    'assigned_user': None
+}
+
+
+def detect_format(filename, requested=None):
+    # An explicit ?format= wins over the file extension; anything unknown is read as CSV
+    if requested:
+        if requested not in FILE_FORMATS.values():
+            raise ValueError(f"Unknown file format. Use one of: {', '.join(sorted(set(FILE_FORMATS.values())))}")
+        return requested
+    extension = os.path.splitext(filename or '')[1].lower()
+    return FILE_FORMATS.get(extension, 'csv')
+
+
+def read_csv_chunks(file, chunksize, start_row=0):
+    # Stream the upload in fixed-size chunks so memory does not grow with the file.
+    # start_row skips data rows that were already imported (the header is kept).
+    skiprows = range(1, start_row + 1) if start_row else None
+    try:
+        reader = pd.read_csv(file, chunksize=chunksize, skiprows=skiprows)
+    except Exception as e:
+        raise ValueError(f"Error reading CSV file: {str(e)}")
+
+    first = True
+    for chunk in reader:
+        if first:
+            missing = [column for column in REQUIRED_COLUMNS if column not in chunk.columns]
+            if missing:
+                raise ValueError(f"The CSV file must contain the following columns: {', '.join(REQUIRED_COLUMNS)}")
+            first = False
+        yield chunk
+
+
+def accepted_arrow_type(field, arrow_type):
+    # Typed columns must match the schema field; strings are always accepted and parsed
+    # like CSV values
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type) or pa.types.is_null(arrow_type):
+        return True
+    if field is None:
+        return False
+    annotation = TaskManagerSchema.model_fields[field].annotation
+    if annotation in (Optional[bool], bool):
+        return pa.types.is_boolean(arrow_type) or pa.types.is_integer(arrow_type)
+    if annotation in (Optional[date], date, Optional[datetime], datetime):
+        return pa.types.is_date(arrow_type) or pa.types.is_timestamp(arrow_type)
+    if annotation in (Optional[int], int):
+        return pa.types.is_integer(arrow_type)
+    return False
+
+
+def validate_arrow_schema(schema):
+    # Checked once from the file metadata, before any row is read
+    missing = [column for column in REQUIRED_COLUMNS if column not in schema.names]
+    if missing:
+        raise ValueError(f"The file must contain the following columns: {', '.join(REQUIRED_COLUMNS)}")
+    invalid = [
+        f"{column} ({schema.field(column).type})"
+        for column in REQUIRED_COLUMNS
+        if not accepted_arrow_type(SCHEMA_FIELDS[column], schema.field(column).type)
+    ]
+    if invalid:
+        raise ValueError(f"Unsupported column types: {', '.join(invalid)}")
+
+
+def open_arrow_file(file, file_format):
+    # (schema, iterator of record batches); only the required columns are read from Parquet
+    if pa is None:
+        raise ValueError("Parquet and Arrow imports need the pyarrow package")
+    try:
+        if file_format == 'parquet':
+            parquet = pq.ParquetFile(file)
+            return parquet.schema_arrow, lambda chunksize: parquet.iter_batches(batch_size=chunksize, columns=REQUIRED_COLUMNS)
+        try:
+            reader = pa.ipc.open_file(file)
+            batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            file.seek(0)  # not the random-access file format, try the streaming format
+            reader = pa.ipc.open_stream(file)
+            batches = iter(reader)
+        return reader.schema, lambda chunksize: batches
+    except pa.ArrowException as e:
+        raise ValueError(f"Error reading {file_format} file: {str(e)}")
+
+
+def count_rows(path, file_format):
+    # Row count from the file metadata, for the progress ETA of queued imports
+    if file_format == 'parquet':
+        return pq.ParquetFile(path).metadata.num_rows
+    with pa.memory_map(path) as source:
+        try:
+            reader = pa.ipc.open_file(source)
+            return sum(reader.get_batch(index).num_rows for index in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            source.seek(0)
+            return sum(batch.num_rows for batch in pa.ipc.open_stream(source))
+
+
+def read_arrow_chunks(file, file_format, chunksize, start_row=0):
+    # Record batches sliced (zero-copy) to chunksize rows and converted with their types
+    # intact: booleans stay bool and dates/timestamps arrive as datetime64, so the
+    # normalizers below skip their string parsing
+    schema, batches = open_arrow_file(file, file_format)
+    validate_arrow_schema(schema)
+
+    skipped = 0
+    position = 0
+    for batch in batches(chunksize):
+        if skipped + batch.num_rows <= start_row:
+            skipped += batch.num_rows
+            continue
+        offset = max(start_row - skipped, 0)
+        skipped = start_row
+        for begin in range(offset, batch.num_rows, chunksize):
+            chunk = batch.slice(begin, chunksize).to_pandas(date_as_object=False)
+            chunk.index = pd.RangeIndex(position, position + len(chunk))
+            position += len(chunk)
+            yield chunk
+
+
+def read_chunks(file, file_format, chunksize, start_row=0):
+    if file_format == 'csv':
+        return read_csv_chunks(file, chunksize, start_row)
+    return read_arrow_chunks(file, file_format, chunksize, start_row)
+
+
+def normalize_status(column):
+    # Convert status to boolean for the whole column at once; a missing status is
+    # inactive in every format (a blank CSV cell never matches ACTIVE_VALUES either)
+    if pd.api.types.is_bool_dtype(column):
+        return column.fillna(False).astype(bool)
+    if pd.api.types.is_numeric_dtype(column):
+        return column.fillna(0).ne(0)
+    return column.astype(str).str.strip().str.upper().isin(ACTIVE_VALUES)
+
+
+def normalize_priority(column):
+    # Default to MEDIUM if priority is invalid
+    return column.astype(str).str.strip().str.upper().map(PRIORITY_MAP).fillna('MEDIUM')
+
+
+def normalize_dates(column):
+    if pd.api.types.is_datetime64_any_dtype(column):
+        # Typed date/timestamp column: nothing to parse
+        parsed = column
+    else:
+        # Try every supported format on the rows still unparsed, one vectorized pass per format
+        raw = column.astype(str).str.strip()
+        parsed = pd.Series(pd.NaT, index=column.index, dtype='datetime64[ns]')
+        for fmt in DATE_FORMATS:
+            pending = parsed.isna()
+            if not pending.any():
+                break
+            parsed[pending] = pd.to_datetime(raw[pending], format=fmt, errors='coerce')
+    dates = parsed.dt.date.astype(object)
+    return dates.where(parsed.notna(), indian_date())
+
+
+def normalize_chunk(chunk):
+    frame = pd.DataFrame(index=chunk.index)
+    frame['task_name'] = chunk['task_name'].astype(object).where(chunk['task_name'].notna(), None)
+    frame['description'] = chunk['description'].astype(object).where(chunk['description'].notna(), None)
+    frame['is_active'] = normalize_status(chunk['status'])
+    frame['priority'] = normalize_priority(chunk['priority'])
+    frame['created_at'] = normalize_dates(chunk['created_at'])
+    usernames = chunk['assigned_user'].astype(str).str.strip()
+    frame['username'] = usernames.where(chunk['assigned_user'].notna() & (usernames != ''), None)
+    return frame
+
+
+def resolve_users(usernames, known_users):
+    # Fetch every distinct username of the chunk in one query, then create the missing ones in one insert
+    pending = [name for name in usernames if name not in known_users]
+    if not pending:
+        return []
+
+    rows = db.session.query(User.id, User.username).filter(User.username.in_(pending)).all()
+    for user_id, username in rows:
+        known_users[username] = user_id
+
+    missing = [name for name in pending if name not in known_users]
+    if not missing:
+        return []
+
+    # Default passwords, hashed in parallel batches by the password pool
+    passwords = hash_passwords(f"{username}123" for username in missing)
+    new_users = [
+        {
+            "username": username,
+            "password": password,
+            "role": 'user'  # Default role for new users
+        }
+        for username, password in zip(missing, passwords)
+    ]
+    created = db.session.execute(
+        insert(User).returning(User.id, User.username),
+        new_users
+    ).all()
+    for user_id, username in created:
+        known_users[username] = user_id
+    return missing
+
+
+def reserve_task_ids(count):
+    # COPY cannot return generated keys, so draw them from the sequence first in one round trip
+    return db.session.execute(
+        text("SELECT nextval(pg_get_serial_sequence('task_manager', 'id')) FROM generate_series(1, :count)"),
+        {"count": count}
+    ).scalars().all()
+
+
+def copy_value(value):
+    # COPY text format: \N is NULL, so backslashes and the row/column separators in the
+    # data are escaped to keep a literal "\N" (or a tab) from changing the row
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def copy_tasks(rows):
+    # PostgreSQL COPY: stream the chunk in text format through the raw DBAPI cursor
+    ids = reserve_task_ids(len(rows))
+    columns = ['id'] + TASK_COLUMNS
+    buffer = io.StringIO()
+    for task_id, row in zip(ids, rows):
+        buffer.write('\t'.join([str(task_id)] + [copy_value(row[column]) for column in TASK_COLUMNS]) + '\n')
+    buffer.seek(0)
+
+    connection = db.session.connection().connection.dbapi_connection
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY task_manager ({', '.join(columns)}) FROM STDIN", buffer)
+    return ids
+
+
+def insert_tasks(rows, method):
+    # Returns the generated task ids (one per row, not necessarily in row order)
+    if not rows:
+        return []
+    if method == 'copy' and db.session.get_bind().dialect.name == 'postgresql':
+        return copy_tasks(rows)
+    # executemany over a Core insert is sent as batched multi-row INSERT ... RETURNING
+    # statements. sort_by_parameter_order is left off: on SQLite it falls back to one
+    # INSERT per row, and the ids only feed the "Task added" audit rows.
+    return db.session.execute(
+        insert(TaskManager).returning(TaskManager.id),
+        rows
+    ).scalars().all()
+
+
+def import_tasks(file, action_by, chunksize=None, method=None, start_row=0, after_chunk=None, file_format='csv'):
+    # Tasks and their "Task added" audit rows are written in the caller's transaction.
+    # after_chunk(results, rows_done) is called once a chunk has been written,
+    # which lets callers commit in batches and checkpoint their progress.
+    # file_format is 'csv', 'parquet' or 'arrow' (see detect_format).
+    config = current_app.config
+    chunksize = chunksize or config['TASK_IMPORT_CHUNK_SIZE']
+    method = method or config['TASK_IMPORT_METHOD']
+    max_errors = config['TASK_IMPORT_MAX_ERRORS']
+
+    results = {
+        "errors": [],
+        "created_users": [],
+        "dates": set(),
+        "imported": 0,
+        "failed": 0
+    }
+    known_users = {}
+    total_rows = 0
+    chunks = 0
+    started = time.perf_counter()
+    # Errors point at the file line for CSV (1-based, after the header), the row number otherwise
+    first_row = 2 if file_format == 'csv' else 1
+
+    for chunk in read_chunks(file, file_format, chunksize, start_row):
+        chunks += 1
+        total_rows += len(chunk)
+        frame = normalize_chunk(chunk)
+
+        # Rows that cannot be imported are reported with their line number in the file
+        invalid = frame['task_name'].isna() | frame['username'].isna()
+        for index in frame.index[invalid]:
+            results["failed"] += 1
+            if len(results["errors"]) < max_errors:
+                field = 'task_name' if frame.at[index, 'task_name'] is None else 'assigned_user'
+                results["errors"].append({"row": start_row + int(index) + first_row, "error": f"Missing {field}"})
+        frame = frame[~invalid]
+        if frame.empty:
+            if after_chunk:
+                after_chunk(results, start_row + total_rows)
+            continue
+
+        created = resolve_users(frame['username'].unique().tolist(), known_users)
+        results["created_users"].extend(created)
+
+        frame['assigned_user'] = frame['username'].map(known_users)
+        rows = frame[TASK_COLUMNS].to_dict('records')
+        task_ids = insert_tasks(rows, method)
+
+        # No previous state as the tasks are new
+        timestamp = indian_time()
+        write_audit_rows([audit_row(task_id, "Task added", action_by, timestamp=timestamp) for task_id in task_ids])
+
+        results["imported"] += len(task_ids)
+        results["dates"].update(row['created_at'] for row in rows)
+        if after_chunk:
+            after_chunk(results, start_row + total_rows)
+
+    elapsed = time.perf_counter() - started
+    results["stats"] = {
+        "rows": total_rows,
+        "chunks": chunks,
+        "chunk_size": chunksize,
+        "format": file_format,
+        "method": method,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_sec": round(total_rows / elapsed, 1) if elapsed > 0 else None
+    }
+    return results
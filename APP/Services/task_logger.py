@@ -1,18 +1,80 @@
+import logging
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select, func, literal
 from APP.database import db
 from APP.models import TaskManager, TaskLogger
 from APP.models import indian_time
+from APP.Services.cache import bump_table_version
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_statement(logged_at, day_start, day_end, id_range=None):
+    # INSERT INTO task_logger (task_id, logged_at) SELECT id, :logged_at FROM task_manager WHERE is_active ...
+    # skipping tasks that already have a log row for the snapshot day, so a retried run adds nothing twice
+    already_logged = select(TaskLogger.id).where(
+        TaskLogger.task_id == TaskManager.id,
+        TaskLogger.logged_at >= day_start,
+        TaskLogger.logged_at < day_end
+    ).exists()
+
+    source = select(
+        TaskManager.id,
+        literal(logged_at, db.DateTime)
+    ).where(
+        TaskManager.is_active == True,
+        ~already_logged
+    )
+    if id_range:
+        source = source.where(TaskManager.id >= id_range[0], TaskManager.id < id_range[1])
+
+    return insert(TaskLogger).from_select(['task_id', 'logged_at'], source)
+
+
+def snapshot_active_tasks(chunk_size=None):
+    # Log every active task once per (IST) day with set-based INSERT ... SELECT statements.
+    # With chunk_size the snapshot is committed per id range so locks are held briefly.
+    started = time.perf_counter()
+    logged_at = indian_time().replace(tzinfo=None)
+    day_start = datetime.combine(logged_at.date(), datetime.min.time())
+    day_end = day_start + timedelta(days=1)
+
+    rows_logged = 0
+    chunks = 0
+    if not chunk_size:
+        result = db.session.execute(snapshot_statement(logged_at, day_start, day_end))
+        db.session.commit()
+        rows_logged = result.rowcount
+        chunks = 1
+    else:
+        low, high = db.session.execute(
+            select(func.min(TaskManager.id), func.max(TaskManager.id)).where(TaskManager.is_active == True)
+        ).one()
+        if low is not None:
+            for start in range(low, high + 1, chunk_size):
+                result = db.session.execute(
+                    snapshot_statement(logged_at, day_start, day_end, (start, start + chunk_size))
+                )
+                db.session.commit()
+                rows_logged += result.rowcount
+                chunks += 1
+
+    if rows_logged:
+        # Drops the cached /tasks/task-records totals
+        bump_table_version("task_logger")
+    return {
+        "snapshot_day": day_start.date().isoformat(),
+        "rows_logged": rows_logged,
+        "chunks": chunks,
+        "elapsed_seconds": round(time.perf_counter() - started, 3)
+    }
+
 
 def log_active_tasks():
     try:
-        active_tasks = TaskManager.query.filter_by(is_active=True).all()
-        for task in active_tasks:
-            log_entry = TaskLogger(
-                task_id=task.id,
-                logged_at=indian_time()
-            )
-            db.session.add(log_entry)
-        db.session.commit()
-        print("Active tasks logged successfully.")
+        metrics = snapshot_active_tasks()
+        logger.info("Active tasks logged successfully: %s", metrics)
     except Exception as e:
         db.session.rollback()
-        print(f"Error logging active tasks: {e}")
\ No newline at end of file
+        logger.exception("Error logging active tasks: %s", e)
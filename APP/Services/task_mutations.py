@@ -0,0 +1,152 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from sqlalchemy import select, update, any_, and_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from APP.database import db
+from APP.models import TaskManager
+from APP.Services.audit_log import audit_row, write_audit_rows
+
+PRIORITY_LEVELS = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
+
+# Every field a mutation can change; all of them are recorded in the audit states
+AUDITED_FIELDS = ['task_name', 'description', 'is_active', 'priority']
+
+
+def describe_state(row, prefix=''):
+    # Audit state string, derived from the row itself (prefix='old_' reads the previous values)
+    return ", ".join(
+        f"{field}={json.dumps(value) if isinstance(value, str) else value}"
+        for field, value in ((field, getattr(row, prefix + field)) for field in AUDITED_FIELDS)
+    )
+
+
+def normalize_changes(data):
+    changes = {}
+    if 'task_name' in data:
+        changes['task_name'] = data['task_name']
+    if 'description' in data:
+        changes['description'] = data['description']
+    if 'is_active' in data:
+        changes['is_active'] = bool(data['is_active'])
+    if 'priority' in data:
+        priority_value = str(data['priority']).strip().upper()
+        changes['priority'] = priority_value if priority_value in PRIORITY_LEVELS else 'MEDIUM'
+    return changes
+
+
+def ids_condition(ids):
+    # id = ANY(:ids) binds the whole list as one array parameter on PostgreSQL
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return TaskManager.id == any_(bindparam('task_ids', value=list(ids), type_=ARRAY(db.Integer)))
+    return TaskManager.id.in_(ids)
+
+
+def as_list(value):
+    return value if isinstance(value, list) else [value]
+
+
+def normalize_priorities(values):
+    # Upper-cased priority filter values; unknown levels are rejected rather than sent to
+    # the database, where the native enum type raises on them
+    priorities = [str(p).strip().upper() for p in as_list(values)]
+    unknown = sorted(set(priorities) - set(PRIORITY_LEVELS))
+    if unknown:
+        raise ValueError(f"Unknown priority {', '.join(unknown)}. Use one of: {', '.join(PRIORITY_LEVELS)}")
+    return priorities
+
+
+def filter_condition(filters):
+    # Supported keys: priority, is_active, assigned_user, created_from, created_to (YYYY-MM-DD)
+    conditions = []
+    if 'priority' in filters:
+        conditions.append(TaskManager.priority.in_(normalize_priorities(filters['priority'])))
+    if 'is_active' in filters:
+        conditions.append(TaskManager.is_active == bool(filters['is_active']))
+    if 'assigned_user' in filters:
+        conditions.append(TaskManager.assigned_user.in_([int(u) for u in as_list(filters['assigned_user'])]))
+    if 'created_from' in filters:
+        conditions.append(TaskManager.created_at >= datetime.strptime(filters['created_from'], '%Y-%m-%d').date())
+    if 'created_to' in filters:
+        conditions.append(TaskManager.created_at <= datetime.strptime(filters['created_to'], '%Y-%m-%d').date())
+    if not conditions:
+        raise ValueError("The filter must contain at least one of: priority, is_active, assigned_user, created_from, created_to")
+    return and_(*conditions)
+
+
+def mutate_tasks(condition, changes, action_by, limit=None, expected_version=None):
+    # Lock the matching rows, apply the change and read back old and new state in one
+    # UPDATE ... FROM (SELECT ... FOR UPDATE) ... RETURNING, then write every audit row in
+    # one multi-row insert. Runs in the caller's transaction; returns the changed rows.
+    # expected_version turns the update into an optimistic-concurrency check.
+    if expected_version is not None:
+        condition = and_(condition, TaskManager.version == expected_version)
+    changes = dict(changes, version=TaskManager.version + 1)
+
+    old = select(
+        TaskManager.id,
+        *[getattr(TaskManager, field) for field in AUDITED_FIELDS]
+    ).where(condition).order_by(TaskManager.id)
+    if limit:
+        old = old.limit(limit)
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        old = old.with_for_update().cte('old')
+        rows = db.session.execute(
+            update(TaskManager)
+            .where(TaskManager.id == old.c.id)
+            .values(**changes)
+            .returning(
+                *TaskManager.__table__.c,
+                *[old.c[field].label(f'old_{field}') for field in AUDITED_FIELDS]
+            )
+        ).all()
+        rows = [SimpleNamespace(**row._mapping) for row in rows]
+    else:
+        # Other databases cannot return the FROM side of an UPDATE: read the old state first.
+        # The UPDATE repeats the condition (and with it the version check), so a row another
+        # writer changed in between is skipped and left out of the result.
+        previous = {row.id: row for row in db.session.execute(old).all()}
+        if not previous:
+            return []
+        updated = db.session.execute(
+            update(TaskManager)
+            .where(and_(TaskManager.id.in_(list(previous)), condition))
+            .values(**changes)
+            .returning(*TaskManager.__table__.c)
+        ).all()
+        rows = [
+            SimpleNamespace(
+                **row._mapping,
+                **{f'old_{field}': getattr(previous[row.id], field) for field in AUDITED_FIELDS}
+            )
+            for row in updated
+        ]
+
+    write_audit_rows([
+        audit_row(
+            row.id,
+            describe_state(row),
+            action_by,
+            previous_state=describe_state(row, prefix='old_')
+        )
+        for row in rows
+    ])
+    return rows
+
+
+def task_etag(task_id, version):
+    return f'"{task_id}-{version}"'
+
+
+def parse_etag(value):
+    # Accepts the ETag produced by task_etag (optionally weak); returns the version or None
+    if not value:
+        return None
+    value = value.strip()
+    if value.startswith('W/'):
+        value = value[2:]
+    try:
+        return int(value.strip('"').rsplit('-', 1)[-1])
+    except ValueError:
+        return None
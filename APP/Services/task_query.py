@@ -0,0 +1,112 @@
+import hashlib
+import json
+from datetime import date
+from sqlalchemy import select, tuple_
+from APP.database import db
+from APP.models import TaskManager
+from APP.Services.cache import get_or_load, table_version
+from APP.json_provider import to_json_bytes
+from APP.Services.pagination import encode_cursor, decode_cursor
+from APP.Services.task_export import parse_export_filters
+from APP.Services.task_mutations import filter_condition, normalize_priorities
+
+# Cache namespace of /tasks/query results
+TASK_QUERY = "task-query"
+
+# Fields a client may project, in output order
+FIELDS = {
+    "id": TaskManager.id,
+    "task_name": TaskManager.task_name,
+    "description": TaskManager.description,
+    "is_active": TaskManager.is_active,
+    "priority": TaskManager.priority,
+    "created_at": TaskManager.created_at,
+    "assigned_user": TaskManager.assigned_user,
+    "version": TaskManager.version,
+}
+# Sortable fields; every sort is completed with id so the order (and the cursor) is unique
+SORTS = ("id", "created_at", "priority", "task_name")
+
+
+def normalize_query(args, max_limit):
+    # Query string -> canonical dict: same request, same dict, same cache key
+    filters = parse_export_filters(args)
+    query = {}
+    if 'from' in filters:
+        query['created_from'] = filters['from'].isoformat()
+    if 'to' in filters:
+        query['created_to'] = filters['to'].isoformat()
+    if 'priority' in filters:
+        query['priority'] = sorted(set(normalize_priorities(filters['priority'])))
+    if 'assigned_user' in filters:
+        query['assigned_user'] = sorted({int(user) for user in filters['assigned_user']})
+    if 'is_active' in filters:
+        query['is_active'] = filters['is_active']
+
+    sort = args.get('sort', '-created_at').strip()
+    field = sort.lstrip('-+')
+    if field not in SORTS:
+        raise ValueError(f"sort must be one of {', '.join(SORTS)} (prefix with - for descending)")
+    query['sort'] = field
+    query['descending'] = sort.startswith('-')
+
+    fields = [name.strip() for name in args.get('fields', '').split(',') if name.strip()]
+    unknown = [name for name in fields if name not in FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    query['fields'] = [name for name in FIELDS if name in fields] if fields else list(FIELDS)
+
+    limit = int(args.get('limit', 50))
+    query['limit'] = max(1, min(limit, max_limit))
+    if args.get('cursor'):
+        decode_cursor(args['cursor'], 2)  # reject a malformed cursor before it reaches the cache
+        query['cursor'] = args['cursor']
+    return query
+
+
+def query_key(query):
+    return hashlib.sha1(json.dumps(query, sort_keys=True).encode()).hexdigest()
+
+
+def run_task_query(query):
+    # One SELECT of the projected columns plus the sort key, served by the created_at,
+    # assigned_user and primary key indexes depending on the filter and sort
+    sort_column = FIELDS[query['sort']]
+    names = query['fields'] + [name for name in (query['sort'], 'id') if name not in query['fields']]
+    statement = select(*[FIELDS[name] for name in names])
+
+    filters = {key: query[key] for key in ('priority', 'is_active', 'assigned_user', 'created_from', 'created_to') if key in query}
+    if filters:
+        statement = statement.where(filter_condition(filters))
+
+    key = tuple_(sort_column, TaskManager.id)
+    if 'cursor' in query:
+        value, last_id = decode_cursor(query['cursor'], 2)
+        if query['sort'] == 'created_at':
+            value = date.fromisoformat(value)
+        statement = statement.where(key < tuple_(value, last_id) if query['descending'] else key > tuple_(value, last_id))
+    if query['descending']:
+        statement = statement.order_by(sort_column.desc(), TaskManager.id.desc())
+    else:
+        statement = statement.order_by(sort_column, TaskManager.id)
+
+    rows = db.session.execute(statement.limit(query['limit'] + 1)).all()
+    has_more = len(rows) > query['limit']
+    rows = rows[:query['limit']]
+
+    return {
+        "data": [{name: getattr(row, name) for name in query['fields']} for row in rows],
+        "count": len(rows),
+        "next_cursor": encode_cursor(getattr(rows[-1], query['sort']), rows[-1].id) if has_more else None,
+        "query": {key: value for key, value in query.items() if key != 'cursor'}
+    }
+
+
+def cached_task_query(query, ttl):
+    # Returns the encoded response body. The key holds task_manager's version counter, so
+    # any task write makes every cached result unreachable without having to know which
+    # queries it affected.
+    version = table_version("task_manager")
+    if version is None:
+        return to_json_bytes(run_task_query(query))
+    return get_or_load(TASK_QUERY, f"{version}:{query_key(query)}", lambda: to_json_bytes(run_task_query(query)), ttl, raw=True)
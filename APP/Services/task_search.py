@@ -0,0 +1,74 @@
+import re
+from sqlalchemy import Float, and_, cast, func, literal, literal_column, or_, select, tuple_
+from APP.database import db
+from APP.models import TaskManager
+from APP.Services.task_mutations import filter_condition
+
+# Must match the regconfig of the search_vector generated column (APP/models.py)
+TS_CONFIG = 'english'
+MODES = ('fts', 'prefix', 'fuzzy')
+
+search_vector = literal_column('task_manager.search_vector')
+
+
+def prefix_tsquery(text):
+    # "deploy back" -> deploy:* & back:* ; only word characters reach to_tsquery
+    words = re.findall(r'\w+', text)
+    return ' & '.join(f'{word}:*' for word in words)
+
+
+def match_and_rank(mode, text):
+    # (WHERE condition, rank expression) for a search mode. Ranks are cast to double
+    # precision so a cursor round-trips through JSON without losing the float4 value.
+    if db.session.get_bind().dialect.name != 'postgresql':
+        # No tsvector/pg_trgm: plain substring match, ordered by id only. LIKE wildcards in
+        # the search text are escaped so they match literally.
+        escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        pattern = f'%{escaped}%'
+        return (or_(TaskManager.task_name.ilike(pattern, escape='\\'),
+                    TaskManager.description.ilike(pattern, escape='\\')),
+                literal(0.0))
+
+    if mode == 'fuzzy':
+        # task_name % :text uses the trigram index; pg_trgm.similarity_threshold tunes it
+        return (TaskManager.task_name.op('%')(text),
+                cast(func.similarity(TaskManager.task_name, text), Float(precision=53)))
+
+    if mode == 'prefix':
+        query = func.to_tsquery(literal_column(f"'{TS_CONFIG}'::regconfig"), prefix_tsquery(text))
+    else:
+        query = func.websearch_to_tsquery(literal_column(f"'{TS_CONFIG}'::regconfig"), text)
+    # ts_rank_cd with normalization 32 scales the rank to 0..1
+    return (search_vector.op('@@')(query),
+            cast(func.ts_rank_cd(search_vector, query, 32), Float(precision=53)))
+
+
+def search_tasks(text, mode='fts', filters=None, after=None, limit=20, max_candidates=0):
+    # Ranked search with keyset pagination on (rank DESC, id DESC). after is the
+    # (rank, id) of the last row of the previous page. With max_candidates 0 every match
+    # of the GIN/trigram condition is ranked. max_candidates > 0 ranks only the newest
+    # that many matches: it bounds the cost of very common terms, but an older, better
+    # match outside that window is never returned.
+    match, rank = match_and_rank(mode, text)
+    conditions = [match]
+    if filters:
+        conditions.append(filter_condition(filters))
+
+    candidates = select(
+        TaskManager.id,
+        TaskManager.task_name,
+        TaskManager.description,
+        TaskManager.priority,
+        TaskManager.is_active,
+        TaskManager.created_at,
+        TaskManager.assigned_user,
+        rank.label('rank')
+    ).where(and_(*conditions))
+    if max_candidates:
+        candidates = candidates.order_by(TaskManager.id.desc()).limit(max_candidates)
+    candidates = candidates.subquery('candidates')
+
+    statement = select(candidates).order_by(candidates.c.rank.desc(), candidates.c.id.desc())
+    if after is not None:
+        statement = statement.where(tuple_(candidates.c.rank, candidates.c.id) < tuple_(*after))
+    return db.session.execute(statement.limit(limit)).all()
@@ -0,0 +1,210 @@
+import logging
+import time
+from datetime import date, datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, func, insert, select, text
+from APP.celery_app import celery
+from APP.config import Config
+from APP.database import db
+from APP.models import TaskManager, TaskLogger, TaskDailyStats, TaskActivityDaily, indian_date
+from APP.Services.cache import redis_client, cached
+from APP.json_provider import to_json_bytes
+
+logger = logging.getLogger(__name__)
+
+# Cache namespace of /tasks/stats responses
+TASK_STATS = "task-stats"
+
+# created_at days whose task_daily_stats rows are stale, filled by the write paths
+DIRTY_DAYS_KEY = "stats:dirty-days"
+REFRESHED_AT_KEY = "stats:refreshed-at"
+
+
+def mark_days_dirty(days):
+    days = [str(day) for day in days if day is not None]
+    if not days:
+        return
+    try:
+        redis_client.sadd(DIRTY_DAYS_KEY, *days)
+    except Exception as e:
+        logger.warning("Error marking task stats days dirty: %s", e)
+
+
+def take_dirty_days():
+    # SPOP hands every dirty day to exactly one refresh run
+    days = redis_client.spop(DIRTY_DAYS_KEY, count=Config.STATS_REFRESH_MAX_DAYS) or []
+    return sorted(date.fromisoformat(day) for day in days)
+
+
+def rebuild_daily_stats(days=None):
+    # Replace the rollup rows of the given created_at days (all days when None) with a
+    # GROUP BY over just those days of task_manager
+    source = select(
+        TaskManager.created_at,
+        TaskManager.priority,
+        func.coalesce(TaskManager.is_active, True),
+        TaskManager.assigned_user,
+        func.count()
+    ).where(
+        TaskManager.created_at.isnot(None)
+    ).group_by(
+        TaskManager.created_at,
+        TaskManager.priority,
+        func.coalesce(TaskManager.is_active, True),
+        TaskManager.assigned_user
+    )
+    clear = delete(TaskDailyStats)
+    if days is not None:
+        source = source.where(TaskManager.created_at.in_(days))
+        clear = clear.where(TaskDailyStats.day.in_(days))
+
+    db.session.execute(clear)
+    return db.session.execute(insert(TaskDailyStats).from_select(
+        ['day', 'priority', 'is_active', 'assigned_user', 'tasks'], source
+    )).rowcount
+
+
+def rebuild_activity(since=None):
+    # task_logger only grows (one snapshot a night), so only days from the last
+    # rolled-up day onwards can change
+    logged_day = func.date(TaskLogger.logged_at)
+    source = select(
+        logged_day,
+        func.count(func.distinct(TaskLogger.task_id)),
+        func.count()
+    ).group_by(logged_day)
+    clear = delete(TaskActivityDaily)
+    if since is not None:
+        # a range on logged_at itself keeps partition pruning and the index usable
+        source = source.where(TaskLogger.logged_at >= datetime(since.year, since.month, since.day))
+        clear = clear.where(TaskActivityDaily.day >= since)
+
+    db.session.execute(clear)
+    return db.session.execute(insert(TaskActivityDaily).from_select(
+        ['day', 'active_tasks', 'logged_rows'], source
+    )).rowcount
+
+
+def refresh_task_stats(full=False):
+    # Incremental refresh of both rollups in one transaction. The first run (empty rollup)
+    # and full=True rebuild everything.
+    started = time.perf_counter()
+    if db.session.get_bind().dialect.name == 'postgresql':
+        # one refresh at a time; a concurrent run waits instead of racing the delete/insert
+        db.session.execute(text("SELECT pg_advisory_xact_lock(hashtext('refresh_task_stats'))"))
+
+    full = full or db.session.query(TaskDailyStats.id).first() is None
+    days = None if full else take_dirty_days()
+    try:
+        daily_rows = rebuild_daily_stats(None if full else days) if full or days else 0
+
+        last_day = None if full else db.session.query(func.max(TaskActivityDaily.day)).scalar()
+        activity_rows = rebuild_activity(last_day)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        mark_days_dirty(days or [])  # put them back for the next run
+        raise
+
+    try:
+        redis_client.set(REFRESHED_AT_KEY, time.time())
+    except Exception as e:
+        logger.warning("Error recording task stats refresh time: %s", e)
+    return {
+        "full": full,
+        "days_refreshed": "all" if full else len(days),
+        "daily_rows": daily_rows,
+        "activity_rows": activity_rows,
+        "elapsed_seconds": round(time.perf_counter() - started, 3)
+    }
+
+
+def last_refreshed_at():
+    try:
+        value = redis_client.get(REFRESHED_AT_KEY)
+    except Exception:
+        return None
+    return float(value) if value else None
+
+
+def stats_key(start, end):
+    return f"{start or '-'}:{end or '-'}"
+
+
+@cached(TASK_STATS, ttl=Config.TASK_STATS_TTL, key=stats_key, raw=True)
+def load_task_stats(start, end):
+    # Everything below reads only the rollup tables. start/end are ISO dates or None.
+    # Returns (and caches) the encoded JSON body.
+    start = date.fromisoformat(start) if start else None
+    end = date.fromisoformat(end) if end else None
+
+    def in_range(query, column):
+        if start:
+            query = query.filter(column >= start)
+        if end:
+            query = query.filter(column <= end)
+        return query
+
+    def counts(column):
+        rows = in_range(
+            db.session.query(column, func.sum(TaskDailyStats.tasks)), TaskDailyStats.day
+        ).group_by(column).all()
+        return {key: int(total) for key, total in rows}
+
+    by_active = counts(TaskDailyStats.is_active)
+    active = by_active.get(True, 0)
+    inactive = by_active.get(False, 0)
+
+    active_tasks = func.sum(TaskDailyStats.tasks).filter(TaskDailyStats.is_active == True)
+    users = in_range(
+        db.session.query(TaskDailyStats.assigned_user, func.sum(TaskDailyStats.tasks), active_tasks),
+        TaskDailyStats.day
+    ).group_by(
+        TaskDailyStats.assigned_user
+    ).order_by(
+        func.sum(TaskDailyStats.tasks).desc()
+    ).limit(current_app.config['STATS_TOP_USERS']).all()
+
+    # Day series default to the last STATS_TREND_DAYS days
+    trend_start = start or indian_date() - timedelta(days=current_app.config['STATS_TREND_DAYS'] - 1)
+    by_day = db.session.query(
+        TaskDailyStats.day, func.sum(TaskDailyStats.tasks), active_tasks
+    ).filter(TaskDailyStats.day >= trend_start)
+    if end:
+        by_day = by_day.filter(TaskDailyStats.day <= end)
+    by_day = by_day.group_by(TaskDailyStats.day).order_by(TaskDailyStats.day).all()
+
+    trend = db.session.query(TaskActivityDaily).filter(TaskActivityDaily.day >= trend_start)
+    if end:
+        trend = trend.filter(TaskActivityDaily.day <= end)
+    trend = trend.order_by(TaskActivityDaily.day).all()
+
+    return to_json_bytes({
+        "from": start.isoformat() if start else None,
+        "to": end.isoformat() if end else None,
+        "totals": {"tasks": active + inactive, "active": active, "inactive": inactive},
+        "by_priority": counts(TaskDailyStats.priority),
+        "by_assigned_user": [
+            {"assigned_user": user, "tasks": int(total), "active": int(active_count or 0)}
+            for user, total, active_count in users
+        ],
+        "by_created_day": [
+            {"day": day.isoformat(), "tasks": int(total), "active": int(active_count or 0)}
+            for day, total, active_count in by_day
+        ],
+        "active_trend": [
+            {"day": row.day.isoformat(), "active_tasks": row.active_tasks, "logged_rows": row.logged_rows}
+            for row in trend
+        ],
+        "refreshed_at": last_refreshed_at()
+    })
+
+
+@celery.task(bind=True)
+def refresh_task_stats_rollups(self):
+    try:
+        metrics = refresh_task_stats()
+        logger.info("Refreshed task stats rollups: %s", metrics)
+        return metrics
+    except Exception as e:
+        raise self.retry(exc=e, countdown=60, max_retries=3)
@@ -6,9 +6,13 @@ from .routes.task_routes import task_blueprint
 from .routes.user_routes import user_blueprint
 from .routes.health_routes import health_blueprint
 from APP.Services.rate_limiter import limiter
+from APP.Services.auth import register_user_loader
+from APP.json_provider import FastJSONProvider
+from APP.Services.metrics import register_metrics, TimedQueuePool
+from APP.Services.query_inspector import register_query_inspector
 from flask_migrate import Migrate
-from APP.celery_app import celery
 from dotenv import load_dotenv
+import logging
 import os
 
 # Load environment variables from .env file
@@ -16,8 +20,13 @@ load_dotenv()
 
 def create_app():
     app = Flask(__name__)
+    # orjson-backed jsonify(); falls back to the stdlib encoder when orjson is missing
+    app.json = FastJSONProvider(app)
     app.config.from_object(Config)
-    celery.conf.update(app.config)
+    # Services log through logging.getLogger(__name__); without handlers of its own the
+    # messages reach stderr through the root logger (Celery workers install theirs)
+    logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    logging.getLogger("APP").setLevel(app.config["LOG_LEVEL"])
     # Configure database and secrets
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL")
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY")
@@ -30,14 +39,19 @@ def create_app():
         'pool_timeout': 30,
         'pool_recycle': 1800,
         'pool_pre_ping': True,
+        'poolclass': TimedQueuePool,  # records checkout waits for /api/metrics
     }
     
+    # Before the limiter so rejected requests are timed too
+    register_metrics(app)
+    register_query_inspector(app)
     limiter.init_app(app)
     # Initialize database
     db.init_app(app)
     migrate = Migrate(app, db)
     # setup migration
     jwt = JWTManager(app)
+    register_user_loader(jwt)
     # Register blueprints
     app.register_blueprint(task_blueprint, url_prefix='/tasks')
     app.register_blueprint(user_blueprint, url_prefix='/users')
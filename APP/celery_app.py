@@ -1,20 +1,90 @@
-from celery import Celery
+from celery import Celery, Task
 from celery.schedules import crontab
+from celery.signals import worker_process_init, worker_process_shutdown
+from flask import has_app_context
 from dotenv import load_dotenv
 load_dotenv()
+from APP.config import Config
+from APP.database import db
+
+# Flask app shared by every task executed in this process
+flask_app = None
+
+
+def get_flask_app():
+    # Build the Flask app, SQLAlchemy engine and connection pool once per process
+    global flask_app
+    if flask_app is None:
+        from APP import create_app  # Imported here to avoid a circular import with the app factory
+        flask_app = create_app()
+    return flask_app
+
+
+class AppContextTask(Task):
+    # Run every task inside the process-wide app context instead of calling create_app() per run
+    def __call__(self, *args, **kwargs):
+        if has_app_context():
+            return super().__call__(*args, **kwargs)
+        with get_flask_app().app_context():
+            return super().__call__(*args, **kwargs)
+
+
 def make_celery(app_name=__name__):
     celery = Celery(
-        app_name, 
-        broker='REDIS_URL',
-        backend='REDIS_URL'
+        app_name,
+        broker=Config.CELERY_BROKER_URL,
+        backend=Config.CELERY_RESULT_BACKEND,
+        task_cls=AppContextTask
     )
     return celery
 celery = make_celery()
 
+# Modules whose tasks the worker must register
+celery.conf.include = [
+    "APP.Services.log_transter",
+    "APP.Services.import_jobs",
+    "APP.Services.audit_log",
+    "APP.Services.partitions",
+    "APP.Services.task_stats",
+    "APP.Services.metrics",  # no tasks; connects the task duration/retry signal handlers
+]
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    # Each prefork child builds its own app; connections inherited over fork are
+    # dropped without closing them, so the parent's sockets are left untouched
+    app = get_flask_app()
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    if flask_app is not None:
+        with flask_app.app_context():
+            db.engine.dispose()
+
+
 celery.conf.beat_schedule = {
     "daily_task":{
         "task": "APP.Services.log_transter.log_active_tasks",
         "schedule": crontab(hour=2, minute=43)
         # Run every day at midnight
+    },
+    "refresh_task_stats": {
+        "task": "APP.Services.task_stats.refresh_task_stats_rollups",
+        "schedule": Config.STATS_REFRESH_INTERVAL
+        # Rebuilds only the days changed since the last run
+    },
+    "drain_audit_events": {
+        "task": "APP.Services.audit_log.drain_audit_events",
+        "schedule": Config.AUDIT_DRAIN_INTERVAL
+        # Only has work to do with AUDIT_MODE=async
+    },
+    "maintain_log_partitions": {
+        "task": "APP.Services.partitions.maintain_log_partitions",
+        "schedule": crontab(hour=1, minute=30)
+        # Before the nightly snapshot, so its month always has a partition
     }
-}
\ No newline at end of file
+}
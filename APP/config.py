@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 from urllib.parse import urlparse
 
@@ -20,4 +21,110 @@ class Config:
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
     REDIS_URL = REDIS_URL  # Use the standalone variable
     CELERY_BROKER_URL = REDIS_URL
-    CELERY_RESULT_BACKEND = REDIS_URL
\ No newline at end of file
+    CELERY_RESULT_BACKEND = REDIS_URL
+
+    # Bulk task import (/tasks/upload-csv)
+    TASK_IMPORT_CHUNK_SIZE = int(os.getenv("TASK_IMPORT_CHUNK_SIZE", 5000))
+    TASK_IMPORT_METHOD = os.getenv("TASK_IMPORT_METHOD", "insert")  # "insert" or "copy" (PostgreSQL only)
+    TASK_IMPORT_MAX_ERRORS = int(os.getenv("TASK_IMPORT_MAX_ERRORS", 100))
+    # Asynchronous imports: uploads are spooled here and must be readable by the Celery workers
+    IMPORT_SPOOL_DIR = os.getenv("IMPORT_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "task_imports"))
+    IMPORT_PROGRESS_TTL = int(os.getenv("IMPORT_PROGRESS_TTL", 7 * 24 * 3600))
+
+    # Nightly TaskLogger snapshot; 0 runs it as a single statement, otherwise commits per id range
+    TASK_SNAPSHOT_CHUNK_SIZE = int(os.getenv("TASK_SNAPSHOT_CHUNK_SIZE", 0))
+
+    # /tasks/task-records paging
+    TASK_RECORDS_MAX_PER_PAGE = int(os.getenv("TASK_RECORDS_MAX_PER_PAGE", 100))
+    TASK_RECORDS_COUNT_TTL = int(os.getenv("TASK_RECORDS_COUNT_TTL", 60))
+
+    # Read-through cache (APP/Services/cache.py); bump CACHE_VERSION when a cached payload changes shape
+    CACHE_VERSION = os.getenv("CACHE_VERSION", "v4")
+    CACHE_LOCK_TIMEOUT_MS = int(os.getenv("CACHE_LOCK_TIMEOUT_MS", 5000))
+    CACHE_LOCK_POLL_MS = int(os.getenv("CACHE_LOCK_POLL_MS", 50))
+    TASKS_BY_DATE_TTL = int(os.getenv("TASKS_BY_DATE_TTL", 3600))
+    # In-process L1 cache in front of Redis, kept coherent across workers through Redis pub/sub
+    LOCAL_CACHE_ENABLED = os.getenv("LOCAL_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    LOCAL_CACHE_MAX_SIZE = int(os.getenv("LOCAL_CACHE_MAX_SIZE", 1024))
+    LOCAL_CACHE_TTL = int(os.getenv("LOCAL_CACHE_TTL", 30))
+
+    # Authenticated user lookup (APP/Services/auth.py)
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 300))
+    JWT_TRUST_ROLE_CLAIM = os.getenv("JWT_TRUST_ROLE_CLAIM", "false").lower() in ("1", "true", "yes")
+
+    # Password hashing (APP/Services/passwords.py): any werkzeug method string, e.g.
+    # "pbkdf2:sha256:600000" or "scrypt:32768:8:1". Existing hashes are upgraded on the
+    # next successful login after a change. 0 workers = one per CPU.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256:600000")
+    PASSWORD_SALT_LENGTH = int(os.getenv("PASSWORD_SALT_LENGTH", 16))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 0))
+
+    # Rate limiter (APP/Services/rate_limiter.py). "hybrid" counts in process and reconciles
+    # with Redis every LIMITER_SYNC_INTERVAL seconds (or after LIMITER_MAX_PENDING local hits
+    # of a key); "redis" is the plain flask-limiter Redis storage. LIMITER_KEY is "identity"
+    # (JWT user, client address when anonymous) or "ip". LIMITER_FAIL_MODE "open" keeps
+    # limiting per process while Redis is down, "closed" rejects rate-limited requests.
+    LIMITER_STORAGE = os.getenv("LIMITER_STORAGE", "hybrid")
+    LIMITER_KEY = os.getenv("LIMITER_KEY", "identity")
+    LIMITER_SYNC_INTERVAL = float(os.getenv("LIMITER_SYNC_INTERVAL", 0.2))
+    LIMITER_MAX_PENDING = int(os.getenv("LIMITER_MAX_PENDING", 5))
+    LIMITER_FAIL_MODE = os.getenv("LIMITER_FAIL_MODE", "open")
+    LIMITER_REDIS_TIMEOUT = float(os.getenv("LIMITER_REDIS_TIMEOUT", 0.1))
+
+    # Level of the APP.* loggers (service and background job messages)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+    # Prometheus metrics at /api/metrics (APP/Services/metrics.py). The endpoint needs an admin
+    # JWT unless METRICS_PUBLIC is set (only for scrapers on a private network).
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    METRICS_PUBLIC = os.getenv("METRICS_PUBLIC", "false").lower() in ("1", "true", "yes")
+
+    # N+1 / slow query inspector for development and staging (APP/Services/query_inspector.py):
+    # a query shape repeated REPEAT_THRESHOLD times in one request is flagged, statements
+    # slower than SLOW_MS are logged with their EXPLAIN plan. Report: /api/query-report.
+    QUERY_INSPECTOR_ENABLED = os.getenv("QUERY_INSPECTOR_ENABLED", "false").lower() in ("1", "true", "yes")
+    QUERY_INSPECTOR_REPEAT_THRESHOLD = int(os.getenv("QUERY_INSPECTOR_REPEAT_THRESHOLD", 5))
+    QUERY_INSPECTOR_SLOW_MS = float(os.getenv("QUERY_INSPECTOR_SLOW_MS", 100))
+    QUERY_INSPECTOR_EXPLAIN = os.getenv("QUERY_INSPECTOR_EXPLAIN", "true").lower() in ("1", "true", "yes")
+    QUERY_INSPECTOR_MAX_SLOW = int(os.getenv("QUERY_INSPECTOR_MAX_SLOW", 20))
+
+    # Maximum number of tasks changed by one /tasks/batch request
+    TASK_BATCH_MAX_SIZE = int(os.getenv("TASK_BATCH_MAX_SIZE", 1000))
+
+    # Audit log (APP/Services/audit_log.py): "sync" writes audit rows in the request
+    # transaction, "async" appends them to a Redis stream drained by a Celery beat job
+    AUDIT_MODE = os.getenv("AUDIT_MODE", "sync").lower()
+    AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", 500))
+    AUDIT_DRAIN_INTERVAL = int(os.getenv("AUDIT_DRAIN_INTERVAL", 5))
+    AUDIT_DRAIN_MAX_SECONDS = int(os.getenv("AUDIT_DRAIN_MAX_SECONDS", 30))
+    AUDIT_CLAIM_IDLE_MS = int(os.getenv("AUDIT_CLAIM_IDLE_MS", 60000))
+    AUDIT_LOCAL_FLUSH_SECONDS = float(os.getenv("AUDIT_LOCAL_FLUSH_SECONDS", 1))
+
+    # Monthly partitions of task_logger and audit_logger (APP/Services/partitions.py).
+    # Retention is in months including the current one; 0 keeps every partition.
+    # Expired partitions are detached (kept as plain tables) or dropped.
+    PARTITION_PREMAKE_MONTHS = int(os.getenv("PARTITION_PREMAKE_MONTHS", 3))
+    TASK_LOGGER_RETENTION_MONTHS = int(os.getenv("TASK_LOGGER_RETENTION_MONTHS", 12))
+    AUDIT_LOGGER_RETENTION_MONTHS = int(os.getenv("AUDIT_LOGGER_RETENTION_MONTHS", 0))
+    PARTITION_RETENTION_ACTION = os.getenv("PARTITION_RETENTION_ACTION", "detach").lower()
+
+    # /tasks/export/<dataset>: rows fetched per server-side cursor batch, gzip level (0 disables gzip)
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 2000))
+    EXPORT_GZIP_LEVEL = int(os.getenv("EXPORT_GZIP_LEVEL", 6))
+
+    # /tasks/stats rollups (APP/Services/task_stats.py)
+    TASK_STATS_TTL = int(os.getenv("TASK_STATS_TTL", 300))
+    STATS_REFRESH_INTERVAL = int(os.getenv("STATS_REFRESH_INTERVAL", 300))
+    STATS_REFRESH_MAX_DAYS = int(os.getenv("STATS_REFRESH_MAX_DAYS", 5000))
+    STATS_TREND_DAYS = int(os.getenv("STATS_TREND_DAYS", 30))
+    STATS_TOP_USERS = int(os.getenv("STATS_TOP_USERS", 50))
+
+    # /tasks/search: page size cap. Every match is ranked by default; SEARCH_MAX_CANDIDATES > 0
+    # ranks only that many of the newest matches (cheaper for common terms, but older
+    # better matches are then left out; responses report the window as "ranked_newest")
+    SEARCH_MAX_PER_PAGE = int(os.getenv("SEARCH_MAX_PER_PAGE", 50))
+    SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", 0))
+
+    # /tasks/query: largest page and result cache lifetime
+    TASK_QUERY_MAX_LIMIT = int(os.getenv("TASK_QUERY_MAX_LIMIT", 500))
+    TASK_QUERY_TTL = int(os.getenv("TASK_QUERY_TTL", 300))
@@ -1,6 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
 import time
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, inspect, text
 
 # Create the SQLAlchemy object
 db = SQLAlchemy()
@@ -14,9 +14,11 @@ def initialize_db(app, retries=5, delay=2):
             with engine.connect() as connection:
                 result = connection.execute(text('SELECT 1'))
                 print(f"Database connection successful: {result.fetchone()}")
+                # True when the database had no tables yet (see run.py)
+                fresh = not inspect(connection).get_table_names()
                 with app.app_context():
                     db.create_all()  # Create tables
-                return
+                return fresh
         except Exception as e:
             attempt += 1
             print(f"Database connection failed (Attempt {attempt}/{retries}): {e}")
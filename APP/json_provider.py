@@ -0,0 +1,68 @@
+import dataclasses
+import decimal
+import enum
+import json
+import uuid
+from datetime import date, datetime
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is used without it
+    orjson = None
+
+
+def default(value):
+    # Types neither encoder handles natively. Dates are always ISO 8601 (Flask's default
+    # provider writes them as HTTP dates).
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode='json')
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, '_asdict'):  # SQLAlchemy Row
+        return value._asdict()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_json_bytes(obj, sort_keys=False):
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(obj, default=default, sort_keys=sort_keys, separators=(',', ':')).encode()
+
+
+def json_bytes_response(payload, status=200):
+    # For bodies that are already encoded, e.g. cached payloads: no decode/encode round trip
+    return current_app.response_class(payload, status=status, mimetype=current_app.json.mimetype)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    # app.json provider used by jsonify(); orjson when installed, the stdlib otherwise
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return to_json_bytes(obj, self.sort_keys).decode()
+        kwargs.setdefault('default', default)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        # Encode straight to bytes instead of str -> bytes
+        obj = self._prepare_response_obj(args, kwargs)
+        if self._app.debug and self.compact is not True:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(to_json_bytes(obj, self.sort_keys), mimetype=self.mimetype)
@@ -1,6 +1,8 @@
 # from sqlalchemy import Column, Integer, String, ForeignKey
 from APP.database import db
 from datetime import datetime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import PrimaryKeyConstraint
 import pytz
 
 
@@ -36,23 +38,136 @@ class TaskManager(db.Model):
     priority = db.Column(db.Enum('LOW', 'MEDIUM', 'HIGH', 'CRITICAL', name='priority_levels'), nullable=False, default='LOW')
     created_at = db.Column(db.Date, default=indian_date)
     assigned_user = db.Column(db.Integer, db.ForeignKey("user.id"))
+    # bumped on every change; exposed as the task's ETag for optimistic concurrency
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
 
+    __table_args__ = (
+        # get_task_by_date looks tasks up by creation date; /tasks/query walks (created_at, id) keyset pages
+        db.Index('ix_task_manager_created_at_id', 'created_at', 'id'),
+        # most listings only care about active tasks
+        db.Index('ix_task_manager_active_created_at', 'created_at',
+                 postgresql_where=db.text('is_active'), sqlite_where=db.text('is_active')),
+        db.Index('ix_task_manager_assigned_user', 'assigned_user'),
+        db.Index('ix_task_manager_task_name', 'task_name'),
+    )
 
-# task_logger table where only active tasks are logged
+
+# Full-text search over task_manager (APP/Services/task_search.py), PostgreSQL only.
+# search_vector is a generated column kept out of the mapping, so ordinary task queries
+# never load it; pg_trgm backs prefix and fuzzy matching on task_name.
+TASK_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """ALTER TABLE task_manager ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(task_name, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_task_manager_search_vector ON task_manager USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_task_manager_task_name_trgm ON task_manager USING gin (task_name gin_trgm_ops)",
+]
+for statement in TASK_SEARCH_DDL:
+    db.event.listen(TaskManager.__table__, 'after_create', db.DDL(statement).execute_if(dialect='postgresql'))
+
+
+@compiles(PrimaryKeyConstraint, 'postgresql')
+def partitioned_primary_key(constraint, compiler, **kw):
+    # PostgreSQL wants the partition key in every unique constraint of a partitioned table,
+    # so there the primary key becomes (id, <partition column>). The mapped key stays id
+    # alone, which keeps the tables autoincrementing on SQLite and other databases.
+    partition_column = constraint.table.info.get('partition_column')
+    if partition_column is None or partition_column in constraint.columns:
+        return compiler.visit_primary_key_constraint(constraint, **kw)
+    columns = [column.name for column in constraint.columns] + [partition_column]
+    return f"PRIMARY KEY ({', '.join(compiler.preparer.quote(name) for name in columns)})"
+
+
+# task_logger table where only active tasks are logged.
+# Range partitioned by month on logged_at on PostgreSQL (see APP/Services/partitions.py).
 class TaskLogger(db.Model):
     __tablename__ = 'task_logger'
 
-    id = db.Column(db.Integer, primary_key=True)
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     task_id = db.Column(db.Integer, db.ForeignKey("task_manager.id"))
-    logged_at = db.Column(db.DateTime, default=indian_time)
+    logged_at = db.Column(db.DateTime, nullable=False, default=indian_time)
+
+    __table_args__ = (
+        # get_task_log and the nightly snapshot's "already logged today" check
+        db.Index('ix_task_logger_task_id_logged_at', 'task_id', 'logged_at'),
+        {'postgresql_partition_by': 'RANGE (logged_at)', 'info': {'partition_column': 'logged_at'}},
+    )
 
 
+# audit_logger table, range partitioned by month on timestamp like task_logger
 class Audit_logger(db.Model):
     __tablename__ = 'audit_logger'
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     task_id = db.Column(db.Integer, db.ForeignKey("task_manager.id"))
-    previous_state = db.Column(db.String(255))
-    current_state = db.Column(db.String(255))
+    # full task state before and after the change (task_mutations.describe_state)
+    previous_state = db.Column(db.Text)
+    current_state = db.Column(db.Text)
     action_by = db.Column(db.String(50), nullable=False)
-    timestamp = db.Column(db.DateTime, default=indian_time)
\ No newline at end of file
+    timestamp = db.Column(db.DateTime, nullable=False, default=indian_time)
+    # idempotency key of the audit event, so redelivered events are written once
+    event_id = db.Column(db.String(36))
+
+    __table_args__ = (
+        # latest audit entry of a task
+        db.Index('ix_audit_logger_task_id_timestamp', 'task_id', db.text('timestamp DESC')),
+        # unique indexes on a partitioned table must contain the partition key
+        db.Index('ux_audit_logger_event_id', 'event_id', 'timestamp', unique=True),
+        {'postgresql_partition_by': 'RANGE (timestamp)', 'info': {'partition_column': 'timestamp'}},
+    )
+
+
+# Rows outside every monthly partition land in a DEFAULT partition instead of failing;
+# the partition maintenance job moves them out when it creates their month.
+for partitioned_table in (TaskLogger.__table__, Audit_logger.__table__):
+    db.event.listen(
+        partitioned_table,
+        'after_create',
+        db.DDL('CREATE TABLE IF NOT EXISTS %(table)s_default PARTITION OF %(table)s DEFAULT').execute_if(dialect='postgresql')
+    )
+
+# /tasks/task-records walks task_logger newest first, keyset paginated on (logged_at, id)
+db.Index('ix_task_logger_logged_at_id', TaskLogger.logged_at.desc(), TaskLogger.id.desc())
+
+
+# Rollups behind /tasks/stats (APP/Services/task_stats.py); rebuilt per day by a beat job
+# so dashboards never scan task_manager or task_logger.
+# task_daily_stats: task counts per created_at day, priority, active flag and user
+class TaskDailyStats(db.Model):
+    __tablename__ = 'task_daily_stats'
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False, index=True)
+    priority = db.Column(db.String(20), nullable=False)
+    is_active = db.Column(db.Boolean, nullable=False)
+    assigned_user = db.Column(db.Integer)
+    tasks = db.Column(db.Integer, nullable=False)
+
+
+# task_activity_daily: active tasks logged per day by the nightly snapshot
+class TaskActivityDaily(db.Model):
+    __tablename__ = 'task_activity_daily'
+
+    day = db.Column(db.Date, primary_key=True)
+    active_tasks = db.Column(db.Integer, nullable=False)
+    logged_rows = db.Column(db.Integer, nullable=False)
+
+
+# import_job table tracks asynchronous CSV imports so a restarted worker can resume
+class ImportJob(db.Model):
+    __tablename__ = 'import_job'
+
+    id = db.Column(db.String(36), primary_key=True)
+    filename = db.Column(db.String(255))
+    file_path = db.Column(db.String(500), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    total_rows = db.Column(db.Integer)
+    rows_done = db.Column(db.Integer, nullable=False, default=0)
+    rows_imported = db.Column(db.Integer, nullable=False, default=0)
+    rows_failed = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+    created_by = db.Column(db.Integer, db.ForeignKey("user.id"))
+    created_at = db.Column(db.DateTime, default=indian_time)
+    updated_at = db.Column(db.DateTime, default=indian_time, onupdate=indian_time)
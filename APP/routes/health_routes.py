@@ -1,9 +1,14 @@
 from flask import Blueprint, jsonify
 from APP.database import db
 from sqlalchemy.sql import text
-from APP.Services.rate_limiter import limiter
-from flask import request
-from flask_limiter.util import get_remote_address
+from APP.Services.rate_limiter import limiter, rate_limit_key, limiter_stats
+from APP.Services.cache import stats as cache_stats
+from APP.Services.audit_log import pipeline_stats as audit_pipeline_stats
+from APP.Services.metrics import metrics_response
+from APP.Services.query_inspector import query_report, reset_reports
+from flask import request, current_app
+from flask_jwt_extended import jwt_required
+from APP.Services.auth import admin_required
 health_blueprint = Blueprint('health', __name__)
 @health_blueprint.route('/health/db', methods=['GET'])
 @limiter.exempt
@@ -29,7 +34,63 @@ def check_database_connection():
 def check_limiter():
     return jsonify({
         "client_ip": request.remote_addr,
-        "limiter_key": get_remote_address(),
+        "limiter_key": rate_limit_key(),
         "status": "success",
         "message": "Rate limiter is working"
-    }), 200
\ No newline at end of file
+    }), 200
+
+
+# The diagnostics below expose internals (raw SQL and plans in the query report), so they
+# are admin only like the other admin endpoints
+
+@health_blueprint.route('/cache/stats', methods=['GET'])
+@jwt_required()
+@admin_required("You are not authorized to view diagnostics.")
+def get_cache_stats():
+    # Counters are per worker process
+    return jsonify(cache_stats.snapshot()), 200
+
+
+@health_blueprint.route('/metrics', methods=['GET'])
+@limiter.exempt
+def get_metrics():
+    # Prometheus text format; request, SQL and Redis series are per worker process.
+    # Scraped often, so not rate limited; open without a token only with METRICS_PUBLIC.
+    if current_app.config['METRICS_PUBLIC']:
+        return metrics_response()
+    return get_protected_metrics()
+
+
+@jwt_required()
+@admin_required("You are not authorized to view diagnostics.")
+def get_protected_metrics():
+    return metrics_response()
+
+
+@health_blueprint.route('/query-report', methods=['GET', 'DELETE'])
+@jwt_required()
+@admin_required("You are not authorized to view diagnostics.")
+def get_query_report():
+    # Per endpoint: statement counts, likely N+1 query shapes and slow queries with plans
+    if not current_app.config['QUERY_INSPECTOR_ENABLED']:
+        return jsonify({"error": "The query inspector is disabled (QUERY_INSPECTOR_ENABLED)."}), 404
+    if request.method == 'DELETE':
+        reset_reports()
+        return jsonify({"message": "Query report cleared"}), 200
+    return jsonify(query_report()), 200
+
+
+@health_blueprint.route('/limiter/stats', methods=['GET'])
+@jwt_required()
+@admin_required("You are not authorized to view diagnostics.")
+def get_limiter_stats():
+    # Counters are per worker process
+    return jsonify(limiter_stats()), 200
+
+
+@health_blueprint.route('/audit/stats', methods=['GET'])
+@jwt_required()
+@admin_required("You are not authorized to view diagnostics.")
+def get_audit_stats():
+    # Stream depth and lag are global; the counters are per worker process
+    return jsonify(audit_pipeline_stats()), 200
@@ -1,13 +1,25 @@
-import json
-from flask import request, jsonify, Blueprint
+import math
+from flask import request, jsonify, Blueprint, url_for, current_app, Response, stream_with_context
 from APP.models import User, TaskManager, TaskLogger, Audit_logger, indian_time, indian_date
 from APP.database import db
-from flask_jwt_extended import jwt_required, get_jwt_identity
-import pandas as pd
-from werkzeug.security import generate_password_hash
+from flask_jwt_extended import jwt_required, current_user
 from datetime import datetime
 from APP.Services.rate_limiter import limiter
-from APP.Services.cache import redis_client
+from APP.Services.auth import admin_required
+from APP.Services.cache import cached, TASKS_BY_DATE
+from APP.Services.task_events import tasks_changed
+from APP.config import Config
+from APP.Services.task_importer import import_tasks, detect_format
+from APP.Services.import_jobs import create_import_job, get_job_progress
+from APP.Services.pagination import encode_cursor, decode_cursor, approximate_query_count, cached_count
+from sqlalchemy import tuple_, and_, select
+from APP.Services.task_stats import load_task_stats
+from APP.Services.task_query import normalize_query, cached_task_query
+from APP.Services.task_search import MODES as SEARCH_MODES, prefix_tsquery, search_tasks
+from APP.Services.task_export import DATASETS, FORMATS, parse_export_filters, export_stream
+from APP.Services.task_mutations import mutate_tasks, normalize_changes, ids_condition, filter_condition, task_etag, parse_etag
+from APP.schemas import TaskListAdapter, TaskRecordListAdapter, dump_rows
+from APP.json_provider import to_json_bytes, json_bytes_response
 
 
 task_blueprint = Blueprint('task_blueprint', __name__)
@@ -20,12 +32,20 @@ def home():
         "endpoints": {
             "GET": [
                 "/tasks/task-records",
-                "/tasks/task-log/<int:id>"
+                "/tasks/task-log/<int:id>",
+                "/tasks/imports/<job_id>",
+                "/tasks/export/<tasks|logs|audits>?format=ndjson|csv",
+                "/tasks/stats",
+                "/tasks/search?q=",
+                "/tasks/query"
             ],
             "POST": [
                 "/tasks/create-task",
                 "/tasks/upload-csv",
-                "/tasks/update-task/<int:task_id>"
+                "/tasks/upload-csv?async=true",
+                "/tasks/update-task/<int:task_id>",
+                "/tasks/batch",
+                "/tasks/batch/delete"
             ],
             "DELETE": [
                 "/tasks/delete/<int:task_id>"
@@ -38,14 +58,9 @@ def home():
 @task_blueprint.route('/upload-csv', methods=['POST'])
 @limiter.limit("5 per minute")
 @jwt_required()
+@admin_required("You are not authorized to upload CSV files.")
 def upload_csv():
 
-    current_user_identity = get_jwt_identity()
-    current_user = User.query.filter_by(id=current_user_identity['id']).first()
-    
-    if not current_user or current_user.role != 'admin':
-        return jsonify({"error": "You are not authorized to upload CSV files."}), 403
-
     # Validate file upload
     if 'file' not in request.files:
         return jsonify({"error": "No file part in the request"}), 400
@@ -54,193 +69,104 @@ def upload_csv():
     if file.filename == '':
         return jsonify({"error": "No selected file"}), 400
 
+    # CSV, Parquet or Arrow IPC, from ?format= or the file extension
     try:
-        df = pd.read_csv(file)
-    except Exception as e:
-        return jsonify({"error": f"Error reading CSV file: {str(e)}"}), 400
-
-    required_columns = ['task_name', 'description', 'status', 'priority', 'created_at', 'assigned_user']
-    if not all(column in df.columns for column in required_columns):
-        return jsonify({"error": f"The CSV file must contain the following columns: {', '.join(required_columns)}"}), 400
-
-    # Create a dictionary to track success and errors
-    results = {
-        "success": [],
-        "errors": []
-    }
-
-    # Normalize priority values
-    priority_map = {
-        'LOW': 'LOW',
-        'MEDIUM': 'MEDIUM',
-        'MED': 'MEDIUM',
-        'HIGH': 'HIGH',
-        'CRITICAL': 'CRITICAL',
-        'CRIT': 'CRITICAL',
-        'URGENT': 'CRITICAL'
-    }
+        file_format = detect_format(file.filename, request.args.get('format'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    label = {"csv": "CSV", "parquet": "Parquet", "arrow": "Arrow"}[file_format]
+
+    # Async mode: spool the file and let a Celery worker import it in committed batches
+    if request.args.get('async', '').lower() in ('1', 'true', 'yes'):
+        try:
+            job = create_import_job(file, current_user.id, file_format)
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"error": f"Error queueing {label} import: {str(e)}"}), 500
+        return jsonify({
+            "message": f"{label} import queued.",
+            "job_id": job.id,
+            "status_url": url_for('task_blueprint.get_import_job', job_id=job.id)
+        }), 202
 
     try:
-        for _, row in df.iterrows():
-            task_name = row['task_name']
-            description = row['description']
-
-            # Convert status to boolean
-            status_value = row['status']
-            if isinstance(status_value, str):
-                is_active = status_value.strip().upper() in ['TRUE', 'YES', 'Y', '1', 'ACTIVE']
-            else:
-                is_active = bool(status_value)
-
-            # Normalize and validate priority
-            priority = str(row['priority']).strip().upper()
-            priority = priority_map.get(priority, 'MEDIUM')  # Default to MEDIUM if priority is invalid
-
-            # Parse date with multiple format support
-            try:
-                date_formats = ['%m/%d/%Y', '%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y']
-                created_at = None
-                for fmt in date_formats:
-                    try:
-                        created_at = datetime.strptime(str(row['created_at']), fmt)
-                        break
-                    except ValueError:
-                        continue
-
-                if created_at is None:
-                    created_at = indian_date()
-            except Exception:
-                created_at = indian_date()
-
-            # Handle assigned user - fetch from the CSV and create if not present
-            username = str(row['assigned_user']).strip()
-            assigned_user = User.query.filter_by(username=username).first()
-            if not assigned_user:
-                # Create a new user with a default password
-                default_password = f"{username}123"
-                assigned_user = User(
-                    username=username,
-                    password=generate_password_hash(default_password),
-                    role='user'  # Default role for new users
-                )
-                db.session.add(assigned_user)
-                db.session.flush()  # Flush to get the new user's ID
-                results["success"].append(f"Created new user '{username}' with default password.")
-
-            assigned_user_id = assigned_user.id
-
-            # Create a new task
-            new_task = TaskManager(
-                task_name=task_name,
-                description=description,
-                is_active=is_active,
-                priority=priority,
-                created_at=created_at,
-                assigned_user=assigned_user_id
-            )
-            db.session.add(new_task)
-            results["success"].append(f"Created task '{task_name}'")
-
-        # Commit all successful tasks and new users at once
-        db.session.commit()
-
-        # Create an audit log entry for this import
-        for task_name in results["success"]:
-            # Fetch the task that was just created
-            task = TaskManager.query.filter_by(task_name=task_name.split("'")[1]).first()
-            if task:
-                audit_log = Audit_logger(
-                    task_id=task.id,
-                    current_state="Task added",
-                    previous_state=None,  # No previous state as the task is new
-                    action_by=current_user.id,
-                    timestamp=indian_time()
-                )
-                db.session.add(audit_log)
-
-        # Commit all audit logs at once after the loop
+        # Stream the file through the bulk import engine; tasks, new users and audit rows share one commit
+        results = import_tasks(file, current_user.id, file_format=file_format)
         db.session.commit()
-
-        # Create a response with results
-        response = {
-            "message": f"CSV processing complete. {len(results['success'])} tasks imported successfully.",
-            "details": results
-        }
-
-        return jsonify(response), 200
-
+        tasks_changed(results["dates"])
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         # Rollback in case of error
         db.session.rollback()
-        return jsonify({"error": f"Error processing CSV: {str(e)}"}), 500
+        return jsonify({"error": f"Error processing {label}: {str(e)}"}), 500
+
+    # Create a response with results
+    response = {
+        "message": f"{label} processing complete. {results['imported']} tasks imported successfully.",
+        "details": {
+            "imported": results["imported"],
+            "failed": results["failed"],
+            "created_users": results["created_users"],
+            "errors": results["errors"]
+        },
+        "stats": results["stats"]
+    }
+
+    return jsonify(response), 200
     
 
 
+@task_blueprint.route('/imports/<string:job_id>', methods=['GET'])
+@jwt_required()
+@admin_required("You are not authorized to view CSV imports.")
+def get_import_job(job_id):
+    progress = get_job_progress(job_id)
+    if not progress:
+        return jsonify({"error": "Import job not found"}), 404
+    return jsonify(progress), 200
+
+
 # ========================================================
 
 @task_blueprint.route('/<int:task_id>', methods=['POST'])
 @limiter.limit("5 per minute")
 @jwt_required()
+@admin_required("You are not authorized to update tasks.")
 def update_task(task_id):
 
-    current_user_identity = get_jwt_identity()
-    current_user = User.query.filter_by(id=current_user_identity['id']).first()
-    
-    if not current_user or current_user.role != 'admin':
-        return jsonify({"error": "You are not authorized to update tasks."}), 403
-
-    data = request.get_json()
-    data_format = jsonify({
+    data = request.get_json(silent=True)
+    data_format = {
         "task_name": "string",
         "description": "string",
         "is_active": "boolean",
         "priority": "string (LOW, MEDIUM, HIGH, CRITICAL)",
-        "created_at": "date (YYYY-MM-DD)",
-        "assigned_user": "string (username)"
-    })
-    if not data:
+        "version": "integer (optional, or send the task's ETag in If-Match)"
+    }
+    changes = normalize_changes(data) if isinstance(data, dict) else {}
+    if not changes:
         return jsonify({"error": "Invalid input. Please provide a JSON object with task details.",
                         "data_format": data_format}), 400
 
-    # fetch task id from task manager to update the task
-    task = TaskManager.query.filter_by(id=task_id).first()
-    if not task:
-        return jsonify({"error": "Task not found"}), 404
-
-    # Update task details
-    if 'task_name' in data:
-        task.task_name = data['task_name']
-    if 'description' in data:
-        task.description = data['description']
-    if 'is_active' in data:
-        task.is_active = bool(data['is_active'])
-    if 'priority' in data:
-        priority_value = str(data['priority']).strip().upper()
-        priority_map = {
-            'LOW': 'LOW',
-            'MEDIUM': 'MEDIUM',
-            'HIGH': 'HIGH',
-            'CRITICAL': 'CRITICAL'
-        }
-        task.priority = priority_map.get(priority_value, 'MEDIUM')
+    # Optimistic concurrency: only apply the change to the version the client last saw
+    expected_version = parse_etag(request.headers.get('If-Match'))
+    if expected_version is None and data.get('version') is not None:
+        try:
+            expected_version = int(data['version'])
+        except (TypeError, ValueError):
+            return jsonify({"error": "version must be an integer"}), 400
+
+    # Update, previous state and audit row in one transaction
+    rows = mutate_tasks(ids_condition([task_id]), changes, current_user.id, expected_version=expected_version)
+    if not rows:
+        db.session.rollback()
+        return task_not_changed(task_id)
     db.session.commit()
 
-    task = TaskManager.query.filter_by(id=task_id).first()
-
-    if task:
-        audit  = Audit_logger.query.filter_by(task_id=task.id).first()
-        audit_log = Audit_logger(
-            task_id=task.id,
-            previous_state = audit.current_state,  # No previous state as the task is new
-            current_state="Task updated",
-            action_by=current_user.id,
-            timestamp=indian_time()
-        )
-
-    # Commit all audit logs at once after the loop
-    db.session.add(audit_log)
-    db.session.commit()
-    return jsonify({
+    task = rows[0]
+    tasks_changed([task.created_at])
+    response = jsonify({
         "message": "Task updated successfully",
         "task": {
             "task_name": task.task_name,
@@ -248,54 +174,273 @@ def update_task(task_id):
             "is_active": task.is_active,
             "priority": task.priority,
             "created_at": task.created_at,
-            "assigned_user": task.assigned_user
+            "assigned_user": task.assigned_user,
+            "version": task.version
         }
-    }), 200
+    })
+    response.headers['ETag'] = task_etag(task.id, task.version)
+    return response, 200
 
 
 @task_blueprint.route('/delete/<int:task_id>', methods=['DELETE'])
 @limiter.exempt
 @jwt_required()
+@admin_required("You are not authorized to delete tasks.")
 def delete_task(task_id):
-    current_user_identity = get_jwt_identity()
-    current_user = User.query.filter_by(id=current_user_identity['id']).first()
-    if not current_user or current_user.role != 'admin':
-        return jsonify({"error": "You are not authorized to delete tasks."}), 403
-    
-    task = TaskManager.query.filter_by(id=task_id).first()
+    expected_version = parse_etag(request.headers.get('If-Match'))
+    rows = mutate_tasks(ids_condition([task_id]), {"is_active": False}, current_user.id,
+                        expected_version=expected_version)
+    if not rows:
+        db.session.rollback()
+        return task_not_changed(task_id)
+    db.session.commit()
+
+    tasks_changed([rows[0].created_at])
+    response = jsonify({"message": "Task deleted successfully"})
+    response.headers['ETag'] = task_etag(task_id, rows[0].version)
+    return response, 200
+
+
+def task_not_changed(task_id):
+    # Nothing matched: either the task does not exist or its version moved on (If-Match failed)
+    task = db.session.get(TaskManager, task_id)
     if not task:
         return jsonify({"error": "Task not found"}), 404
-    task.is_active = False
-    db.session.add(task)
-    db.session.commit()
+    response = jsonify({
+        "error": "The task was modified by someone else. Reload it and retry.",
+        "current_version": task.version
+    })
+    response.headers['ETag'] = task_etag(task.id, task.version)
+    return response, 412
 
-    task = TaskManager.query.filter_by(id=task_id).first()
-    if task:
-        audit = Audit_logger(
-            task_id=task.id,
-            previous_state=task.is_active,
-            current_state= False,
-            action_by=current_user.id,
-            timestamp=indian_time()
-        )
-    db.session.add(audit)
-    db.session.commit()
-    return jsonify({"message": "Task deleted successfully"}), 200
+
+def run_batch(data, changes, action, only_active=False):
+    # Shared by the batch endpoints: one locked UPDATE ... RETURNING plus one audit insert, one commit
+    max_size = current_app.config['TASK_BATCH_MAX_SIZE']
+    ids = data.get('ids')
+    filters = data.get('filter')
+    if bool(ids) == bool(filters):
+        return jsonify({"error": "Provide either a non-empty 'ids' list or a 'filter' object."}), 400
+
+    if ids and (not isinstance(ids, list)
+                or any(isinstance(task_id, bool) or not isinstance(task_id, int) for task_id in ids)):
+        return jsonify({"error": "'ids' must be a list of integer task ids."}), 400
+    if filters and not isinstance(filters, dict):
+        return jsonify({"error": "'filter' must be an object."}), 400
+
+    try:
+        if ids:
+            ids = list(dict.fromkeys(ids))
+            if len(ids) > max_size:
+                return jsonify({"error": f"At most {max_size} ids can be changed per request."}), 400
+            condition = ids_condition(ids)
+        else:
+            condition = filter_condition(filters)
+            # Filter batches walk the matches by id: rows the update leaves in the filter
+            # would otherwise be picked again by every call
+            if data.get('cursor'):
+                after_id, = decode_cursor(data['cursor'], 1)
+                if isinstance(after_id, bool) or not isinstance(after_id, int):
+                    raise ValueError("Invalid cursor")
+                condition = and_(condition, TaskManager.id > after_id)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid batch request: {str(e)}"}), 400
+    if only_active:
+        condition = and_(condition, TaskManager.is_active == True)
+
+    try:
+        rows = mutate_tasks(condition, changes, current_user.id, limit=max_size)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Error applying batch: {str(e)}"}), 500
+    tasks_changed(row.created_at for row in rows)
+
+    response = {"message": f"{len(rows)} tasks {action}.", action: len(rows)}
+    if ids:
+        changed = {row.id for row in rows}
+        unmatched = [task_id for task_id in ids if task_id not in changed]
+        existing = set()
+        if unmatched and only_active:
+            existing = set(db.session.execute(select(TaskManager.id).where(ids_condition(unmatched))).scalars())
+        response["results"] = [
+            {
+                "id": task_id,
+                "status": action if task_id in changed else ("already_inactive" if task_id in existing else "not_found")
+            }
+            for task_id in ids
+        ]
+    else:
+        response["results"] = [{"id": row.id, "status": action} for row in rows]
+        # More matches past the last changed id: call again with next_cursor for the rest
+        last_id = max((row.id for row in rows), default=None)
+        has_more = len(rows) == max_size and db.session.execute(
+            select(TaskManager.id).where(condition, TaskManager.id > last_id).limit(1)
+        ).first() is not None
+        response["has_more"] = has_more
+        response["next_cursor"] = encode_cursor(last_id) if has_more else None
+    return jsonify(response), 200
+
+
+@task_blueprint.route('/batch', methods=['POST'])
+@limiter.limit("5 per minute")
+@jwt_required()
+@admin_required("You are not authorized to update tasks.")
+def batch_update_tasks():
+    data = request.get_json(silent=True)
+    data = data if isinstance(data, dict) else {}
+    changes = normalize_changes(data['changes']) if isinstance(data.get('changes'), dict) else {}
+    if not changes:
+        return jsonify({
+            "error": "Invalid input. Provide 'ids' or 'filter' and a 'changes' object.",
+            "example": {
+                "ids": [1, 2, 3],
+                "filter": {"priority": ["LOW"], "is_active": True, "assigned_user": [2],
+                           "created_from": "YYYY-MM-DD", "created_to": "YYYY-MM-DD"},
+                "changes": {"priority": "HIGH", "is_active": True, "task_name": "string", "description": "string"}
+            }
+        }), 400
+    return run_batch(data, changes, "updated")
+
+
+@task_blueprint.route('/batch/delete', methods=['POST'])
+@limiter.limit("5 per minute")
+@jwt_required()
+@admin_required("You are not authorized to delete tasks.")
+def batch_delete_tasks():
+    # Soft delete: only active tasks are deactivated and audited
+    data = request.get_json(silent=True)
+    return run_batch(data if isinstance(data, dict) else {}, {"is_active": False}, "deleted", only_active=True)
 # ========================================================
 
 
+@task_blueprint.route('/query', methods=['GET'])
+@jwt_required()
+def query_tasks():
+    # Filters: from, to (created_at, YYYY-MM-DD), priority, assigned_user (comma separated), is_active.
+    # sort=[-]id|created_at|priority|task_name, fields=comma separated projection, limit, cursor.
+    try:
+        query = normalize_query(request.args, current_app.config['TASK_QUERY_MAX_LIMIT'])
+        body = cached_task_query(query, current_app.config['TASK_QUERY_TTL'])
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid query: {str(e)}"}), 400
+    return json_bytes_response(body)
+
+
+@task_blueprint.route('/search', methods=['GET'])
+@jwt_required()
+def search():
+    # ?q= text, mode=fts|prefix|fuzzy, filters priority, is_active, assigned_user, from, to;
+    # keyset paginated with ?cursor= from the previous page's next_cursor
+    text = request.args.get('q', '').strip()
+    mode = request.args.get('mode', 'fts').lower()
+    if not text:
+        return jsonify({"error": "Missing search text (q)"}), 400
+    if mode not in SEARCH_MODES:
+        return jsonify({"error": f"Unknown mode. Use one of: {', '.join(SEARCH_MODES)}"}), 400
+    if mode == 'prefix' and not prefix_tsquery(text):
+        return jsonify({"error": "Prefix search needs at least one word"}), 400
+    per_page = request.args.get('per_page', default=20, type=int)
+    per_page = max(1, min(per_page, current_app.config['SEARCH_MAX_PER_PAGE']))
+
+    try:
+        filters = parse_export_filters(request.args)
+        # filter_condition() takes the created_at range as created_from/created_to strings
+        for bound, key in (('from', 'created_from'), ('to', 'created_to')):
+            if bound in filters:
+                filters[key] = filters.pop(bound).isoformat()
+        after = None
+        if request.args.get('cursor'):
+            rank, task_id = decode_cursor(request.args['cursor'], 2)
+            after = (float(rank), int(task_id))
+        max_candidates = current_app.config['SEARCH_MAX_CANDIDATES']
+        rows = search_tasks(text, mode, filters, after, per_page + 1, max_candidates)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid search request: {str(e)}"}), 400
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    return jsonify({
+        "data": [
+            {
+                "id": row.id,
+                "task_name": row.task_name,
+                "description": row.description,
+                "priority": row.priority,
+                "is_active": row.is_active,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+                "assigned_user": row.assigned_user,
+                "rank": row.rank
+            }
+            for row in rows
+        ],
+        "q": text,
+        "mode": mode,
+        "per_page": per_page,
+        # None when every match is ranked; otherwise only the newest that many matches are
+        "ranked_newest": max_candidates or None,
+        "next_cursor": encode_cursor(rows[-1].rank, rows[-1].id) if has_more else None
+    }), 200
+
+
+@task_blueprint.route('/stats', methods=['GET'])
+@jwt_required()
+def get_task_stats():
+    # Dashboard counts, served from the rollup tables; ?from=&to= (YYYY-MM-DD) bound the created_at days
+    try:
+        start = datetime.strptime(request.args['from'], '%Y-%m-%d').date().isoformat() if request.args.get('from') else None
+        end = datetime.strptime(request.args['to'], '%Y-%m-%d').date().isoformat() if request.args.get('to') else None
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD."}), 400
+    return json_bytes_response(load_task_stats(start, end))
+
+
+@task_blueprint.route('/export/<string:dataset>', methods=['GET'])
+@jwt_required()
+@admin_required("You are not authorized to export tasks.")
+def export_dataset(dataset):
+    # Streams a whole table as NDJSON or CSV.
+    # Filters: from, to (YYYY-MM-DD), priority, assigned_user (comma separated), is_active
+    if dataset not in DATASETS:
+        return jsonify({"error": f"Unknown dataset. Use one of: {', '.join(DATASETS)}"}), 404
+    export_format = request.args.get('format', 'ndjson').lower()
+    if export_format not in FORMATS:
+        return jsonify({"error": f"Unknown format. Use one of: {', '.join(FORMATS)}"}), 400
+    try:
+        filters = parse_export_filters(request.args)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid filter: {e}"}), 400
+
+    gzip_level = current_app.config['EXPORT_GZIP_LEVEL']
+    use_gzip = gzip_level > 0 and 'gzip' in request.headers.get('Accept-Encoding', '').lower()
+    try:
+        chunks = export_stream(dataset, export_format, filters, current_app.config['EXPORT_BATCH_SIZE'],
+                               gzip_level if use_gzip else None)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid filter: {e}"}), 400
+
+    # stream_with_context keeps the request (and its database session) alive while streaming
+    response = Response(stream_with_context(chunks), mimetype=FORMATS[export_format])
+    response.headers['Content-Disposition'] = f'attachment; filename="{dataset}.{export_format}"'
+    response.headers['Vary'] = 'Accept-Encoding'
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
 @task_blueprint.route('/task-records', methods=['GET'])
 @limiter.limit("5 per minute")
 @jwt_required()
 def get_tasks():
-    current_user_identity = get_jwt_identity()
-    current_user = User.query.filter_by(id=current_user_identity['id']).first()
-    if not current_user:
-        return jsonify({"error": "User not found"}), 404
-
+    # Unknown users are rejected by the JWT user loader
     page = request.args.get('page', default=1, type=int)
-    per_page = 5
-    
+    per_page = request.args.get('per_page', default=5, type=int)
+    per_page = max(1, min(per_page, current_app.config['TASK_RECORDS_MAX_PER_PAGE']))
+    # Cursor mode is selected by passing ?cursor= (empty for the first page)
+    cursor = request.args.get('cursor')
+    # total: exact (cached COUNT), approx (planner estimate of this query) or none
+    total_mode = request.args.get('total', default='none' if cursor is not None else 'exact')
+
     query = db.session.query(
         User.username,
         User.id.label('user_id'),
@@ -304,45 +449,66 @@ def get_tasks():
         TaskManager.description,
         TaskManager.created_at,
         TaskManager.priority,
+        TaskLogger.id.label('log_id'),
         TaskLogger.logged_at
     ).join(
+        TaskManager,
         TaskManager.assigned_user == User.id
     ).join(
         TaskLogger,
         TaskLogger.task_id == TaskManager.id
     ).filter(
         TaskManager.is_active == True
-    ).order_by(TaskLogger.logged_at.desc())
-
-    paginated_task = query.paginate(
-        page = page,
-        per_page = 5,
-        error_out = False
-        # error_out  = False is used handle 404 error if pages are out of bound
     )
 
-    result = []
-    for task in paginated_task.items:
-        result.append(
+    total = None
+    if total_mode == 'exact':
+        total = cached_count('task-records:count', query, current_app.config['TASK_RECORDS_COUNT_TTL'],
+                             tables=('task_manager', 'task_logger'))
+    elif total_mode == 'approx':
+        total = approximate_query_count(query)
+
+    # (logged_at, id) is unique, so it gives a stable order for both modes
+    query = query.order_by(TaskLogger.logged_at.desc(), TaskLogger.id.desc())
+
+    if cursor is not None:
+        if cursor:
+            try:
+                logged_at, log_id = decode_cursor(cursor, 2)
+                logged_at = datetime.fromisoformat(logged_at)
+                if isinstance(log_id, bool) or not isinstance(log_id, (int, str)):
+                    raise ValueError("Invalid cursor")
+                log_id = int(log_id)
+            except (TypeError, ValueError):
+                return jsonify({"error": "Invalid cursor"}), 400
+            # Seek past the last row of the previous page instead of scanning an OFFSET
+            query = query.filter(tuple_(TaskLogger.logged_at, TaskLogger.id) < tuple_(logged_at, log_id))
+        rows = query.limit(per_page + 1).all()
+    else:
+        rows = query.limit(per_page).offset((max(page, 1) - 1) * per_page).all()
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    result = dump_rows(TaskRecordListAdapter, rows)
+
+    if cursor is not None:
+        return jsonify(
             {
-                "username": task.username,
-                "user_id": task.user_id,
-                "task_id": task.task_id,
-                "task_name": task.task_name,
-                "description": task.description,
-                "created_at": task.created_at,
-                "priority": task.priority,
-                "logged_at": task.logged_at
+                "data": result,
+                "per_page": per_page,
+                "next_cursor": encode_cursor(rows[-1].logged_at, rows[-1].log_id) if has_more else None,
+                "total No of records": total,
             }
-        )
+        ), 200
 
     return jsonify(
         {
             "data": result,
-            "page": paginated_task.page,
+            "page": page,
             "per_page": per_page,
-            "total No of records": paginated_task,
-            "total pages": paginated_task.pages,
+            "total No of records": total,
+            "total pages": math.ceil(total / per_page) if total is not None else None,
 
         }
     ), 200
@@ -352,10 +518,6 @@ def get_tasks():
 @limiter.limit("5 per minute")
 @jwt_required()
 def get_task_log(id):
-    current_user_identity = get_jwt_identity()
-    current_user = User.query.filter_by(id=current_user_identity['id']).first()
-    if not current_user:
-        return jsonify({"error": "User not found"}), 404
     task_log = TaskLogger.query.filter_by(task_id = id).first()
     if not task_log:
         return jsonify({"error": "Task log not found"}), 404
@@ -378,35 +540,21 @@ def get_task_by_date(date):
     except ValueError:
         return jsonify({"error": "Invalid date format. Use YYYY-MM-DD."}), 400
 
-    key = f"task: {date}"
-    cached_tasks = redis_client.get(key)
-    if cached_tasks:
-        print("Cache hit")
-        return cached_tasks
-    task = TaskManager.query.filter_by(created_at = date).all()
-    if not task:
+    result = load_tasks_for_date(date.isoformat())
+    if not result:
         return jsonify({"error": "No task found for the given date"}), 404
-    task_list = []
-    for task in task:
-        task_list.append(
-            {
-                "id": task.id,
-                "task_name": task.task_name,
-                "description": task.description,
-                "is_active": task.is_active,
-                "priority": task.priority,
-                "assigned_user": task.assigned_user   
-            }
-        )
-    redis_client.set(key, json.dumps(task_list), ex=3600)
-    redis_client.expire(key, 3600)
-    return jsonify(
-            {
-                "task_list": task_list,
-                "message": "Task found successfully",
-                "date": date
-            }
-        )
-    
-
-
+    return json_bytes_response(result)
+
+
+@cached(TASKS_BY_DATE, ttl=Config.TASKS_BY_DATE_TTL, raw=True)
+def load_tasks_for_date(date):
+    # Cached under the ISO date as the encoded response body; every write path
+    # invalidates the dates it touches
+    tasks = TaskManager.query.filter_by(created_at=date).all()
+    if not tasks:
+        return None
+    return to_json_bytes({
+        "task_list": dump_rows(TaskListAdapter, tasks),
+        "message": "Task found successfully",
+        "date": date
+    })
@@ -1,27 +1,29 @@
+import logging
 from flask import request, jsonify, Blueprint
 from APP.models import User
-from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
+from flask_jwt_extended import jwt_required, create_access_token, current_user
 from datetime import timedelta
 from APP import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from APP.Services.passwords import hash_password, verify_password
 from APP.schemas import UserSchema, loginUserSchema
 from APP.Services.rate_limiter import limiter
+from APP.Services.auth import admin_required
+
+logger = logging.getLogger(__name__)
 
 user_blueprint = Blueprint('users', __name__)
 @user_blueprint.route('/register', methods=['POST'])
 @jwt_required()
+@admin_required("You are not authorized to register users.")
 def register_user():
-    current_user_identity = get_jwt_identity()
-    Current_user = User.query.filter_by(id=current_user_identity['id']).first()
-    if not Current_user or Current_user.role != 'admin':
-        return jsonify({"error": "You are not authorized to register users."}), 403
     data = request.get_json()
     try:
         validate_data = UserSchema(**data)
     except Exception as e:
         print(f"Error while validating data: {e}")
+        validate_data = None
 
-    if not data or 'username' not in data or 'password' not in data:
+    if not data or validate_data is None or 'username' not in data or 'password' not in data:
         return jsonify({
             "error": "Invalid input. Please provide a JSON object with 'username' and 'password'.",
             "example": {
@@ -36,13 +38,12 @@ def register_user():
         return jsonify({"error": "Username already exists"}), 409
 
     # Convert password to hash
-    hash_pass = generate_password_hash(validate_data.password)
-    password = hash_pass
+    hash_pass = hash_password(validate_data.password)
     role = data.get('role', 'user')
 
     # Insert new user into the database
     new_user = User(username=validate_data.username,
-                    password=validate_data.password,
+                    password=hash_pass,
                     role=validate_data.role)
     db.session.add(new_user)
     try:
@@ -56,9 +57,6 @@ def register_user():
         "message": "User registered successfully",
         "user": {
             "username": username,
-            "password": password,
-            # in real application, do not return password
-            # "password": hash_pass
             "role": role
         }
     }), 201
@@ -85,8 +83,21 @@ def login_user():
     password = validate_data.password
 
     user = User.query.filter_by(username=username).first()
-    if user and check_password_hash(user.password, password):
-        access_token = create_access_token(identity={"id": user.id, "username": username}, expires_delta=timedelta(days=1))
+    matches, new_hash = verify_password(user.password, password) if user else (False, None)
+    if matches and new_hash:
+        # Hash parameters changed: store the upgraded hash
+        user.password = new_hash
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning("Error rehashing password for %s: %s", username, e)
+    if matches:
+        access_token = create_access_token(
+            identity={"id": user.id, "username": username},
+            additional_claims={"role": user.role},  # lets authorization skip the user lookup (JWT_TRUST_ROLE_CLAIM)
+            expires_delta=timedelta(days=1)
+        )
         return jsonify({
             "message": "Login successful",
             "access_token": access_token
@@ -99,13 +110,9 @@ def login_user():
 @user_blueprint.route('/profile', methods=['GET'])
 @jwt_required()
 def get_profile():
-    current_user_identity = get_jwt_identity()
-    user = User.query.filter_by(id=current_user_identity['id']).first()
-    if not user:
-        return jsonify({"error": "User not found"}), 404
-
+    # Loaded (and cached) by the JWT user loader; unknown users get a 404 there
     return jsonify({
-        "username": user.username,
-        "role": user.role
+        "username": current_user.username,
+        "role": current_user.role
     }), 200
 
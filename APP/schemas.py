@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 
 class UserSchema(BaseModel):
@@ -30,6 +30,31 @@ class TaskManagerSchema(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TaskResponseSchema(TaskManagerSchema):
+    # A task_manager row as the API returns it: is_active is a nullable column and
+    # created_at a DATE (serialized as YYYY-MM-DD), plus the row version behind the ETag
+    is_active: Optional[bool] = Field(None, description="Is the task active?")
+    created_at: Optional[date] = Field(None, description="Creation date of the task")
+    version: Optional[int] = Field(None, description="Row version, used as the ETag")
+
+
+class TaskRecordSchema(BaseModel):
+    username: str = Field(..., description="Username of the assigned user")
+    user_id: int = Field(..., description="ID of the assigned user")
+    task_id: int = Field(..., description="Task ID")
+    task_name: str = Field(..., description="Name of the task")
+    description: Optional[str] = Field(None, description="Description of the task")
+    created_at: Optional[date] = Field(None, description="Creation date of the task")
+    priority: str = Field(..., description="Priority of the task")
+    log_id: int = Field(..., description="Log ID")
+    logged_at: Optional[datetime] = Field(None, description="Date and time when the task was logged")
+
+    class Config:
+        from_attributes = True
+
+
 class TaskLoggerSchema(BaseModel):
     id: Optional[int] = Field(None, description="Log ID")
     task_id: int = Field(..., description="ID of the task being logged")
@@ -47,3 +72,13 @@ class AuditLoggerSchema(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# Bulk converters: validate a whole list of ORM objects / result rows in one call and dump
+# it as JSON-ready dicts (dates as ISO strings)
+TaskListAdapter = TypeAdapter(List[TaskResponseSchema])
+TaskRecordListAdapter = TypeAdapter(List[TaskRecordSchema])
+
+
+def dump_rows(adapter, rows):
+    return adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode='json')
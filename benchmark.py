@@ -0,0 +1,413 @@
+"""Load test for the API endpoints.
+
+Seeds a reproducible dataset (users, tasks, years of task_logger and audit_logger
+rows), then drives each endpoint through the Flask test client at a fixed
+concurrency and reports p50/p95/p99 latency, throughput and SQL queries per
+request. Results are written as JSON; --compare diffs them against an earlier run.
+
+    python3 benchmark.py                                   # SQLite file + fakeredis
+    python3 benchmark.py --database postgresql://... --reset --tasks 200000
+    python3 benchmark.py --redis redis://localhost:6379/1  # a real Redis
+    python3 benchmark.py --endpoints task_by_date,task_records_cursor -n 500 -c 16
+    python3 benchmark.py --compare benchmark-old.json --fail-over 20
+
+Requests run in process (no HTTP server), so latency covers routing, the views,
+the database and Redis, not the network. Rate limits are disabled.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+SEED_PASSWORD = "benchmark123"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", help="database URL (default: a fresh SQLite file)")
+    parser.add_argument("--redis", default="fake", help="Redis URL, or 'fake' for fakeredis (default)")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate every table of --database first")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--years", type=int, default=2, help="span of the task_logger/audit_logger history")
+    parser.add_argument("--logs-per-task", type=int, default=3)
+    parser.add_argument("--audits-per-task", type=int, default=2)
+    parser.add_argument("--csv-rows", type=int, default=200, help="rows per /tasks/upload-csv request")
+    parser.add_argument("-n", "--requests", type=int, default=100, help="requests per endpoint")
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5, help="untimed requests per endpoint")
+    parser.add_argument("--endpoints", help="comma separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the dataset and requests")
+    parser.add_argument("-o", "--output", default="benchmark-results.json")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    parser.add_argument("--fail-over", type=float, default=0,
+                        help="with --compare, exit 1 when a p95 grows by more than this percent")
+    return parser.parse_args()
+
+
+def configure_environment(args):
+    # Must run before APP is imported: config.py reads the environment at import time
+    database = args.database or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='benchmark-'), 'benchmark.db')}"
+    os.environ["DATABASE_URL"] = database
+    os.environ["REDIS_URL"] = "redis://localhost:6379/0" if args.redis == "fake" else args.redis
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-jwt-secret-key-of-sufficient-length")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+    if args.redis == "fake":
+        try:
+            import fake_redis
+        except ImportError:
+            sys.exit("--redis fake needs the fakeredis package (pip install fakeredis), or pass --redis URL")
+        fake_redis.install()
+    return database
+
+
+def create_schema(reset):
+    from APP.database import db
+
+    if reset:
+        db.drop_all()
+    db.create_all()
+
+
+def seed(args):
+    # Batched inserts (insertmanyvalues) so SQLite and PostgreSQL seed the same data
+    from sqlalchemy import insert, select, text
+    from APP.database import db
+    from APP.models import User, TaskManager, TaskLogger, Audit_logger, indian_date, indian_time
+    from APP.Services.passwords import hash_password
+
+    if db.session.query(TaskManager.id).first() is not None:
+        sys.exit("The database already has tasks; pass --reset to start from an empty schema")
+
+    rng = random.Random(args.seed)
+    today = indian_date()
+    now = indian_time().replace(tzinfo=None)
+    history = args.years * 365
+    password = hash_password(SEED_PASSWORD)  # one hash shared by every seeded user
+    batch = 5000
+
+    def insert_batches(model, rows):
+        rows = list(rows)
+        for start in range(0, len(rows), batch):
+            db.session.execute(insert(model), rows[start:start + batch])
+
+    insert_batches(User, ({"username": f"bench_user_{i}", "password": password, "role": "user"}
+                          for i in range(args.users)))
+    user_ids = db.session.execute(select(User.id).where(User.username.like("bench_user_%"))).scalars().all()
+
+    priorities = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
+    words = ['deploy', 'backend', 'report', 'invoice', 'database', 'migration', 'review', 'frontend', 'billing', 'cache']
+    insert_batches(TaskManager, ({
+        "task_name": f"{rng.choice(words)} {rng.choice(words)} {i}",
+        "description": f"benchmark task {i} about {rng.choice(words)}",
+        "is_active": rng.random() < 0.75,
+        "priority": rng.choice(priorities),
+        "created_at": today - timedelta(days=rng.randrange(history)),
+        "assigned_user": rng.choice(user_ids)
+    } for i in range(args.tasks)))
+    task_ids = db.session.execute(select(TaskManager.id).order_by(TaskManager.id)).scalars().all()
+
+    insert_batches(TaskLogger, ({
+        "task_id": task_id,
+        "logged_at": now - timedelta(seconds=rng.randrange(history * 86400))
+    } for task_id in task_ids for _ in range(args.logs_per_task)))
+    insert_batches(Audit_logger, ({
+        "task_id": task_id,
+        "previous_state": None,
+        "current_state": "Task added",
+        "action_by": "1",
+        "timestamp": now - timedelta(seconds=rng.randrange(history * 86400)),
+        "event_id": str(uuid.UUID(int=rng.getrandbits(128)))
+    } for task_id in task_ids for _ in range(args.audits_per_task)))
+    db.session.commit()
+
+    if db.engine.dialect.name == 'postgresql':
+        for table in ('"user"', 'task_manager', 'task_logger', 'audit_logger'):
+            db.session.execute(text(f"ANALYZE {table}"))
+        db.session.commit()
+
+    from APP.Services.task_stats import refresh_task_stats
+    refresh_task_stats(full=True)
+    return {"user_ids": user_ids, "task_ids": task_ids, "today": today, "history": history}
+
+
+class QueryCounter:
+    # SQL statements per request: requests run in the calling thread, so a thread-local
+    # counter bumped by the engine event sees exactly one request's queries
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.local = threading.local()
+        event.listen(engine, "before_cursor_execute", self.count)
+
+    def count(self, *args):
+        self.local.queries = getattr(self.local, "queries", 0) + 1
+
+    def reset(self):
+        self.local.queries = 0
+
+    def value(self):
+        return getattr(self.local, "queries", 0)
+
+
+# Scenario: function(i, context) -> (method, url, request kwargs, auth role). Reads run
+# before writes so the writes do not change what the reads measure.
+def login(i, ctx):
+    return "POST", "/users/login", {"json": {"username": f"bench_user_{i % ctx['users']}", "password": SEED_PASSWORD}}, None
+
+
+def profile(i, ctx):
+    return "GET", "/users/profile", {}, "user"
+
+
+def task_by_date(i, ctx):
+    # A small set of dates so the run mixes cache misses and hits
+    day = ctx["today"] - timedelta(days=ctx["rng"].randrange(min(ctx["history"], 30)))
+    return "GET", f"/tasks/task/{day.isoformat()}", {}, "user"
+
+
+def task_records_page(i, ctx):
+    return "GET", f"/tasks/task-records?page={1 + i % 20}&per_page=20", {}, "user"
+
+
+def task_records_cursor(i, ctx):
+    return "GET", "/tasks/task-records?cursor=&per_page=50", {}, "user"
+
+
+def task_log(i, ctx):
+    return "GET", f"/tasks/task-log/{ctx['rng'].choice(ctx['task_ids'])}", {}, "user"
+
+
+def task_query(i, ctx):
+    priority = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL'][i % 4]
+    return "GET", f"/tasks/query?priority={priority}&sort=-created_at&limit=50", {}, "user"
+
+
+def search(i, ctx):
+    word = ['deploy', 'report', 'billing', 'cache'][i % 4]
+    return "GET", f"/tasks/search?q={word}", {}, "user"
+
+
+def stats(i, ctx):
+    return "GET", "/tasks/stats", {}, "user"
+
+
+def export_tasks(i, ctx):
+    since = (ctx["today"] - timedelta(days=30)).isoformat()
+    return "GET", f"/tasks/export/tasks?format=ndjson&from={since}", {}, "admin"
+
+
+def health_db(i, ctx):
+    return "GET", "/api/health/db", {}, None
+
+
+def update_task(i, ctx):
+    task_id = ctx["task_ids"][i % len(ctx["task_ids"])]
+    return "POST", f"/tasks/{task_id}", {"json": {"priority": ['LOW', 'HIGH'][i % 2]}}, "admin"
+
+
+def batch_update(i, ctx):
+    start = (i * 50) % max(len(ctx["task_ids"]) - 50, 1)
+    return "POST", "/tasks/batch", {"json": {"ids": ctx["task_ids"][start:start + 50], "changes": {"priority": "MEDIUM"}}}, "admin"
+
+
+def upload_csv(i, ctx):
+    rng = ctx["rng"]
+    rows = "".join(
+        f"bench csv {i}-{row},uploaded,yes,{rng.choice(['low', 'high', 'crit'])},"
+        f"{(ctx['today'] - timedelta(days=rng.randrange(365))).isoformat()},bench_user_{rng.randrange(ctx['users'])}\n"
+        for row in range(ctx["csv_rows"])
+    )
+    body = "task_name,description,status,priority,created_at,assigned_user\n" + rows
+    return "POST", "/tasks/upload-csv", {"data": {"file": (io.BytesIO(body.encode()), "benchmark.csv")},
+                                         "content_type": "multipart/form-data"}, "admin"
+
+
+def delete_task(i, ctx):
+    task_id = ctx["task_ids"][-1 - i % len(ctx["task_ids"])]
+    return "DELETE", f"/tasks/delete/{task_id}", {}, "admin"
+
+
+SCENARIOS = {
+    "login": login,
+    "profile": profile,
+    "task_by_date": task_by_date,
+    "task_records_page": task_records_page,
+    "task_records_cursor": task_records_cursor,
+    "task_log": task_log,
+    "task_query": task_query,
+    "search": search,
+    "stats": stats,
+    "export_tasks": export_tasks,
+    "health_db": health_db,
+    "update_task": update_task,
+    "batch_update": batch_update,
+    "upload_csv": upload_csv,
+    "delete_task": delete_task,
+}
+
+
+def percentile(values, pct):
+    # Nearest-rank percentile of a sorted list
+    if not values:
+        return None
+    rank = max(1, min(len(values), round(pct / 100 * len(values) + 0.5)))
+    return values[rank - 1]
+
+
+def run_scenario(app, scenario, ctx, counter, requests, concurrency, warmup):
+    local = threading.local()
+
+    def one(i):
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        method, url, kwargs, role = scenario(i, ctx)
+        headers = {"Authorization": f"Bearer {ctx['tokens'][role]}"} if role else {}
+        counter.reset()
+        started = time.perf_counter()
+        response = local.client.open(url, method=method, headers=headers, **kwargs)
+        response.get_data()  # drain streamed bodies
+        elapsed = time.perf_counter() - started
+        return elapsed * 1000, response.status_code, counter.value()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(-warmup, 0)))
+        started = time.perf_counter()
+        results = list(pool.map(one, range(requests)))
+        wall = time.perf_counter() - started
+
+    latencies = sorted(ms for ms, _, _ in results)
+    statuses = {}
+    for _, status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    queries = [count for _, _, count in results]
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": sum(1 for _, status, _ in results if status >= 400),
+        "status_codes": statuses,
+        "throughput_rps": round(requests / wall, 1) if wall > 0 else None,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "mean": round(sum(latencies) / len(latencies), 2),
+            "max": round(latencies[-1], 2)
+        },
+        "queries_per_request": {
+            "mean": round(sum(queries) / len(queries), 2),
+            "max": max(queries)
+        }
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(previous_path, results, fail_over):
+    # Prints p95 and throughput changes per endpoint; returns the endpoints over the limit
+    with open(previous_path) as f:
+        previous = json.load(f)
+    print(f"\nCompared with {previous_path} (commit {previous['meta'].get('commit')}):")
+    regressions = []
+    for name, current in results["endpoints"].items():
+        before = previous["endpoints"].get(name)
+        if not before:
+            continue
+        p95_before, p95_now = before["latency_ms"]["p95"], current["latency_ms"]["p95"]
+        change = (p95_now - p95_before) / p95_before * 100 if p95_before else 0
+        rps_before, rps_now = before["throughput_rps"] or 0, current["throughput_rps"] or 0
+        print(f"  {name:22} p95 {p95_before:9.2f} -> {p95_now:9.2f} ms ({change:+6.1f}%)"
+              f"   {rps_before:8.1f} -> {rps_now:8.1f} req/s")
+        if fail_over and change > fail_over:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    args = parse_args()
+    names = args.endpoints.split(",") if args.endpoints else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        sys.exit(f"Unknown endpoints: {', '.join(unknown)}. Choose from: {', '.join(SCENARIOS)}")
+    database = configure_environment(args)
+
+    from APP import create_app
+    from APP.database import db
+    from APP.Services.initialize_admin import initialize_admin_user
+    from APP.Services.rate_limiter import limiter
+
+    app = create_app()
+    app.config["RATELIMIT_ENABLED"] = False
+    limiter.enabled = False
+
+    with app.app_context():
+        create_schema(args.reset)
+        initialize_admin_user()
+        started = time.perf_counter()
+        print(f"Seeding {args.users} users, {args.tasks} tasks and {args.years} years of logs...")
+        ctx = seed(args)
+        print(f"Seeded in {time.perf_counter() - started:.1f}s")
+        counter = QueryCounter(db.engine)
+        dialect = db.engine.dialect.name
+
+    client = app.test_client()
+    ctx.update(rng=random.Random(args.seed), users=args.users, csv_rows=args.csv_rows, tokens={
+        "admin": client.post("/users/login", json={"username": "admin", "password": "admin123"}).get_json()["access_token"],
+        "user": client.post("/users/login", json={"username": "bench_user_0", "password": SEED_PASSWORD}).get_json()["access_token"],
+    })
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "database": dialect,
+            "redis": "fakeredis" if args.redis == "fake" else "redis",
+            "python": platform.python_version(),
+            "scale": {"users": args.users, "tasks": args.tasks, "years": args.years,
+                      "logs_per_task": args.logs_per_task, "audits_per_task": args.audits_per_task},
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed
+        },
+        "endpoints": {}
+    }
+    print(f"{'endpoint':22} {'p50':>9} {'p95':>9} {'p99':>9} {'req/s':>8} {'queries':>8} {'errors':>7}")
+    for name in names:
+        result = run_scenario(app, SCENARIOS[name], ctx, counter, args.requests, args.concurrency, args.warmup)
+        results["endpoints"][name] = result
+        latency = result["latency_ms"]
+        print(f"{name:22} {latency['p50']:9.2f} {latency['p95']:9.2f} {latency['p99']:9.2f} "
+              f"{result['throughput_rps']:8.1f} {result['queries_per_request']['mean']:8.2f} {result['errors']:7}")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    if not args.database:
+        print(f"SQLite database: {database}")
+
+    if args.compare:
+        regressions = compare(args.compare, results, args.fail_over)
+        if regressions:
+            print(f"p95 regressed by more than {args.fail_over}%: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
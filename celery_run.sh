@@ -1,2 +1,2 @@
-celery -A app.celery_worker.celery worker --loglevel=info
-celery -A app.celery_worker.celery beat --loglevel=info
+celery -A APP.celery_app.celery worker --loglevel=info
+celery -A APP.celery_app.celery beat --loglevel=info
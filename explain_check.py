@@ -0,0 +1,151 @@
+"""EXPLAIN-based index check for the hot query paths.
+
+Runs EXPLAIN (FORMAT JSON) for the query behind each endpoint against the
+configured PostgreSQL database and fails when the planner does not use the
+index that the query is meant to hit.
+
+    python3 explain_check.py                # check the current data
+    python3 explain_check.py --seed 200000  # seed N tasks first, then check
+"""
+import argparse
+import sys
+from datetime import timedelta
+from sqlalchemy import select, text, tuple_
+from APP import create_app
+from APP.database import db
+from APP.models import User, TaskManager, TaskLogger, Audit_logger, indian_date, indian_time
+
+
+def seed(tasks, users=1000):
+    # Set-based seed: users, tasks, a year of task_logger rows and one audit row per task
+    statements = [
+        """
+        INSERT INTO "user" (username, password, role)
+        SELECT 'seed_user_' || g, 'seeded', 'user' FROM generate_series(1, :users) g
+        ON CONFLICT (username) DO NOTHING
+        """,
+        """
+        INSERT INTO task_manager (task_name, description, is_active, priority, created_at, assigned_user)
+        SELECT 'seed task ' || g, 'seeded task ' || g, g % 4 <> 0,
+               ((ARRAY['LOW', 'MEDIUM', 'HIGH', 'CRITICAL'])[1 + g % 4])::priority_levels,
+               current_date - (g % 1000), u.id
+        FROM generate_series(1, :tasks) g
+        JOIN (SELECT id, row_number() OVER (ORDER BY id) AS rn FROM "user") u
+          ON u.rn = 1 + g % (SELECT count(*) FROM "user")
+        """,
+        """
+        INSERT INTO task_logger (task_id, logged_at)
+        SELECT id, now() - random() * interval '365 days'
+        FROM task_manager, generate_series(1, 3)
+        WHERE is_active
+        """,
+        """
+        INSERT INTO audit_logger (task_id, previous_state, current_state, action_by, timestamp)
+        SELECT id, NULL, 'Task added', '1', now() - random() * interval '365 days' FROM task_manager
+        """,
+    ]
+    for statement in statements:
+        db.session.execute(text(statement), {"tasks": tasks, "users": users})
+    db.session.commit()
+    for table in ('"user"', 'task_manager', 'task_logger', 'audit_logger'):
+        db.session.execute(text(f"ANALYZE {table}"))
+    db.session.commit()
+
+
+def endpoint_queries():
+    # (endpoint, statement, index that must appear in the plan)
+    today = indian_date()
+    now = indian_time().replace(tzinfo=None)
+    task_records = select(
+        User.username, TaskManager.id, TaskManager.task_name, TaskLogger.id, TaskLogger.logged_at
+    ).join(
+        TaskManager, TaskManager.assigned_user == User.id
+    ).join(
+        TaskLogger, TaskLogger.task_id == TaskManager.id
+    ).where(
+        TaskManager.is_active == True
+    ).order_by(TaskLogger.logged_at.desc(), TaskLogger.id.desc())
+
+    return [
+        ("GET /tasks/task/<date>",
+         select(TaskManager).where(TaskManager.created_at == today),
+         "ix_task_manager_created_at_id"),
+        ("GET /tasks/query (created_at keyset)",
+         select(TaskManager.id, TaskManager.task_name).where(
+             tuple_(TaskManager.created_at, TaskManager.id) < tuple_(today, 10 ** 9)
+         ).order_by(TaskManager.created_at.desc(), TaskManager.id.desc()).limit(51),
+         "ix_task_manager_created_at_id"),
+        ("GET /tasks/task-records (first page)",
+         task_records.limit(6),
+         "ix_task_logger_logged_at_id"),
+        ("GET /tasks/task-records (cursor)",
+         task_records.where(tuple_(TaskLogger.logged_at, TaskLogger.id) < tuple_(now - timedelta(days=200), 1)).limit(6),
+         "ix_task_logger_logged_at_id"),
+        ("GET /tasks/task-log/<id>",
+         select(TaskLogger).where(TaskLogger.task_id == 42).limit(1),
+         "ix_task_logger_task_id_logged_at"),
+        ("POST /tasks/upload-csv (user lookup)",
+         select(User.id, User.username).where(User.username.in_(['seed_user_1', 'seed_user_2'])),
+         "user_username_key"),
+        ("task audit history (latest first)",
+         select(Audit_logger).where(Audit_logger.task_id == 42).order_by(Audit_logger.timestamp.desc()).limit(1),
+         "ix_audit_logger_task_id_timestamp"),
+        ("active tasks by creation date",
+         select(TaskManager.id).where(TaskManager.is_active == True, TaskManager.created_at >= today - timedelta(days=7)),
+         "ix_task_manager_active_created_at"),
+        ("tasks of a user",
+         select(TaskManager.id).where(TaskManager.assigned_user == 1),
+         "ix_task_manager_assigned_user"),
+    ]
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def index_family(name):
+    # On partitioned tables the plan names each partition's copy of the index
+    children = db.session.execute(text("""
+        SELECT child.relname FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass(:name)
+    """), {"name": name}).scalars()
+    return {name, *children}
+
+
+def explain(statement):
+    compiled = statement.compile(dialect=db.engine.dialect, compile_kwargs={"render_postcompile": True})
+    result = db.session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+    return result.scalar()[0]["Plan"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="number of tasks to seed before checking")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if db.engine.dialect.name != 'postgresql':
+            print("explain_check.py needs a PostgreSQL DATABASE_URL")
+            return 2
+        if args.seed:
+            print(f"Seeding {args.seed} tasks...")
+            seed(args.seed)
+
+        failures = 0
+        for endpoint, statement, index in endpoint_queries():
+            plan = explain(statement)
+            used = sorted({node["Index Name"] for node in plan_nodes(plan) if "Index Name" in node})
+            ok = bool(index_family(index) & set(used))
+            failures += not ok
+            print(f"[{'ok' if ok else 'FAIL'}] {endpoint}: expected {index}, plan uses {used or 'no index'}")
+        db.session.rollback()
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
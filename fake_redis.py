@@ -0,0 +1,31 @@
+"""In-memory Redis for the benchmark and the test suite.
+
+install() must run before APP is imported: the cache, audit and rate limiter modules
+create their Redis clients at import time.
+
+    import fake_redis
+    server = fake_redis.install()
+"""
+import fakeredis
+import redis
+import redis.client
+
+
+def install(server=None):
+    # Every Redis client the app creates (cache, audit stream, rate limiter) talks to the
+    # same fakeredis server; returns it
+    server = server or fakeredis.FakeServer()
+
+    class SharedFakeRedis(fakeredis.FakeRedis):
+        def __init__(self, *args, **kwargs):
+            kwargs.pop("host", None)
+            kwargs.pop("port", None)
+            kwargs["server"] = server
+            super().__init__(*args, **kwargs)
+
+        @classmethod
+        def from_url(cls, url, **kwargs):
+            return cls(**kwargs)
+
+    redis.Redis = redis.StrictRedis = redis.client.Redis = SharedFakeRedis
+    return server
@@ -0,0 +1,48 @@
+"""Indexes for the hot query paths
+
+Revision ID: a1c3e5f7b901
+Revises: 
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f7b901'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# Tables are created by db.create_all() on startup, so every index is created
+# IF NOT EXISTS: fresh databases already have them, existing ones get them here.
+INDEXES = [
+    ("ix_task_manager_created_at", "task_manager (created_at)"),
+    ("ix_task_manager_active_created_at", "task_manager (created_at) WHERE is_active"),
+    ("ix_task_manager_assigned_user", "task_manager (assigned_user)"),
+    ("ix_task_manager_task_name", "task_manager (task_name)"),
+    ("ix_task_logger_logged_at_id", "task_logger (logged_at DESC, id DESC)"),
+    ("ix_task_logger_task_id_logged_at", "task_logger (task_id, logged_at)"),
+    ("ix_audit_logger_task_id_timestamp", "audit_logger (task_id, timestamp DESC)"),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        # Build without blocking writes on large tables; CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            for name, definition in INDEXES:
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+            op.execute("ANALYZE task_manager")
+            op.execute("ANALYZE task_logger")
+            op.execute("ANALYZE audit_logger")
+    else:
+        for name, definition in INDEXES:
+            op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade():
+    for name, _ in reversed(INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
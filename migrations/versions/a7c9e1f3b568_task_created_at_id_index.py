@@ -0,0 +1,32 @@
+"""Composite (created_at, id) index for /tasks/query keyset pages
+
+Revision ID: a7c9e1f3b568
+Revises: f6b8d0e2a457
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c9e1f3b568'
+down_revision = 'f6b8d0e2a457'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Replaces ix_task_manager_created_at: the composite index also serves equality on created_at
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_task_manager_created_at_id ON task_manager (created_at, id)")
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_task_manager_created_at")
+    else:
+        op.execute("CREATE INDEX IF NOT EXISTS ix_task_manager_created_at_id ON task_manager (created_at, id)")
+        op.execute("DROP INDEX IF EXISTS ix_task_manager_created_at")
+
+
+def downgrade():
+    op.execute("CREATE INDEX IF NOT EXISTS ix_task_manager_created_at ON task_manager (created_at)")
+    op.execute("DROP INDEX IF EXISTS ix_task_manager_created_at_id")
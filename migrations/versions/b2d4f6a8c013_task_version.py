@@ -0,0 +1,27 @@
+"""Version column on task_manager for optimistic concurrency
+
+Revision ID: b2d4f6a8c013
+Revises: a1c3e5f7b901
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2d4f6a8c013'
+down_revision = 'a1c3e5f7b901'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() already adds the column on fresh databases
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('task_manager')}
+    if 'version' not in columns:
+        op.add_column('task_manager', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    op.drop_column('task_manager', 'version')
@@ -0,0 +1,41 @@
+"""import_job table for queued CSV, Parquet and Arrow imports
+
+Revision ID: b8d0f2a4c679
+Revises: a7c9e1f3b568
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d0f2a4c679'
+down_revision = 'a7c9e1f3b568'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() already creates it on fresh databases
+    if 'import_job' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'import_job',
+        sa.Column('id', sa.String(length=36), primary_key=True),
+        sa.Column('filename', sa.String(length=255)),
+        sa.Column('file_path', sa.String(length=500), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('total_rows', sa.Integer()),
+        sa.Column('rows_done', sa.Integer(), nullable=False),
+        sa.Column('rows_imported', sa.Integer(), nullable=False),
+        sa.Column('rows_failed', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text()),
+        sa.Column('created_by', sa.Integer(), sa.ForeignKey('user.id')),
+        sa.Column('created_at', sa.DateTime()),
+        sa.Column('updated_at', sa.DateTime()),
+    )
+
+
+def downgrade():
+    op.drop_table('import_job')
@@ -0,0 +1,29 @@
+"""Idempotency key on audit_logger for the audit write-behind pipeline
+
+Revision ID: c3e5f7a9b124
+Revises: b2d4f6a8c013
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e5f7a9b124'
+down_revision = 'b2d4f6a8c013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() already adds the column and index on fresh databases
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('audit_logger')}
+    if 'event_id' not in columns:
+        op.add_column('audit_logger', sa.Column('event_id', sa.String(length=36), nullable=True))
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_audit_logger_event_id ON audit_logger (event_id)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ux_audit_logger_event_id")
+    op.drop_column('audit_logger', 'event_id')
@@ -0,0 +1,34 @@
+"""Widen audit_logger states to text
+
+Revision ID: c9e1a3b5d780
+Revises: b8d0f2a4c679
+Create Date: 2026-10-18 17:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e1a3b5d780'
+down_revision = 'b8d0f2a4c679'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The states now hold task_name and description too. varchar -> text needs no table
+    # rewrite on PostgreSQL; SQLite does not enforce varchar lengths.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.alter_column('audit_logger', 'previous_state', type_=sa.Text(), existing_type=sa.String(length=255))
+    op.alter_column('audit_logger', 'current_state', type_=sa.Text(), existing_type=sa.String(length=255))
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.alter_column('audit_logger', 'previous_state', type_=sa.String(length=255), existing_type=sa.Text(),
+                    postgresql_using='left(previous_state, 255)')
+    op.alter_column('audit_logger', 'current_state', type_=sa.String(length=255), existing_type=sa.Text(),
+                    postgresql_using='left(current_state, 255)')
@@ -0,0 +1,41 @@
+"""Unique (event_id, timestamp) audit index on every dialect
+
+Revision ID: d0f2b4c6e891
+Revises: c9e1a3b5d780
+Create Date: 2026-10-18 17:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd0f2b4c6e891'
+down_revision = 'c9e1a3b5d780'
+branch_labels = None
+depends_on = None
+
+
+def event_index_columns():
+    for index in sa.inspect(op.get_bind()).get_indexes('audit_logger'):
+        if index['name'] == 'ux_audit_logger_event_id':
+            return index['column_names']
+    return None
+
+
+def upgrade():
+    # The audit writer inserts with ON CONFLICT (event_id, timestamp), which needs a unique
+    # index on exactly those columns. d4f6a8b0c235 builds it on PostgreSQL; databases that
+    # skipped the partitioning still have c3e5f7a9b124's index on event_id alone.
+    if event_index_columns() == ['event_id', 'timestamp']:
+        return
+    op.execute("DROP INDEX IF EXISTS ux_audit_logger_event_id")
+    op.execute("CREATE UNIQUE INDEX ux_audit_logger_event_id ON audit_logger (event_id, timestamp)")
+
+
+def downgrade():
+    # PostgreSQL keeps the partitioned table's index: a unique index there must contain timestamp
+    if op.get_bind().dialect.name == 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ux_audit_logger_event_id")
+    op.execute("CREATE UNIQUE INDEX ux_audit_logger_event_id ON audit_logger (event_id)")
@@ -0,0 +1,147 @@
+"""Monthly range partitioning of task_logger and audit_logger
+
+Revision ID: d4f6a8b0c235
+Revises: c3e5f7a9b124
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+from APP.models import indian_date
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f6a8b0c235'
+down_revision = 'c3e5f7a9b124'
+branch_labels = None
+depends_on = None
+
+
+# Months created ahead of today; the partition maintenance beat job keeps this going
+PREMAKE_MONTHS = 3
+
+TABLES = {
+    "task_logger": {
+        "column": "logged_at",
+        "columns": ["id", "task_id", "logged_at"],
+        "definition": """
+            id integer NOT NULL DEFAULT nextval('task_logger_id_seq'),
+            task_id integer REFERENCES task_manager (id),
+            logged_at timestamp without time zone NOT NULL
+        """,
+        "indexes": [
+            ("ix_task_logger_task_id_logged_at", "(task_id, logged_at)", False),
+            ("ix_task_logger_logged_at_id", "(logged_at DESC, id DESC)", False),
+        ],
+    },
+    "audit_logger": {
+        "column": "timestamp",
+        "columns": ["id", "task_id", "previous_state", "current_state", "action_by", "timestamp", "event_id"],
+        "definition": """
+            id integer NOT NULL DEFAULT nextval('audit_logger_id_seq'),
+            task_id integer REFERENCES task_manager (id),
+            previous_state varchar(255),
+            current_state varchar(255),
+            action_by varchar(50) NOT NULL,
+            timestamp timestamp without time zone NOT NULL,
+            event_id varchar(36)
+        """,
+        "indexes": [
+            ("ix_audit_logger_task_id_timestamp", "(task_id, timestamp DESC)", False),
+            ("ux_audit_logger_event_id", "(event_id, timestamp)", True),
+        ],
+    },
+}
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def is_partitioned(table):
+    return op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+        {"table": table}
+    ).scalar() is not None
+
+
+def month_range(table, column):
+    # Every month that has rows, through PREMAKE_MONTHS after the current one
+    first, last = op.get_bind().execute(sa.text(
+        f"SELECT date_trunc('month', min({column}))::date, date_trunc('month', max({column}))::date FROM {table}"
+    )).one()
+    # Rows are stamped in IST (indian_time), so the current month is IST's too
+    this_month = indian_date().replace(day=1)
+    month = min(first or this_month, this_month)
+    last = max(last or this_month, add_months(this_month, PREMAKE_MONTHS))
+    while month <= last:
+        yield month
+        month = add_months(month, 1)
+
+
+def create_indexes(table, spec):
+    for name, columns, unique in spec["indexes"]:
+        op.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table} {columns}")
+
+
+def upgrade():
+    # The copy runs in the migration's transaction and holds an exclusive lock on both
+    # tables until it commits: run it in a maintenance window on large databases.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, spec in TABLES.items():
+        if is_partitioned(table):
+            continue  # created partitioned by db.create_all()
+        column = spec["column"]
+        columns = ", ".join(spec["columns"])
+        # the partition key becomes NOT NULL
+        select_columns = ", ".join(
+            f"coalesce({name}, now() AT TIME ZONE 'Asia/Kolkata')" if name == column else name for name in spec["columns"]
+        )
+
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+        op.execute(f"ALTER TABLE {table}_legacy RENAME CONSTRAINT {table}_pkey TO {table}_legacy_pkey")
+        for name, _columns, _unique in spec["indexes"]:
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+
+        op.execute(f"""
+            CREATE TABLE {table} ({spec["definition"]}, PRIMARY KEY (id, {column}))
+            PARTITION BY RANGE ({column})
+        """)
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        for month in month_range(f"{table}_legacy", column):
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+            )
+
+        op.execute(f"INSERT INTO {table} ({columns}) SELECT {select_columns} FROM {table}_legacy")
+        op.execute(f"DROP TABLE {table}_legacy")
+        create_indexes(table, spec)
+        op.execute(f"ANALYZE {table}")
+
+
+def downgrade():
+    # Back to plain tables; detached partitions are left alone
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, spec in TABLES.items():
+        if not is_partitioned(table):
+            continue
+        columns = ", ".join(spec["columns"])
+
+        for name, _columns, _unique in spec["indexes"]:
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+        op.execute(f"ALTER TABLE {table} RENAME TO {table}_partitioned")
+        op.execute(f"ALTER TABLE {table}_partitioned RENAME CONSTRAINT {table}_pkey TO {table}_partitioned_pkey")
+
+        op.execute(f"CREATE TABLE {table} ({spec['definition']}, PRIMARY KEY (id))")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_partitioned")
+        op.execute(f"DROP TABLE {table}_partitioned CASCADE")
+        create_indexes(table, spec)
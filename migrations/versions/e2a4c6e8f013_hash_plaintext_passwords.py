@@ -0,0 +1,43 @@
+"""Hash passwords stored in plaintext
+
+Revision ID: e2a4c6e8f013
+Revises: d0f2b4c6e891
+Create Date: 2026-10-18 19:30:00.000000
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+from werkzeug.security import generate_password_hash
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a4c6e8f013'
+down_revision = 'd0f2b4c6e891'
+branch_labels = None
+depends_on = None
+
+
+# "method$salt$hash" from werkzeug, or a "$id$..." modular crypt hash from another system
+HASHED = re.compile(r'^((pbkdf2|scrypt)[^$]*\$[^$]+\$[0-9a-f]+|\$.*)$')
+
+
+def upgrade():
+    # Registration used to store the plaintext password. Those values are hashed here,
+    # once, and login only checks hashes; logins then upgrade them to PASSWORD_HASH_METHOD
+    # when it differs. Hashes in other formats are left alone and never match.
+    user = sa.table('user', sa.column('id', sa.Integer), sa.column('password', sa.String))
+    bind = op.get_bind()
+    for user_id, password in bind.execute(sa.select(user.c.id, user.c.password)).all():
+        if password and not HASHED.match(password):
+            bind.execute(
+                user.update()
+                .where(user.c.id == user_id)
+                .values(password=generate_password_hash(password, method='pbkdf2:sha256:600000'))
+            )
+
+
+def downgrade():
+    # Hashes cannot be turned back into plaintext
+    pass
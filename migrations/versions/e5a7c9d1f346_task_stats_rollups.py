@@ -0,0 +1,46 @@
+"""Rollup tables behind /tasks/stats
+
+Revision ID: e5a7c9d1f346
+Revises: d4f6a8b0c235
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c9d1f346'
+down_revision = 'd4f6a8b0c235'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() already creates them on fresh databases; the first refresh_task_stats
+    # run sees an empty rollup and does a full rebuild
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'task_daily_stats' not in tables:
+        op.create_table(
+            'task_daily_stats',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('priority', sa.String(length=20), nullable=False),
+            sa.Column('is_active', sa.Boolean(), nullable=False),
+            sa.Column('assigned_user', sa.Integer()),
+            sa.Column('tasks', sa.Integer(), nullable=False),
+        )
+        op.create_index('ix_task_daily_stats_day', 'task_daily_stats', ['day'])
+    if 'task_activity_daily' not in tables:
+        op.create_table(
+            'task_activity_daily',
+            sa.Column('day', sa.Date(), primary_key=True),
+            sa.Column('active_tasks', sa.Integer(), nullable=False),
+            sa.Column('logged_rows', sa.Integer(), nullable=False),
+        )
+
+
+def downgrade():
+    op.drop_table('task_activity_daily')
+    op.drop_index('ix_task_daily_stats_day', table_name='task_daily_stats')
+    op.drop_table('task_daily_stats')
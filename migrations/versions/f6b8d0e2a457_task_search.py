@@ -0,0 +1,44 @@
+"""Full-text and trigram search on task_manager
+
+Revision ID: f6b8d0e2a457
+Revises: e5a7c9d1f346
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6b8d0e2a457'
+down_revision = 'e5a7c9d1f346'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # PostgreSQL only; db.create_all() runs the same DDL on fresh databases.
+    # Adding a stored generated column rewrites task_manager once.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("""
+        ALTER TABLE task_manager ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english'::regconfig, coalesce(task_name, '')), 'A') ||
+            setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')
+        ) STORED
+    """)
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_task_manager_search_vector "
+                   "ON task_manager USING gin (search_vector)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_task_manager_task_name_trgm "
+                   "ON task_manager USING gin (task_name gin_trgm_ops)")
+        op.execute("ANALYZE task_manager")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_task_manager_task_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_task_manager_search_vector")
+    op.execute("ALTER TABLE task_manager DROP COLUMN IF EXISTS search_vector")
@@ -2,8 +2,9 @@ from flask import Flask
 from APP import create_app
 from APP.database import initialize_db
 from APP.Services.initialize_admin import initialize_admin_user
+from APP.Services.partitions import maintain_partitions
 from flask_apscheduler import APScheduler
-from flask_migrate import upgrade, init, Migrate
+from flask_migrate import upgrade, init, stamp, Migrate
 import os
 # from APP.Services.task_logger import log_active_tasks
 
@@ -14,7 +15,9 @@ def main():
     # Note: initialize_db should be called with app context
     with app.app_context():
         print("Initializing database...")
-        initialize_db(app)
+        # An empty database gets the current schema from create_all(); the migrations
+        # only bring older databases up to it
+        fresh = initialize_db(app)
         initialize_admin_user()
         print("Database initialized successfully.")
         if not os.path.exists("migrations"):
@@ -26,8 +29,15 @@ def main():
         else:
             print("Migrations directory already exists. skipping init.")
         # Apply migrations
-        upgrade()
-        print("Database migrations applied successfully.")
+        if fresh:
+            stamp()
+            print("New database created at the latest migration.")
+        else:
+            upgrade()
+            print("Database migrations applied successfully.")
+        # Create this month's log partitions now rather than at the 01:30 beat job, so
+        # rows are not written to the DEFAULT partitions and moved out later
+        print(f"Log partitions: {maintain_partitions()}")
         return app
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+import os
+import tempfile
+
+import fakeredis
+import pytest
+
+import fake_redis
+
+# Configuration is read when APP is imported, so the environment is set up first:
+# a throwaway SQLite database, cheap password hashes and no in-process L1 cache
+# (Redis is flushed between tests and a stale L1 entry would outlive it)
+DB_DIR = tempfile.mkdtemp(prefix="task_manager_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'test.db')}"
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-key-with-enough-length")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1000"
+os.environ["LOCAL_CACHE_ENABLED"] = "false"
+
+# Every Redis client the app creates (cache, audit stream, rate limiter) shares one fake server
+redis_server = fake_redis.install()
+
+from APP import create_app  # noqa: E402
+from APP.database import db  # noqa: E402
+from APP.Services.initialize_admin import initialize_admin_user  # noqa: E402
+from APP.Services.rate_limiter import limiter  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {}
+    limiter.enabled = False
+    return app
+
+
+@pytest.fixture(autouse=True)
+def clean_state(app):
+    # Fresh schema, admin user and Redis for every test
+    fakeredis.FakeRedis(server=redis_server).flushall()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        initialize_admin_user()
+    yield
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth(client):
+    response = client.post("/users/login", json={"username": "admin", "password": "admin123"})
+    return {"Authorization": "Bearer " + response.get_json()["access_token"]}
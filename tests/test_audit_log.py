@@ -0,0 +1,54 @@
+import fakeredis
+
+from APP.database import db
+from APP.models import Audit_logger, TaskManager
+from APP.Services import audit_log
+
+
+def test_drain_claims_pending_events_on_redis_6_2(app, monkeypatch):
+    # Redis 6.2 answers XAUTOCLAIM with two elements, Redis 7 with three
+    client = fakeredis.FakeRedis(server=fakeredis.FakeServer(version=(6, 2)), decode_responses=True)
+    monkeypatch.setattr(audit_log, "redis_client", client)
+    monkeypatch.setattr(audit_log.Config, "AUDIT_CLAIM_IDLE_MS", 0)
+    with app.app_context():
+        audit_log.ensure_group()
+        audit_log.publish_events([audit_log.audit_row(None, "Task added", 1)])
+        # Read but never acknowledged, as if its consumer had died
+        client.xreadgroup(audit_log.AUDIT_GROUP, "dead", {audit_log.AUDIT_STREAM: ">"})
+
+        assert audit_log.drain_audit_stream(5) == 1
+        assert db.session.query(Audit_logger).count() == 1
+        assert client.xlen(audit_log.AUDIT_STREAM) == 0
+
+
+def test_async_events_wait_for_commit_and_drain_once(app, client, auth, monkeypatch):
+    monkeypatch.setitem(app.config, "AUDIT_MODE", "async")
+    with app.app_context():
+        audit_log.ensure_group()
+    client.post("/tasks/batch", json={"ids": [1], "changes": {"priority": "HIGH"}}, headers=auth)
+    assert audit_log.redis_client.xlen(audit_log.AUDIT_STREAM) == 0  # no such task: nothing committed
+
+    with app.app_context():
+        db.session.execute(TaskManager.__table__.insert(), [{"task_name": "a", "priority": "LOW", "assigned_user": 1}])
+        db.session.commit()
+    response = client.post("/tasks/batch", json={"ids": [1], "changes": {"priority": "HIGH"}}, headers=auth)
+    assert response.status_code == 200
+    assert audit_log.redis_client.xlen(audit_log.AUDIT_STREAM) == 1
+
+    with app.app_context():
+        assert db.session.query(Audit_logger).count() == 0
+        assert audit_log.drain_audit_stream(5) == 1
+        assert audit_log.drain_audit_stream(5) == 0
+        assert db.session.query(Audit_logger).count() == 1
+    assert audit_log.redis_client.xlen(audit_log.AUDIT_STREAM) == 0
+
+
+def test_rolled_back_events_are_not_published(app, monkeypatch):
+    monkeypatch.setitem(app.config, "AUDIT_MODE", "async")
+    with app.app_context():
+        db.session.add(TaskManager(task_name="a", priority="LOW", assigned_user=1))
+        db.session.flush()
+        audit_log.write_audit_rows([audit_log.audit_row(None, "Task added", 1)])
+        db.session.rollback()
+        db.session.commit()
+    assert audit_log.redis_client.xlen(audit_log.AUDIT_STREAM) == 0
@@ -0,0 +1,101 @@
+import io
+from datetime import date
+
+import redis
+
+from APP.database import db
+from APP.models import TaskManager
+from APP.Services import cache
+
+
+def add_task(app, name="task", day=date(2024, 1, 1)):
+    with app.app_context():
+        db.session.add(TaskManager(task_name=name, priority="LOW", is_active=True, created_at=day, assigned_user=1))
+        db.session.commit()
+
+
+def names_on(client, auth, day="2024-01-01"):
+    response = client.get(f"/tasks/task/{day}", headers=auth)
+    if response.status_code == 404:
+        return []
+    return sorted(task["task_name"] for task in response.get_json()["task_list"])
+
+
+def test_writes_invalidate_the_cached_date(app, client, auth):
+    add_task(app, "a")
+    assert names_on(client, auth) == ["a"]
+
+    client.post("/tasks/1", json={"task_name": "renamed"}, headers=auth)
+    assert names_on(client, auth) == ["renamed"]
+
+    client.post("/tasks/batch", json={"ids": [1], "changes": {"task_name": "batched"}}, headers=auth)
+    assert names_on(client, auth) == ["batched"]
+
+    csv = "task_name,description,status,priority,created_at,assigned_user\nimported,d,1,LOW,2024-01-01,admin\n"
+    client.post("/tasks/upload-csv", headers=auth, content_type="multipart/form-data",
+                data={"file": (io.BytesIO(csv.encode()), "tasks.csv")})
+    assert names_on(client, auth) == ["batched", "imported"]
+
+
+def test_other_dates_stay_cached(app, client, auth):
+    add_task(app, "a", date(2024, 1, 1))
+    add_task(app, "b", date(2024, 1, 2))
+    names_on(client, auth, "2024-01-02")
+    client.post("/tasks/1", json={"task_name": "renamed"}, headers=auth)
+    key = cache.cache_key(cache.TASKS_BY_DATE, "2024-01-02")
+    assert cache.raw_redis_client.exists(key)
+    assert not cache.raw_redis_client.exists(cache.cache_key(cache.TASKS_BY_DATE, "2024-01-01"))
+
+
+def test_none_is_not_cached(app):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return None
+
+    assert cache.get_or_load("test", "missing", loader, 60) is None
+    assert cache.get_or_load("test", "missing", loader, 60) is None
+    assert len(calls) == 2
+
+
+def test_redis_errors_fall_back_to_the_loader(app, monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(cache.redis_client, "get", unavailable)
+    monkeypatch.setattr(cache.redis_client, "set", unavailable)
+    assert cache.get_or_load("test", "key", lambda: {"value": 1}, 60) == {"value": 1}
+    assert cache.stats.snapshot()["errors"] >= 1
+
+
+def test_local_cache_is_a_bounded_lru_with_expiry(monkeypatch):
+    local = cache.LocalCache(2)
+    local.set("a", 1, 60)
+    local.set("b", 2, 60)
+    local.get("a")
+    local.set("c", 3, 60)
+    assert (local.get("a"), local.get("b"), local.get("c")) == (1, None, 3)
+
+    now = cache.time.monotonic()
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now + 61)
+    assert local.get("a") is None
+
+
+def test_local_tier_serves_hits_until_invalidated(app, monkeypatch):
+    monkeypatch.setattr(cache.Config, "LOCAL_CACHE_ENABLED", True)
+    cache.local_cache.clear()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"n": len(calls)}
+
+    assert cache.get_or_load("test", "key", loader, 60) == {"n": 1}
+    # Served from the process even when Redis no longer has it
+    cache.redis_client.delete(cache.cache_key("test", "key"))
+    assert cache.get_or_load("test", "key", loader, 60) == {"n": 1}
+
+    cache.invalidate("test", "key")
+    assert cache.get_or_load("test", "key", loader, 60) == {"n": 2}
+    cache.local_cache.clear()
@@ -0,0 +1,65 @@
+from datetime import date
+
+import pytest
+
+from APP.Services import partitions
+
+
+def test_month_arithmetic():
+    assert partitions.month_start(date(2024, 2, 29)) == date(2024, 2, 1)
+    assert partitions.add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+    assert partitions.add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+    assert partitions.partition_name("task_logger", date(2024, 3, 1)) == "task_logger_p2024_03"
+
+
+def test_maintenance_is_a_no_op_outside_postgresql(app):
+    with app.app_context():
+        assert partitions.maintain_partitions() == {}
+
+
+@pytest.fixture
+def fake_postgresql(app, monkeypatch):
+    # Stands in for the catalog queries and DDL; records what maintenance would do
+    calls = []
+    existing = {
+        "task_logger": {date(2023, 12, 1): "task_logger_p2023_12", date(2024, 1, 1): "task_logger_p2024_01",
+                        date(2024, 3, 1): "task_logger_p2024_03"},
+        "audit_logger": {date(2023, 12, 1): "audit_logger_p2023_12"},
+    }
+    with app.app_context():
+        monkeypatch.setattr(partitions.db.engine.dialect, "name", "postgresql")
+    monkeypatch.setattr(partitions, "is_partitioned", lambda table: True)
+    monkeypatch.setattr(partitions, "monthly_partitions", lambda table: dict(existing[table]))
+    monkeypatch.setattr(partitions, "create_partition",
+                        lambda table, column, month: calls.append(("create", table, month)) or 2)
+    monkeypatch.setattr(partitions, "expire_partition",
+                        lambda table, name, drop: calls.append(("drop" if drop else "detach", table, name)))
+    monkeypatch.setattr(partitions, "bump_table_version", lambda table: calls.append(("bump", table)))
+    return calls
+
+
+def test_maintenance_premakes_and_expires(app, monkeypatch, fake_postgresql):
+    monkeypatch.setitem(app.config, "PARTITION_PREMAKE_MONTHS", 2)
+    monkeypatch.setitem(app.config, "TASK_LOGGER_RETENTION_MONTHS", 2)
+    monkeypatch.setitem(app.config, "AUDIT_LOGGER_RETENTION_MONTHS", 0)
+    with app.app_context():
+        summary = partitions.maintain_partitions(today=date(2024, 2, 15))
+
+    assert summary["task_logger"] == {
+        "created": ["task_logger_p2024_02", "task_logger_p2024_04"],
+        "rows_moved_from_default": 4,
+        "detached": ["task_logger_p2023_12"],
+    }
+    # Retention 0 keeps every audit partition
+    assert summary["audit_logger"]["detached"] == []
+    assert ("bump", "task_logger") in fake_postgresql
+    assert ("bump", "audit_logger") not in fake_postgresql
+
+
+def test_maintenance_can_drop(app, monkeypatch, fake_postgresql):
+    monkeypatch.setitem(app.config, "PARTITION_RETENTION_ACTION", "drop")
+    monkeypatch.setitem(app.config, "TASK_LOGGER_RETENTION_MONTHS", 1)
+    with app.app_context():
+        summary = partitions.maintain_partitions(today=date(2024, 3, 1))
+    assert summary["task_logger"]["dropped"] == ["task_logger_p2023_12", "task_logger_p2024_01"]
+    assert ("drop", "task_logger", "task_logger_p2024_01") in fake_postgresql
@@ -0,0 +1,52 @@
+from werkzeug.security import generate_password_hash
+
+from APP.database import db
+from APP.models import User
+from APP.Services.passwords import hash_passwords, verify_password
+
+
+def add_user(app, username, password):
+    with app.app_context():
+        db.session.add(User(username=username, password=password, role="user"))
+        db.session.commit()
+
+
+def stored_password(app, username):
+    with app.app_context():
+        return User.query.filter_by(username=username).first().password
+
+
+def login(client, username, password):
+    return client.post("/users/login", json={"username": username, "password": password})
+
+
+def test_login_rehashes_outdated_hash(app, client):
+    add_user(app, "old", generate_password_hash("secret", method="pbkdf2:sha256:1000", salt_length=8))
+    assert login(client, "old", "secret").status_code == 200
+    upgraded = stored_password(app, "old")
+    assert upgraded.startswith("pbkdf2:sha256:1000$") and len(upgraded.split("$")[1]) == 16
+
+    # An up-to-date hash is left alone
+    assert login(client, "old", "secret").status_code == 200
+    assert stored_password(app, "old") == upgraded
+
+
+def test_wrong_password_is_not_rehashed(app, client):
+    stored = generate_password_hash("secret", method="pbkdf2:sha256:1000", salt_length=8)
+    add_user(app, "old", stored)
+    assert login(client, "old", "wrong").status_code == 401
+    assert stored_password(app, "old") == stored
+
+
+def test_plaintext_and_foreign_hashes_never_match(app):
+    with app.app_context():
+        assert verify_password("secret", "secret") == (False, None)
+        assert verify_password("$2b$12$abcdefghijklmnopqrstuv", "$2b$12$abcdefghijklmnopqrstuv") == (False, None)
+        assert verify_password("a$b$c", "a$b$c") == (False, None)
+        assert verify_password(None, "secret") == (False, None)
+
+
+def test_hash_passwords_keeps_order(app):
+    with app.app_context():
+        hashed = hash_passwords(f"user{i}" for i in range(5))
+        assert [verify_password(stored, f"user{i}")[0] for i, stored in enumerate(hashed)] == [True] * 5
@@ -0,0 +1,69 @@
+from datetime import date
+
+import pytest
+
+from APP.database import db
+from APP.models import TaskLogger, TaskManager
+from APP.Services.query_inspector import assert_query_budget
+
+# Statement budgets for the hot read endpoints. The first request of a test also looks up
+# the authenticated user (one statement); repeated requests are served from the cache.
+
+
+@pytest.fixture
+def tasks(app):
+    with app.app_context():
+        for i in range(30):
+            db.session.add(TaskManager(
+                task_name=f"task {i}",
+                description="seeded",
+                is_active=i % 3 != 0,
+                priority=["LOW", "HIGH"][i % 2],
+                created_at=date(2024, 1, 1 + i % 3),
+                assigned_user=1,
+            ))
+        db.session.flush()
+        for task_id in range(1, 13):
+            db.session.add(TaskLogger(task_id=task_id))
+        db.session.commit()
+
+
+def test_task_by_date_budget(client, auth, tasks):
+    response = assert_query_budget(client, "GET", "/tasks/task/2024-01-01", 2, headers=auth)
+    assert response.status_code == 200
+    assert len(response.get_json()["task_list"]) == 10
+    response = assert_query_budget(client, "GET", "/tasks/task/2024-01-01", 0, headers=auth)
+    assert response.status_code == 200
+
+
+def test_task_records_budget(client, auth, tasks):
+    # Page mode: the COUNT is cached, so only the first page pays for it
+    response = assert_query_budget(client, "GET", "/tasks/task-records?page=1", 3, headers=auth)
+    assert response.status_code == 200
+    assert len(response.get_json()["data"]) == 5
+    response = assert_query_budget(client, "GET", "/tasks/task-records?page=2", 1, headers=auth)
+    assert response.status_code == 200
+
+    # Cursor mode: one keyset query per page
+    response = assert_query_budget(client, "GET", "/tasks/task-records?cursor=", 1, headers=auth)
+    cursor = response.get_json()["next_cursor"]
+    assert cursor
+    response = assert_query_budget(client, "GET", "/tasks/task-records", 1,
+                                   headers=auth, query_string={"cursor": cursor})
+    assert response.status_code == 200
+    # 8 of the 12 logged tasks are active
+    assert len(response.get_json()["data"]) == 3
+
+
+def test_task_query_budget(client, auth, tasks):
+    response = assert_query_budget(client, "GET", "/tasks/query?priority=low", 2, headers=auth)
+    assert response.status_code == 200
+    response = assert_query_budget(client, "GET", "/tasks/query?priority=low", 0, headers=auth)
+    assert response.status_code == 200
+
+
+def test_task_stats_budget(client, auth, tasks):
+    response = assert_query_budget(client, "GET", "/tasks/stats", 6, headers=auth)
+    assert response.status_code == 200
+    response = assert_query_budget(client, "GET", "/tasks/stats", 0, headers=auth)
+    assert response.status_code == 200
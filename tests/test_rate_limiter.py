@@ -0,0 +1,69 @@
+import os
+import sys
+
+import pytest
+import redis
+
+from APP.Services.rate_limiter import HybridRedisStorage
+
+
+def make_storage(fail_mode="open", max_pending=5):
+    storage = HybridRedisStorage("hybrid+redis://localhost:6379/0", max_pending=max_pending, fail_mode=fail_mode)
+    storage.flusher_pid = os.getpid()  # the tests flush explicitly
+    return storage
+
+
+def lose_redis(monkeypatch, storage):
+    def unreachable(*args, **kwargs):
+        raise redis.ConnectionError("connection refused")
+    monkeypatch.setattr(storage, "reconcile", unreachable)
+
+
+def test_counts_are_shared_through_redis():
+    first, second = make_storage(), make_storage()
+
+    assert first.incr("ip:1", 60) == 1
+    assert second.incr("ip:1", 60) == 2
+    assert first.client.get("LIMITS:ip:1") == b"2"
+
+
+def test_hits_below_max_pending_stay_local_until_flushed():
+    storage = make_storage(max_pending=5)
+    storage.incr("ip:1", 60)
+    for _ in range(3):
+        storage.incr("ip:1", 60)
+
+    assert storage.get("ip:1") == 4
+    assert storage.client.get("LIMITS:ip:1") == b"1"
+
+    storage.flush()
+    assert storage.client.get("LIMITS:ip:1") == b"4"
+
+
+def test_fail_open_keeps_counting_locally(monkeypatch):
+    storage = make_storage(fail_mode="open")
+    lose_redis(monkeypatch, storage)
+
+    assert storage.incr("ip:1", 60) == 1
+    assert storage.degraded
+    assert storage.incr("ip:1", 60) == 2
+    assert storage.incr("ip:1", 60) == 3
+
+    # The hits made while Redis was down are sent once it is back
+    monkeypatch.undo()
+    storage.flush()
+    assert not storage.degraded
+    assert storage.client.get("LIMITS:ip:1") == b"3"
+
+
+@pytest.mark.parametrize("fail_mode, rejected", [("open", False), ("closed", True)])
+def test_fail_closed_rejects_while_redis_is_down(monkeypatch, fail_mode, rejected):
+    storage = make_storage(fail_mode=fail_mode)
+    lose_redis(monkeypatch, storage)
+    storage.incr("ip:1", 60)
+
+    assert (storage.incr("ip:1", 60) == sys.maxsize) is rejected
+
+    monkeypatch.undo()
+    storage.flush()
+    assert storage.incr("ip:1", 60) == 3
@@ -0,0 +1,95 @@
+import pytest
+
+from APP.database import db
+from APP.models import Audit_logger, TaskManager
+
+
+def add_tasks(app, count, **values):
+    with app.app_context():
+        for i in range(count):
+            db.session.add(TaskManager(**{"task_name": f"task {i}", "priority": "LOW", "is_active": True,
+                                          "assigned_user": 1, **values}))
+        db.session.commit()
+
+
+def test_batch_update_by_ids(app, client, auth):
+    add_tasks(app, 3)
+    body = {"ids": [3, 1, 3, 99], "changes": {"priority": "high"}}
+    response = client.post("/tasks/batch", json=body, headers=auth)
+    assert response.status_code == 200
+    assert response.get_json()["results"] == [
+        {"id": 3, "status": "updated"}, {"id": 1, "status": "updated"}, {"id": 99, "status": "not_found"}
+    ]
+    with app.app_context():
+        assert [t.priority for t in TaskManager.query.order_by(TaskManager.id)] == ["HIGH", "LOW", "HIGH"]
+        assert db.session.query(Audit_logger).count() == 2
+
+
+def test_batch_delete_reports_inactive_tasks(app, client, auth):
+    add_tasks(app, 2)
+    client.post("/tasks/batch/delete", json={"ids": [1]}, headers=auth)
+    response = client.post("/tasks/batch/delete", json={"ids": [1, 2]}, headers=auth)
+    assert response.get_json()["results"] == [{"id": 1, "status": "already_inactive"}, {"id": 2, "status": "deleted"}]
+
+
+@pytest.mark.parametrize("ids", ["12", [True], [1, "2"], [1.5], {"1": 1}])
+def test_batch_rejects_ids_that_are_not_integers(app, client, auth, ids):
+    add_tasks(app, 2)
+    response = client.post("/tasks/batch", json={"ids": ids, "changes": {"is_active": False}}, headers=auth)
+    assert response.status_code == 400
+    with app.app_context():
+        assert TaskManager.query.filter_by(is_active=False).count() == 0
+
+
+def test_batch_rejects_a_non_object_filter(client, auth):
+    response = client.post("/tasks/batch", json={"filter": "priority", "changes": {"is_active": False}}, headers=auth)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("remaining", [8, 6])
+def test_batch_filter_pages_until_done(app, client, auth, monkeypatch, remaining):
+    # 6 rows is an exact multiple of the batch size: the last full batch has no more
+    monkeypatch.setitem(app.config, "TASK_BATCH_MAX_SIZE", 3)
+    with app.app_context():
+        for i in range(remaining):
+            db.session.add(TaskManager(task_name=f"task {i}", priority="LOW", is_active=True, assigned_user=1))
+        db.session.add(TaskManager(task_name="other", priority="HIGH", is_active=True, assigned_user=1))
+        db.session.commit()
+
+    body = {"filter": {"priority": "LOW"}, "changes": {"is_active": False}}
+    changed = []
+    for _ in range(5):
+        response = client.post("/tasks/batch", json=body, headers=auth)
+        assert response.status_code == 200
+        result = response.get_json()
+        changed += [row["id"] for row in result["results"]]
+        if not result["has_more"]:
+            assert result["next_cursor"] is None
+            break
+        body["cursor"] = result["next_cursor"]
+    assert changed == list(range(1, remaining + 1))
+
+    with app.app_context():
+        assert TaskManager.query.filter_by(is_active=True).count() == 1
+
+
+def test_batch_rejects_invalid_cursor(client, auth):
+    body = {"filter": {"priority": "LOW"}, "changes": {"is_active": False}, "cursor": "bad"}
+    response = client.post("/tasks/batch", json=body, headers=auth)
+    assert response.status_code == 400
+    assert "Invalid cursor" in response.get_json()["error"]
+
+
+@pytest.mark.parametrize("method, url, kwargs", [
+    ("GET", "/tasks/query?priority=foo", {}),
+    ("GET", "/tasks/export/tasks?priority=foo", {}),
+    ("POST", "/tasks/batch", {"json": {"filter": {"priority": "FOO"}, "changes": {"is_active": False}}}),
+])
+def test_unknown_priority_is_rejected(client, auth, method, url, kwargs):
+    response = client.open(url, method=method, headers=auth, **kwargs)
+    assert response.status_code == 400
+    assert "Unknown priority FOO" in response.get_json()["error"]
+
+
+def test_priority_filter_is_case_insensitive(client, auth):
+    assert client.get("/tasks/query?priority=low,HIGH", headers=auth).status_code == 200
@@ -0,0 +1,69 @@
+import csv
+import gzip
+import io
+import json
+from datetime import date, datetime
+
+from APP.database import db
+from APP.models import TaskLogger, TaskManager
+
+
+def add_tasks(app, count):
+    with app.app_context():
+        for i in range(count):
+            db.session.add(TaskManager(task_name=f"task, {i}", priority=["LOW", "HIGH"][i % 2], is_active=True,
+                                       created_at=date(2024, 1, 1 + i), assigned_user=1))
+        db.session.flush()
+        for i in range(count):
+            db.session.add(TaskLogger(task_id=i + 1, logged_at=datetime(2024, 2, 1 + i, 23, 30)))
+        db.session.commit()
+
+
+def test_ndjson_is_streamed_in_batches(app, client, auth, monkeypatch):
+    monkeypatch.setitem(app.config, "EXPORT_BATCH_SIZE", 2)
+    add_tasks(app, 5)
+    response = client.get("/tasks/export/tasks", headers=auth)
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == "application/x-ndjson"
+    # One chunk per batch of rows
+    assert len(list(response.response)) == 3
+
+    response = client.get("/tasks/export/tasks", headers=auth)
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row["id"] for row in rows] == [1, 2, 3, 4, 5]
+    assert rows[0]["task_name"] == "task, 0"
+    assert rows[0]["created_at"] == "2024-01-01"
+
+
+def test_csv_with_filters(app, client, auth):
+    add_tasks(app, 5)
+    response = client.get("/tasks/export/tasks?format=csv&priority=high", headers=auth)
+    assert response.headers["Content-Disposition"] == 'attachment; filename="tasks.csv"'
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0][:2] == ["id", "task_name"]
+    assert [row[1] for row in rows[1:]] == ["task, 1", "task, 3"]
+
+
+def test_empty_csv_has_a_header(client, auth):
+    response = client.get("/tasks/export/logs?format=csv", headers=auth)
+    assert response.get_data(as_text=True).strip() == "id,task_id,logged_at"
+
+
+def test_log_dates_are_inclusive(app, client, auth):
+    add_tasks(app, 5)
+    response = client.get("/tasks/export/logs?from=2024-02-02&to=2024-02-03", headers=auth)
+    assert [json.loads(line)["id"] for line in response.get_data(as_text=True).splitlines()] == [2, 3]
+
+
+def test_gzip_when_accepted(app, client, auth):
+    add_tasks(app, 3)
+    response = client.get("/tasks/export/tasks", headers=dict(auth, **{"Accept-Encoding": "gzip"}))
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len(gzip.decompress(response.get_data()).splitlines()) == 3
+
+
+def test_invalid_exports(client, auth):
+    assert client.get("/tasks/export/users", headers=auth).status_code == 404
+    assert client.get("/tasks/export/tasks?format=xml", headers=auth).status_code == 400
+    assert client.get("/tasks/export/tasks?from=2024-02-01&to=2024-01-01", headers=auth).status_code == 400
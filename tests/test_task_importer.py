@@ -0,0 +1,104 @@
+import io
+from datetime import date
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from APP.database import db
+from APP.models import Audit_logger, TaskManager, User
+from APP.Services import task_importer
+from APP.Services.query_inspector import QueryBudget
+
+CSV = """task_name,description,status,priority,created_at,assigned_user
+Write docs,first,yes,high,01/02/2024,alice
+Fix bug,,0,bogus,2024-01-03,bob
+,no name,1,low,2024-01-03,alice
+Ship it,"tab\there",,LOW,03-01-2024,alice
+Review,x,active,critical,2024-01-04,
+"""
+
+
+def upload(client, auth, body, filename="tasks.csv"):
+    return client.post("/tasks/upload-csv", headers=auth,
+                       data={"file": (io.BytesIO(body.encode()), filename)}, content_type="multipart/form-data")
+
+
+def test_upload_imports_in_chunks(app, client, auth, monkeypatch):
+    monkeypatch.setitem(app.config, "TASK_IMPORT_CHUNK_SIZE", 2)
+    response = upload(client, auth, CSV)
+    assert response.status_code == 200
+    details = response.get_json()["details"]
+    assert details["imported"] == 3
+    assert details["failed"] == 2
+    assert details["errors"] == [{"row": 4, "error": "Missing task_name"}, {"row": 6, "error": "Missing assigned_user"}]
+    assert sorted(details["created_users"]) == ["alice", "bob"]
+    assert response.get_json()["stats"]["chunks"] == 3
+
+    with app.app_context():
+        tasks = {t.task_name: t for t in TaskManager.query.all()}
+        assert tasks["Write docs"].created_at == date(2024, 1, 2)
+        assert (tasks["Write docs"].is_active, tasks["Write docs"].priority) == (True, "HIGH")
+        assert (tasks["Fix bug"].is_active, tasks["Fix bug"].priority) == (False, "MEDIUM")
+        # A blank status is inactive
+        assert tasks["Ship it"].is_active is False
+        assert tasks["Ship it"].description == "tab\there"
+        assert tasks["Ship it"].assigned_user == tasks["Write docs"].assigned_user
+        assert db.session.query(Audit_logger).count() == 3
+        assert User.query.count() == 3
+
+
+def test_statement_count_does_not_grow_with_rows(app, client, auth):
+    rows = "".join(f"task {i},d,1,LOW,2024-01-01,user{i % 3}\n" for i in range(200))
+    body = "task_name,description,status,priority,created_at,assigned_user\n" + rows
+    with QueryBudget(12, "upload 200 rows"):
+        response = upload(client, auth, body)
+    assert response.get_json()["details"]["imported"] == 200
+
+
+def test_missing_status_is_inactive_in_every_format():
+    assert task_importer.normalize_status(pd.Series([1, np.nan, 0])).tolist() == [True, False, False]
+    assert task_importer.normalize_status(pd.Series([1, None], dtype="Int64")).tolist() == [True, False]
+    assert task_importer.normalize_status(pd.Series([True, None], dtype="boolean")).tolist() == [True, False]
+    assert task_importer.normalize_status(pd.Series(["yes", np.nan])).tolist() == [True, False]
+
+
+def test_copy_text_format_escapes_values():
+    assert task_importer.copy_value(None) == "\\N"
+    assert task_importer.copy_value(True) == "t"
+    assert task_importer.copy_value("a\tb\nc\\N\r") == "a\\tb\\nc\\\\N\\r"
+    assert task_importer.copy_value(date(2024, 1, 2)) == "2024-01-02"
+
+
+def test_copy_tasks_streams_one_line_per_row(app, monkeypatch):
+    copied = {}
+
+    class Cursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def copy_expert(self, sql, buffer):
+            copied["sql"], copied["data"] = sql, buffer.read()
+
+    class Connection:
+        def cursor(self):
+            return Cursor()
+
+    monkeypatch.setattr(task_importer, "reserve_task_ids", lambda count: list(range(10, 10 + count)))
+    with app.app_context():
+        raw = SimpleNamespace(connection=SimpleNamespace(dbapi_connection=Connection()))
+        monkeypatch.setattr(db.session, "connection", lambda: raw)
+        ids = task_importer.copy_tasks([
+            {"task_name": "a\tb", "description": None, "is_active": True, "priority": "LOW",
+             "created_at": date(2024, 1, 2), "assigned_user": 1},
+            {"task_name": "c", "description": "line\nbreak", "is_active": False, "priority": "HIGH",
+             "created_at": date(2024, 1, 3), "assigned_user": 2},
+        ])
+    assert ids == [10, 11]
+    assert copied["sql"] == ("COPY task_manager (id, task_name, description, is_active, priority, created_at, "
+                             "assigned_user) FROM STDIN")
+    assert copied["data"] == ("10\ta\\tb\t\\N\tt\tLOW\t2024-01-02\t1\n"
+                              "11\tc\tline\\nbreak\tf\tHIGH\t2024-01-03\t2\n")
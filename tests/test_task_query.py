@@ -0,0 +1,39 @@
+from datetime import date
+
+from APP.database import db
+from APP.models import TaskManager
+
+
+def add_tasks(app, count):
+    with app.app_context():
+        for i in range(count):
+            db.session.add(TaskManager(task_name=f"task {i}", priority=["LOW", "HIGH"][i % 2], is_active=True,
+                                       created_at=date(2024, 1, 1 + i), assigned_user=1))
+        db.session.commit()
+
+
+def query(client, auth, **params):
+    response = client.get("/tasks/query", query_string=params, headers=auth)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_filters_sort_and_cursor(app, client, auth):
+    add_tasks(app, 6)
+    first = query(client, auth, priority="high", sort="-created_at", limit=2)
+    assert [row["id"] for row in first["data"]] == [6, 4]
+    second = query(client, auth, priority="high", sort="-created_at", limit=2, cursor=first["next_cursor"])
+    assert [row["id"] for row in second["data"]] == [2]
+    assert second["next_cursor"] is None
+
+
+def test_cached_results_follow_task_writes(app, client, auth):
+    add_tasks(app, 2)
+    assert len(query(client, auth, priority="low")["data"]) == 1
+    client.post("/tasks/2", json={"priority": "low"}, headers=auth)
+    assert len(query(client, auth, priority="low")["data"]) == 2
+
+
+def test_invalid_query_parameters(client, auth):
+    for params in ({"from": "2024-13-01"}, {"sort": "password"}, {"limit": "x"}, {"cursor": "zz"}):
+        assert client.get("/tasks/query", query_string=params, headers=auth).status_code == 400
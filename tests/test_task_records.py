@@ -0,0 +1,66 @@
+import pytest
+
+from APP.database import db
+from APP.models import TaskLogger, TaskManager
+from APP.Services.pagination import encode_cursor
+from APP.Services.task_logger import snapshot_active_tasks
+
+
+def add_logged_tasks(app, count):
+    with app.app_context():
+        for i in range(count):
+            task = TaskManager(task_name=f"task {i}", priority="LOW", is_active=True, assigned_user=1)
+            db.session.add(task)
+            db.session.flush()
+            db.session.add(TaskLogger(task_id=task.id))
+        db.session.commit()
+
+
+def total(client, auth):
+    return client.get("/tasks/task-records", headers=auth).get_json()["total No of records"]
+
+
+def test_cursor_pages_cover_every_row_once(app, client, auth):
+    add_logged_tasks(app, 7)
+    seen, cursor = [], ""
+    while cursor is not None:
+        page = client.get("/tasks/task-records", query_string={"cursor": cursor, "per_page": 3}, headers=auth).get_json()
+        seen += [row["log_id"] for row in page["data"]]
+        cursor = page["next_cursor"]
+    assert sorted(seen) == list(range(1, 8))
+    assert len(seen) == 7
+
+
+def test_cached_total_follows_writes(app, client, auth):
+    add_logged_tasks(app, 3)
+    assert total(client, auth) == 3
+
+    # Soft delete through the API
+    assert client.delete("/tasks/delete/1", headers=auth).status_code == 200
+    assert total(client, auth) == 2
+
+    # A new task shows up once the snapshot logs it
+    with app.app_context():
+        db.session.add(TaskManager(task_name="new", priority="LOW", is_active=True, assigned_user=1))
+        db.session.commit()
+        snapshot_active_tasks()
+    assert total(client, auth) == 3
+
+
+@pytest.mark.parametrize("cursor", [
+    "garbage",
+    encode_cursor("2024-01-01", "x"),
+    encode_cursor("2024-01-01", None),
+    encode_cursor("2024-01-01", True),
+    encode_cursor("not-a-date", 5),
+])
+def test_task_records_rejects_invalid_cursor(client, auth, cursor):
+    response = client.get("/tasks/task-records", query_string={"cursor": cursor}, headers=auth)
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid cursor"}
+
+
+@pytest.mark.parametrize("cursor", ["", encode_cursor("2024-01-01T00:00:00", 5), encode_cursor("2024-01-01", "5")])
+def test_task_records_accepts_valid_cursor(client, auth, cursor):
+    response = client.get("/tasks/task-records", query_string={"cursor": cursor}, headers=auth)
+    assert response.status_code == 200
@@ -0,0 +1,45 @@
+from datetime import date
+
+from APP.database import db
+from APP.models import TaskManager
+
+
+def add_tasks(app, *names, **values):
+    with app.app_context():
+        for name in names:
+            db.session.add(TaskManager(**{"task_name": name, "description": "", "priority": "LOW", "is_active": True,
+                                          "created_at": date(2024, 1, 1), "assigned_user": 1, **values}))
+        db.session.commit()
+
+
+def search(client, auth, **params):
+    response = client.get("/tasks/search", query_string=params, headers=auth)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_search_pages_with_a_cursor(app, client, auth):
+    add_tasks(app, *[f"Deploy api {i}" for i in range(5)], "other")
+    first = search(client, auth, q="deploy", per_page=3)
+    second = search(client, auth, q="deploy", per_page=3, cursor=first["next_cursor"])
+    ids = [row["id"] for row in first["data"] + second["data"]]
+    assert sorted(ids) == [1, 2, 3, 4, 5]
+    assert second["next_cursor"] is None
+
+
+def test_search_applies_filters(app, client, auth):
+    add_tasks(app, "deploy low")
+    add_tasks(app, "deploy high", priority="HIGH")
+    assert [row["task_name"] for row in search(client, auth, q="deploy", priority="high")["data"]] == ["deploy high"]
+
+
+def test_like_wildcards_match_literally(app, client, auth):
+    add_tasks(app, "100% done", "1000 done", "snake_case", "snakeXcase")
+    assert [row["task_name"] for row in search(client, auth, q="0%")["data"]] == ["100% done"]
+    assert [row["task_name"] for row in search(client, auth, q="e_c")["data"]] == ["snake_case"]
+
+
+def test_invalid_search_requests(client, auth):
+    assert client.get("/tasks/search", headers=auth).status_code == 400
+    assert client.get("/tasks/search?q=x&mode=bad", headers=auth).status_code == 400
+    assert client.get("/tasks/search?q=x&cursor=zz", headers=auth).status_code == 400
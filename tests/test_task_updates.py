@@ -0,0 +1,81 @@
+from sqlalchemy import text
+
+from APP.database import db
+from APP.models import Audit_logger, TaskManager
+from APP.Services.task_mutations import ids_condition, mutate_tasks
+
+
+def add_task(app, **values):
+    with app.app_context():
+        task = TaskManager(**{"task_name": "task", "priority": "LOW", "is_active": True, "assigned_user": 1, **values})
+        db.session.add(task)
+        db.session.commit()
+        return task.id
+
+
+def test_update_returns_etag_and_audits(app, client, auth):
+    task_id = add_task(app)
+    response = client.post(f"/tasks/{task_id}", json={"priority": "high"}, headers=auth)
+    assert response.status_code == 200
+    assert response.headers["ETag"] == f'"{task_id}-2"'
+    assert response.get_json()["task"]["priority"] == "HIGH"
+    with app.app_context():
+        audit = db.session.query(Audit_logger).one()
+        assert 'priority="LOW"' in audit.previous_state
+        assert 'priority="HIGH"' in audit.current_state
+
+
+def test_stale_if_match_is_rejected(app, client, auth):
+    task_id = add_task(app)
+    first = client.post(f"/tasks/{task_id}", json={"task_name": "a"}, headers=dict(auth, **{"If-Match": f'"{task_id}-1"'}))
+    assert first.status_code == 200
+
+    stale = client.post(f"/tasks/{task_id}", json={"task_name": "b"}, headers=dict(auth, **{"If-Match": f'"{task_id}-1"'}))
+    assert stale.status_code == 412
+    assert stale.get_json()["current_version"] == 2
+    assert stale.headers["ETag"] == first.headers["ETag"]
+
+    deleted = client.delete(f"/tasks/delete/{task_id}", headers=dict(auth, **{"If-Match": f'W/"{task_id}-1"'}))
+    assert deleted.status_code == 412
+    with app.app_context():
+        task = db.session.get(TaskManager, task_id)
+        assert (task.task_name, task.is_active, task.version) == ("a", True, 2)
+
+
+def test_version_in_body(app, client, auth):
+    task_id = add_task(app)
+    assert client.post(f"/tasks/{task_id}", json={"task_name": "a", "version": 5}, headers=auth).status_code == 412
+    assert client.post(f"/tasks/{task_id}", json={"task_name": "a", "version": "x"}, headers=auth).status_code == 400
+    assert client.post(f"/tasks/{task_id}", json={"task_name": "a", "version": 1}, headers=auth).status_code == 200
+    assert client.post("/tasks/999", json={"task_name": "a"}, headers=auth).status_code == 404
+
+
+def test_non_object_body_is_rejected(app, client, auth):
+    task_id = add_task(app)
+    assert client.post(f"/tasks/{task_id}", json=["task_name"], headers=auth).status_code == 400
+
+
+def test_version_check_holds_against_a_concurrent_writer(app, monkeypatch):
+    # Another writer bumps the version between the read of the old state and the UPDATE
+    task_id = add_task(app)
+    with app.app_context():
+        execute = db.session.execute
+        calls = []
+
+        def interleaved(statement, *args, **kwargs):
+            result = execute(statement, *args, **kwargs)
+            calls.append(statement)
+            if len(calls) == 1:
+                frozen = result.freeze()
+                execute(text("UPDATE task_manager SET version = version + 1 WHERE id = :id"), {"id": task_id})
+                return frozen()
+            return result
+
+        monkeypatch.setattr(db.session, "execute", interleaved)
+        rows = mutate_tasks(ids_condition([task_id]), {"task_name": "lost"}, 1, expected_version=1)
+        monkeypatch.undo()
+        assert rows == []
+        db.session.commit()
+        task = db.session.get(TaskManager, task_id)
+        assert (task.task_name, task.version) == ("task", 2)
+        assert db.session.query(Audit_logger).count() == 0